@@ -1,8 +1,12 @@
 ################################################################################
-# SMW-SX1262M0 Bridge (v1.0)
+# SMW-SX1262M0 Bridge (v1.1)
 #
 # Simple program to bridge the computer to the LoRaWAN module.
 #
+# Usage:
+#   python3 Bridge.py [port]                       (interactive console)
+#   python3 Bridge.py [port] --script commands.txt (batch of AT commands)
+#
 # Copyright 2023 RoboCore.
 # Written by Luan.f (06/02/2023).
 #
@@ -25,34 +29,98 @@
 
 # libraries
 
-from time import sleep
-import serial
+import argparse
+import threading
+from time import perf_counter, sleep
+from RoboCore_SMW_SX1262M0 import SMW_SX1262M0
+
+# variables
+
+PORT = "/dev/serial0"
+TIMEOUT = 2000 # [ms] maximum time to wait for a response
+WINDOW = 4 # commands sent before waiting for their responses (batch mode)
+IDLE_TIME = 0.01 # [s] pause of the listener when the module is quiet
+
+running = True
+
+# functions
+
+def show_unsolicited(lorawan):
+    """Print the lines sent by the module outside of a command."""
+
+    while running:
+        line = lorawan.readLine(20) # [ms]
+        if line:
+            print(f"\n<< {line}")
+        else:
+            # nothing received, let the commands of the user go first
+            sleep(IDLE_TIME)
+
+
+def run_interactive(lorawan):
+    """Send each command typed by the user and print the response as soon as it arrives."""
+
+    global running
 
-response = "" # to store the module's responses
+    # stream the asynchronous events in a separate thread
+    listener = threading.Thread(target=show_unsolicited, args=(lorawan,), daemon=True)
+    listener.start()
 
-serialConnection = serial.Serial("/dev/serial0", baudrate=9600) # serial connection
+    while True:
+        # ask for user input
+        command = input("Write your command: ")
+        if command == "exit":
+            print("Bye")
+            break
+        if not command:
+            continue
+
+        # send the command to the module and wait for the status line
+        # (the listener thread cannot use the module inside the transaction)
+        with lorawan.transaction():
+            start = perf_counter()
+            response = lorawan.execute(command, TIMEOUT)
+            latency = (perf_counter() - start) * 1000 # [ms]
+
+        # print the answer
+        print(response.strip())
+        print(f"({latency:.1f} ms)")
+
+    running = False
+    listener.join()
+
+
+def run_script(lorawan, filename, window):
+    """Send the commands of a file (one per line, "#" for comments) using pipelining."""
+
+    with open(filename) as file:
+        commands = [line.strip() for line in file]
+    commands = [command for command in commands if command and not command.startswith("#")]
+
+    start = perf_counter()
+    responses = lorawan.pipeline(commands, TIMEOUT, window)
+    elapsed = (perf_counter() - start) * 1000 # [ms]
+
+    for command, response in zip(commands, responses):
+        print(f"> {command}")
+        print(response.strip())
+
+    if commands:
+        print(f"({len(commands)} commands in {elapsed:.1f} ms, "
+              f"{elapsed / len(commands):.1f} ms per command)")
 
 # main program
 
+parser = argparse.ArgumentParser(description="SMW-SX1262M0 Bridge")
+parser.add_argument("port", nargs="?", default=PORT, help="serial port or pyserial URL")
+parser.add_argument("--script", help="file with the AT commands to send")
+parser.add_argument("--window", type=int, default=WINDOW, help="commands in flight (batch mode)")
+arguments = parser.parse_args()
+
 print("--- SMW-SX1262M0 Bridge ---")
 
-while True:
-    # ask for user input
-    command = input("Write your command: ")
-    if command == "exit":
-        print("Bye")
-        break
-
-    # send input to the module
-    serialConnection.write(f"{command}\n".encode())
-    response = "" # erase the variable
-    sleep(1) # 1 [s]
-
-    # read buffer
-    while serialConnection.inWaiting():
-        buffer = serialConnection.read(serialConnection.inWaiting())
-        sleep(0.1) # 100 [ms]
-        response += (buffer.decode(encoding="utf8", errors='ignore')) # converts the answer to UTF-8
-
-    # print the answer
-    print(response)
+with SMW_SX1262M0(arguments.port) as lorawan:
+    if arguments.script:
+        run_script(lorawan, arguments.script, arguments.window)
+    else:
+        run_interactive(lorawan)
@@ -0,0 +1,86 @@
+######################################################################################
+# SMW-SX1262M0 Warm Start - OTAA (v1.0)
+#
+# This program was created with the purpose of showing how to resume a 
+# previous session, skipping the reset, the configuration and the join
+# when the module is still joined with the same settings.
+#
+# Copyright 2023 RoboCore.
+#
+#
+# This file is part of the SMW-SX1262M0 library ("SMW-SX1262M0-lib").
+#
+# "SMW-SX1262M0-lib" is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# "SMW-SX1262M0-lib" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with "SMW-SX1262M0-lib". If not, see <https://www.gnu.org/licenses/>
+######################################################################################
+
+# libraries
+
+from RoboCore_SMW_SX1262M0 import SMW_SX1262M0, CommandResponse
+from time import sleep
+
+# variables
+
+APPEUI = "0000000000000000" 
+APPKEY = "00000000000000000000000000000000" 
+MODE_OTAA = 1 # 0 = ABP / 1 = OTAA
+PAUSE_TIME = 300000 # [ms] (5 min)
+SESSION_FILE = "lorawan_session.json"
+
+lorawan = SMW_SX1262M0("/dev/serial0")
+
+# main program
+
+print("--- SMW-SX1262M0 Warm Start (OTAA) ---")
+
+# try to resume the previous session
+settings = {"JoinMode": MODE_OTAA, "AppEUI": APPEUI, "AppKey": APPKEY}
+if lorawan.warmStart(SESSION_FILE, settings):
+    print("Session resumed")
+
+else:
+    print("Starting a new session")
+
+    # reset and configure the module
+    lorawan.reset()
+    lorawan.set_JoinMode(MODE_OTAA)
+    lorawan.set_AppEUI(APPEUI)
+    lorawan.set_AppKey(APPKEY)
+    lorawan.save()
+
+    # join the network
+    print("Joining the network")
+    lorawan.join()
+    while not lorawan.isConnected():
+        # show some activity
+        print(".")
+        sleep(5) # 5 [s]
+
+    print("Joined")
+
+    # store the session for the next start
+    if lorawan.saveSession(SESSION_FILE) == CommandResponse.OK:
+        print("Session saved")
+
+# get the current time [ms]
+timeout = lorawan.millis()
+
+while True:
+    if lorawan.millis() > timeout:
+        # send the message (text data)
+        returnCode = lorawan.sendT(12, "Hello World!")
+        if returnCode == CommandResponse.OK:
+            print("Message sent")
+
+        # update the timeout
+        timeout = lorawan.millis() + PAUSE_TIME
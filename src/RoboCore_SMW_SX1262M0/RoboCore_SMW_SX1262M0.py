@@ -26,10 +26,21 @@
 #################################################################################################################
 
 # Necessary libraries
+import functools
+import json
+import os
 import serial
+import socket
 import string
+import threading
+from collections import deque
+from contextlib import contextmanager
 from enum import IntEnum
-from time import monotonic
+from time import monotonic, monotonic_ns, sleep, time_ns
+
+from .arbiter import CancelToken, CommandArbiter, Priority
+from .radio import P2P_PRESETS, P2PConfig
+from .transport import SocketTransport, openTransport
 
 
 class CommandResponse(IntEnum):
@@ -42,15 +53,284 @@ class CommandResponse(IntEnum):
     AT_TEST_PARAM_OVERFLOW = 104  # the parameter of the AT command is too long
     AT_NO_NETWORK_JOINED = 105  # the LoRa network has not been joined yet
     PARAM_ERROR = 200  # a parameter of the function is wrong
+    TIMEOUT = 201  # the deadline was reached before the response
+    CANCELLED = 202  # the command was cancelled before the response
+    INVALID_RESPONSE = 203  # the response of the module could not be parsed
+
+
+class ProtocolError(Exception):
+    """This class is the error of a response that could not be parsed (truncated or with noise).
+
+    The methods of SMW_SX1262M0 handle it by themselves: the serial port is resynchronized 
+    (see SMW_SX1262M0.resync()) and the command is sent again, and if it still fails the method 
+    returns CommandResponse.INVALID_RESPONSE. If the resynchronization fails, the command is not 
+    sent again and the method returns the status of resync() (INVALID_RESPONSE or TIMEOUT).
+    """
+
+    def __init__(self, response):
+        """This method is the constructor of the class.
+
+        :param response [str]: the response received from the module
+        """
+
+        super().__init__(f"invalid response: {response!r}")
+        self.response = response
+
+
+class Response:
+    """This class stores a parsed response of the module (it uses slots to keep it cheap)."""
+
+    __slots__ = ("status", "value", "raw")
+
+    def __init__(self, status, value, raw):
+        """This method is the constructor of the class.
+
+        :param status [CommandResponse]: the status of the command
+        :param value: the converted value, or None if the response has no value
+        :param raw [str]: the response as received from the module
+        """
+
+        self.status = status
+        self.value = value
+        self.raw = raw
+
+    def __repr__(self):
+        return f"Response(status={self.status!r}, value={self.value!r})"
+
+
+class TimedResult(tuple):
+    """This class is a result (e.g. (status, value)) that also has the time its response 
+    started to arrive. It is used as a normal tuple.
+
+    Attributes:
+        timestamp [int]: the time the first byte of the response was read, in [ns] of 
+        time.monotonic_ns() (the same clock in every process), or None if nothing was received
+        wallTime [int]: the same time, in [ns] of time.time_ns(), or None if the wall clock 
+        is not enabled (see SMW_SX1262M0)
+    """
+
+    def __new__(cls, values, stamp=None):
+        """This method creates the result.
+
+        :param values [tuple]: the values of the result
+        :param stamp [tuple]: the monotonic and the wall-clock time, in [ns], or None 
+        (default = None)
+        """
+
+        result = super().__new__(cls, values)
+        result.timestamp, result.wallTime = stamp if stamp is not None else (None, None)
+
+        return result
+
+
+def _portMessage(value):
+    """This function converts a received message ("port:message").
+
+    :param value [str]: the value sent by the module
+
+    :return: the port [int] and the message [str]
+    """
+
+    port, _, message = value.partition(":")
+
+    return (int(port), message)
+
+
+def _exclusive(method=None, retry=True):
+    """This decorator runs a method as a single transaction with the module, so that other 
+    threads cannot send commands in the middle of it (see SMW_SX1262M0.transaction()).
+    The decorated method also accepts the "deadline" and "cancel" keyword arguments.
+
+    :param method [function]: the method
+    :param retry [bool]: True to run the method again after an invalid response, False if 
+    running it twice has side effects (e.g. sending an uplink) (default = True)
+
+    :return: the decorated method [function]
+    """
+
+    if method is None:
+        return functools.partial(_exclusive, retry=retry)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, deadline=None, cancel=None, **kwargs):
+        with self.transaction(deadline=deadline, cancel=cancel):
+            # private method of SMW_SX1262M0
+            return self._SMW_SX1262M0__attempt(method, retry, args, kwargs)
+
+    return wrapper
+
+
+def _commandPrefixes(commands, actions):
+    """This function precomputes the bytes sent for each pair of command and action.
+
+    :param commands [dict]: the command dictionary
+    :param actions [dict]: the dictionary of actions
+
+    :return: the prefix of each (cmd, action) pair [dict]
+    """
+
+    prefixes = {("", action): f"AT{symbol}".encode() for action, symbol in actions.items()}
+    for cmd, name in commands.items():
+        for action, symbol in actions.items():
+            prefixes[(cmd, action)] = f"AT+{name}{symbol}".encode()
+
+    return prefixes
+
+
+class _ReceiveBuffer:
+    """This class stores the bytes received from the module in a preallocated buffer, so that 
+    the serial port is read without creating new objects and only complete lines are decoded."""
+
+    def __init__(self, size=1024, wallClock=False):
+        """This method is the constructor of the class.
+
+        :param size [int]: the initial size of the buffer, in [bytes] (default = 1024)
+        :param wallClock [bool]: True to also store the wall-clock time of the bytes 
+        (default = False)
+        """
+
+        self.__buffer = bytearray(size)
+        self.__view = memoryview(self.__buffer)
+        self.__start = 0  # first unread byte
+        self.__end = 0  # end of the stored data
+        self.__base = 0  # number of bytes received before the start of the buffer
+        self.__arrivals = deque()  # position of the first byte of each read and its time
+        self.__wallClock = wallClock
+
+    def __len__(self):
+        return self.__end - self.__start
+
+    def clear(self):
+        """This method discards the stored data."""
+
+        self.__base += self.__end
+        self.__start = 0
+        self.__end = 0
+        self.__arrivals.clear()
+
+    def fill(self, connection):
+        """This method reads the bytes available in the connection into the buffer.
+
+        :param connection: the serial connection
+
+        :return: the number of bytes read [int]
+        """
+
+        waiting = connection.in_waiting
+        if not waiting:
+            return 0
+        arrival = (monotonic_ns(), time_ns() if self.__wallClock else None)
+
+        # make room at the end of the buffer
+        if len(self.__buffer) - self.__end < waiting:
+            stored = self.__end - self.__start
+            if stored + waiting > len(self.__buffer):
+                # the buffer only grows when a single line does not fit
+                self.__view.release()
+                self.__buffer.extend(bytes(stored + waiting))
+                self.__view = memoryview(self.__buffer)
+            self.__buffer[:stored] = self.__view[self.__start:self.__end]
+            self.__base += self.__start
+            self.__start = 0
+            self.__end = stored
+
+        count = connection.readinto(self.__view[self.__end:self.__end + waiting]) or 0
+        if count:
+            self.__arrivals.append((self.__base + self.__end, arrival))
+        self.__end += count
+
+        return count
+
+    def timestamp(self):
+        """This method gets the time the next unread byte was read from the connection.
+
+        :return: the monotonic and the wall-clock time (None if not enabled), in [ns] [tuple], 
+        or None if the buffer is empty
+        """
+
+        if self.__start == self.__end:
+            return None
+
+        # forget the reads that were consumed
+        position = self.__base + self.__start
+        arrivals = self.__arrivals
+        while len(arrivals) > 1 and arrivals[1][0] <= position:
+            arrivals.popleft()
+
+        return arrivals[0][1]
+
+    def find(self, sub):
+        """This method searches the stored data (nothing is decoded).
+
+        :param sub [bytes]: the sequence to search for
+
+        :return: True [bool] if the sequence was found
+        """
+
+        return self.__buffer.find(sub, self.__start, self.__end) >= 0
+
+    def readline(self):
+        """This method takes the next complete line from the buffer.
+
+        :return: the line without the line break [str], or None if there is no complete line
+        """
+
+        index = self.__buffer.find(b"\n", self.__start, self.__end)
+        if index < 0:
+            return None
+
+        line = str(self.__view[self.__start:index], "utf8", "ignore").rstrip("\r")
+        self.__start = index + 1
+        if self.__start == self.__end:
+            self.clear()
+
+        return line
+
+    def pending(self):
+        """This method gets the incomplete line stored in the buffer, without decoding it.
+
+        :return: the incomplete line without blank characters [bytes]
+        """
+
+        return bytes(self.__view[self.__start:self.__end]).strip()
+
+    def readall(self):
+        """This method takes all the stored data from the buffer.
+
+        :return: the data [str]
+        """
+
+        data = str(self.__view[self.__start:self.__end], "utf8", "ignore")
+        self.clear()
+
+        return data
 
 
 class SMW_SX1262M0:
     """This class was created to facilitate the use of the SMW-SX1262M0 LoRaWAN module 
-    (uses some native python 3.9.2 libraries)."""
+    (uses some native python 3.9.2 libraries).
+
+    An object can be shared by several threads: each command and its response form a 
+    transaction and the threads are served by priority (see priority() and transaction()).
+
+    Every method that uses the module also accepts two optional keyword arguments:
+        deadline [int]: the time limit of the call, in [ms] of millis() 
+        (e.g. deadline=lorawan.millis() + 200)
+        cancel [CancelToken]: a token that interrupts the call when cancelled from another thread
+    An interrupted command returns CommandResponse.TIMEOUT or CommandResponse.CANCELLED 
+    (P2P_listen() and readLine() return as if nothing was received). If the module answers 
+    later, the response is discarded before the next command.
+
+    A response that cannot be parsed (truncated or with noise) makes the serial port 
+    resynchronize (see resync()) and the command is sent again (except for commands with side 
+    effects, like sendT()); if it still fails, the method returns 
+    CommandResponse.INVALID_RESPONSE.
+    """
 
     SMW_SX1262M0_TIMEOUT_READ = 100  # [ms]
     SMW_SX1262M0_TIMEOUT_WRITE = 500  # [ms]
     SMW_SX1262M0_TIMEOUT_RESET = 3000  # [ms]
+    SMW_SX1262M0_POLL_INTERVAL = 1  # time to wait when no byte was received, in [ms]
 
     # command dictionary (AT v2.14)
     __commandDictionary = {
@@ -98,20 +378,248 @@ class SMW_SX1262M0:
 
     }
 
-    # this variable contains the P2P message
-    __messageReceived = ""
+    # type of the value returned by each command (the others are [str])
+    __responseType = {
+
+        "CMD_ADR": int,
+        "CMD_AJOIN": int,
+        "CMD_CFM": int,
+        "CMD_CFS": int,
+        "CMD_DR": int,
+        "CMD_NJM": int,
+        "CMD_NJS": int,
+        "CMD_RSSI": int,
+        "CMD_SNR": int,
+        "CMD_TXP": int,
+        "CMD_RECV": _portMessage,
+        "CMD_RECVB": _portMessage,
+
+    }
+
+    # bytes sent for each pair of command and action
+    __commandPrefix = _commandPrefixes(__commandDictionary, __commandAction)
+    __commandLine = {key: prefix + b"\n" for key, prefix in __commandPrefix.items()}
+
+    # names of the status lines that end a response
+    __statusNames = frozenset(index.name for index in CommandResponse)
+    __statusBytes = frozenset(index.name.encode() for index in CommandResponse)
+
+    # command and valid values of each configuration (named as the set_* methods); the
+    # hexadecimal values are given by their size, in [bytes]
+    __settingCommand = {
+
+        "ADR": ("CMD_ADR", range(2)),
+        "AJoin": ("CMD_AJOIN", range(2)),
+        "AppEUI": ("CMD_APPEUI", 8),
+        "AppKey": ("CMD_APPKEY", 16),
+        "AppSKey": ("CMD_APPSKEY", 16),
+        "Class": ("CMD_CLASS", ("A", "C")),
+        "Confirm": ("CMD_CFM", range(2)),
+        "DevAddr": ("CMD_DADDR", 4),
+        "DevEUI": ("CMD_DEVEUI", 8),
+        "DR": ("CMD_DR", range(7)),
+        "JoinMode": ("CMD_NJM", range(2)),
+        "NwkSKey": ("CMD_NWKSKEY", 16),
+        "TxPower": ("CMD_TXP", range(15)),
+
+    }
+
+    # names of the configurations accepted by configure() and readSettings()
+    SETTINGS = tuple(__settingCommand)
+
+    # version of the session file written by saveSession()
+    SESSION_VERSION = 1
 
-    def __init__(self, port, timeout=None):
+    def __init__(self, port, timeout=None, baudrate=9600, lazy=True, wallClock=False, retries=1):
         """This method is the constructor of the class.
 
-        :param port [str]: the serial port that will be used to communicate with the module
+        :param port: the serial port or pyserial URL [str] that will be used to communicate with
+        the module (e.g. "/dev/serial0" or "socket://host:port"), or a transport object
+        (see openTransport())
         :param timeout [int]: the time the port will wait for the module to respond (default = None)
+        :param baudrate [int]: the baud rate of the serial port (default = 9600)
+        :param lazy [bool]: True to open the port only when the first command is sent, 
+        False to open it right away (default = True)
+        :param wallClock [bool]: True to also record the wall-clock time of the responses 
+        (see TimedResult) (default = False)
+        :param retries [int]: the number of times a command is sent again after an invalid 
+        response (see resync()) (default = 1)
         """
 
+        # a socket is wrapped once, so reconnect() connects it again instead of reusing it closed
+        if isinstance(port, socket.socket):
+            port = SocketTransport(port)
         self.__port = port
         self.__timeout = timeout
-        self.__serialConnection = serial.Serial(
-            port=self.__port, baudrate=9600, timeout=self.__timeout)
+        self.__baudrate = baudrate
+        self.__serialConnection = None
+        self.__receiveBuffer = _ReceiveBuffer(wallClock=wallClock)
+        self.__settings = {}  # configuration applied through the set_* methods
+        self.__p2pConfig = P2PConfig()  # P2P configuration of the last set_P2PConfig()
+        self.__callbacks = {}  # functions called on each event
+        self.__arbiter = CommandArbiter()  # serializes the transactions of the threads
+        self.__local = threading.local()  # priority, deadline and token of each thread
+        self.__outstanding = False  # True if the response of an interrupted command may arrive
+        self.__expected = 0  # number of commands written whose response was not read
+        self.__lastResponse = None  # time of the last response of the module, in [ms]
+        self.__retries = retries
+        self.__resyncs = 0  # number of resynchronizations
+        self.__retried = 0  # number of commands sent again
+
+        if not lazy:
+            self.open()
+
+    def __enter__(self):
+        """This method opens the port when entering a "with" block.
+
+        :return: the object itself [SMW_SX1262M0]
+        """
+
+        self.open()
+
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        """This method closes the port when leaving a "with" block."""
+
+        self.close()
+
+    @_exclusive
+    def open(self):
+        """This method opens the serial port (it does nothing if the port is already open)."""
+
+        if self.__serialConnection is None and not self.__denied():
+            self.__serialConnection = openTransport(self.__port, self.__baudrate, self.__timeout)
+
+    @_exclusive
+    def close(self):
+        """This method closes the serial port (it can be opened again with open() or by sending 
+        a command)."""
+
+        if self.__serialConnection is not None and not self.__denied():
+            connection = self.__serialConnection
+            self.__serialConnection = None
+            connection.close()
+
+    def isOpen(self):
+        """This method checks if the serial port is open.
+
+        :return: the state of the port [bool]
+        """
+
+        return self.__serialConnection is not None
+
+    @_exclusive
+    def reconnect(self):
+        """This method closes and opens the serial port again, keeping the same object 
+        (and its configuration).
+
+        Note: an injected transport is reopened only if it has an "open" method.
+        """
+
+        if self.__denied():
+            return
+
+        try:
+            self.close()
+        except (serial.SerialException, OSError):
+            pass  # the port is already unusable
+        self.open()
+
+    @contextmanager
+    def priority(self, priority):
+        """This method sets the priority of the commands sent by the current thread inside a 
+        "with" block.
+
+        :param priority [Priority]: the priority (HIGH, NORMAL or LOW)
+
+        Example: with lorawan.priority(Priority.LOW):
+                     lorawan.ping()
+        """
+
+        previous = getattr(self.__local, "priority", Priority.NORMAL)
+        self.__local.priority = priority
+        try:
+            yield
+        finally:
+            self.__local.priority = previous
+
+    @contextmanager
+    def transaction(self, priority=None, deadline=None, cancel=None):
+        """This method gives the module to the current thread inside a "with" block, so that 
+        several commands are sent without commands from other threads between them.
+
+        :param priority [Priority]: the priority, or None to use the priority of the thread 
+        (default = None)
+        :param deadline [int]: the time limit of the block, in [ms] of millis() (default = None)
+        :param cancel [CancelToken]: a token that interrupts the block (default = None)
+
+        Note: if the module cannot be taken before the deadline or the cancellation, the 
+        commands inside the block return without using the module.
+        """
+
+        local = self.__local
+        if priority is None:
+            priority = getattr(local, "priority", Priority.NORMAL)
+
+        # a nested block keeps the tightest deadline and the token of the outer block
+        previous = (getattr(local, "deadline", None), getattr(local, "cancel", None),
+                    getattr(local, "denied", False))
+        if previous[0] is not None:
+            deadline = previous[0] if deadline is None else min(deadline, previous[0])
+        if cancel is None:
+            cancel = previous[1]
+        local.deadline, local.cancel = deadline, cancel
+
+        timeout = None if deadline is None else max(deadline - self.millis(), 0) / 1000  # [s]
+        acquired = self.__arbiter.acquire(priority, timeout, cancel)
+        local.denied = previous[2] or not acquired
+        try:
+            yield
+        finally:
+            if acquired:
+                self.__arbiter.release()
+            local.deadline, local.cancel, local.denied = previous
+
+    def metrics(self):
+        """This method gets the metrics of the transactions.
+
+        :return: for each priority [dict], the number of transactions and the mean and maximum 
+        time waiting for the module, in [ms], the number of threads waiting now ("waiting"), 
+        and the number of resynchronizations ("resyncs") and of commands sent again ("retries")
+        """
+
+        metrics = self.__arbiter.metrics()
+        metrics["resyncs"] = self.__resyncs
+        metrics["retries"] = self.__retried
+
+        return metrics
+
+    def idleTime(self):
+        """This method gets the time since the module was last used by any thread.
+
+        :return: the time, in [ms] [int], or 0 if the module is in use
+        """
+
+        return round(self.__arbiter.idleTime() * 1000)
+
+    def lastResponse(self):
+        """This method gets the time the module last responded (a status or an event line).
+
+        :return: the time, in [ms] of millis() [int], or None if the module has not responded yet
+        """
+
+        return self.__lastResponse
+
+    def lastTimestamp(self):
+        """This method gets the time the last response read by the current thread started to 
+        arrive (e.g. after a method that returns only the status).
+
+        :return: the monotonic and the wall-clock time (None if not enabled), in [ns] [tuple], 
+        or None if nothing was received
+        """
+
+        return getattr(self.__local, "timestamp", None)
 
     def millis(self):
         """This method gets the time in ms.
@@ -121,11 +629,136 @@ class SMW_SX1262M0:
 
         return round(monotonic() * 1000)
 
+    @_exclusive
     def flush(self):
         """This method clears the serial buffer."""
 
-        self.__serialConnection.flushInput()
+        if self.__denied():
+            return
+
+        self.__receiveBuffer.clear()
+        if self.__serialConnection is not None:
+            self.__serialConnection.reset_input_buffer()
+
+    def addCallback(self, event, function):
+        """This method registers a function to be called on an event.
+
+        :param event [str]: the name of the event
+        :param function [function]: the function to call
+
+        Events:
+            "link": function(source, rssi, snr) - called with the RSSI [int] and the SNR [int] 
+            read by get_RSSI(), get_SNR() and get_LinkQuality() (source = "lorawan") or received 
+            by P2P_listen() (source = "p2p"). A value not read is None.
+            "downlink": function(port, message, binary) - called when readT() (binary = False) 
+            or readX() (binary = True) returns a message.
+            "event": function(line) - called with each line returned by readLine().
+            "p2p": function(message, rssi, snr) - called when P2P_listen() returns a message 
+            [str] or P2P_receive() returns data [bytes].
+        """
+
+        self.__callbacks.setdefault(event, []).append(function)
+
+    def removeCallback(self, event, function):
+        """This method unregisters a function registered with addCallback().
+
+        :param event [str]: the name of the event
+        :param function [function]: the function to remove
+        """
+
+        if function in self.__callbacks.get(event, ()):
+            self.__callbacks[event].remove(function)
+
+    @_exclusive
+    def configure(self, settings, window=4):
+        """This method applies several configurations at once, sending the commands without 
+        waiting for each response (see pipeline()).
+
+        :param settings [dict]: the values, with the names of the set_* methods as keys 
+        (see SETTINGS) (e.g. {"DevAddr": "00000000", "JoinMode": 0})
+        :param window [int]: the maximum number of commands waiting for a response (default = 4)
+
+        :return: the response of each command [dict] (PARAM_ERROR for an unknown name or an 
+        invalid value, which is not sent)
 
+        Note: the configuration is not saved, call save() afterwards.
+        """
+
+        statuses = {}
+        commands = []
+        values = []
+        for name, value in settings.items():
+            value = self.__formatSetting(name, value)
+            if value is None:
+                statuses[name] = CommandResponse.PARAM_ERROR
+                continue
+            prefix = self.__commandPrefix[(self.__settingCommand[name][0], "SET")]
+            commands.append(f"{prefix.decode()}{value}")
+            values.append((name, value))
+
+        responses = self.pipeline(commands, self.SMW_SX1262M0_TIMEOUT_WRITE, window)
+        for (name, value), response in zip(values, responses):
+            status = self.__parse(response).status
+            self.__remember(name, value, status)
+            statuses[name] = status
+
+        return statuses
+
+    @_exclusive
+    def drain(self, quiet=SMW_SX1262M0_TIMEOUT_READ, timeout=SMW_SX1262M0_TIMEOUT_RESET):
+        """This method discards everything the module sends until the serial port is quiet, 
+        so that the next response is not mixed with old bytes.
+
+        :param quiet [int]: the time without new bytes that ends the drain, in [ms] 
+        (default = SMW_SX1262M0_TIMEOUT_READ)
+        :param timeout [int]: the maximum duration of the drain, in [ms] 
+        (default = SMW_SX1262M0_TIMEOUT_RESET)
+
+        :return: the number of bytes discarded [int]
+        """
+
+        if self.__denied():
+            return 0
+
+        discarded = len(self.__receiveBuffer)
+        self.__receiveBuffer.clear()
+        now = self.millis()
+        timeout = now + timeout
+        last = now
+        while not self.__interrupted():
+            now = self.millis()
+            if now - last >= quiet or now >= timeout:
+                break
+            read = self.__fill()
+            if read:
+                last = now
+                discarded += read
+                self.__receiveBuffer.clear()
+
+        # the responses still expected were discarded
+        self.__expected = 0
+        self.__outstanding = False
+
+        return discarded
+
+    @_exclusive
+    def execute(self, command, timeout=SMW_SX1262M0_TIMEOUT_WRITE):
+        """This method sends a raw AT command and reads its response.
+
+        :param command [str]: the command (e.g. "AT+DR=?")
+        :param timeout [int]: the maximum time to wait for the response, in [ms]
+        (default = SMW_SX1262M0_TIMEOUT_WRITE)
+
+        :return: the module's response [str] (it can be parsed with parseResponse())
+
+        Note: the method returns as soon as the status line is received.
+        """
+
+        self.__write(f"{command}\n".encode())
+
+        return self.__readCommand(timeout)
+
+    @_exclusive
     def get_ADR(self):
         """This method gets the Adaptive Data Rate.
 
@@ -136,12 +769,11 @@ class SMW_SX1262M0:
         self.__sendCommand("CMD_ADR", "GET")
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_READ)
         # parse the response
-        statusCommand = response.split()[-1]
-        response = response.split(statusCommand)[0].strip()
-        res = int(response) if response else None
+        result = self.__parse(response, "CMD_ADR")
 
-        return (CommandResponse[statusCommand], res)
+        return (self.__timed((result.status, result.value)))
 
+    @_exclusive
     def get_Ajoin(self):
         """This method gets the Automatic Join.
 
@@ -152,12 +784,11 @@ class SMW_SX1262M0:
         self.__sendCommand("CMD_AJOIN", "GET")
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_READ)
         # parse the response
-        statusCommand = response.split()[-1]
-        response = response.split(statusCommand)[0].strip()
-        res = int(response) if response else None
+        result = self.__parse(response, "CMD_AJOIN")
 
-        return (CommandResponse[statusCommand], res)
+        return (self.__timed((result.status, result.value)))
 
+    @_exclusive
     def get_AppEUI(self):
         """This method gets the Application EUI.
 
@@ -168,12 +799,11 @@ class SMW_SX1262M0:
         self.__sendCommand("CMD_APPEUI", "GET")
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_READ)
         # parse the response
-        statusCommand = response.split()[-1]
-        response = response.split(statusCommand)[0].strip()
-        res = str(response) if response else None
+        result = self.__parse(response, "CMD_APPEUI")
 
-        return (CommandResponse[statusCommand], res)
+        return (self.__timed((result.status, result.value)))
 
+    @_exclusive
     def get_AppKey(self):
         """This method gets the Application Key.
 
@@ -184,12 +814,11 @@ class SMW_SX1262M0:
         self.__sendCommand("CMD_APPKEY", "GET")
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_READ)
         # parse the response
-        statusCommand = response.split()[-1]
-        response = response.split(statusCommand)[0].strip()
-        res = str(response) if response else None
+        result = self.__parse(response, "CMD_APPKEY")
 
-        return (CommandResponse[statusCommand], res)
+        return (self.__timed((result.status, result.value)))
 
+    @_exclusive
     def get_AppSKey(self):
         """This method gets the Application Session Key.
 
@@ -200,12 +829,58 @@ class SMW_SX1262M0:
         self.__sendCommand("CMD_APPSKEY", "GET")
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_READ)
         # parse the response
-        statusCommand = response.split()[-1]
-        response = response.split(statusCommand)[0].strip()
-        res = str(response) if response else None
+        result = self.__parse(response, "CMD_APPSKEY")
 
-        return (CommandResponse[statusCommand], res)
+        return (self.__timed((result.status, result.value)))
 
+    @_exclusive
+    def get_Class(self):
+        """This method gets the LoRaWAN Class.
+
+        :return: the response of the command [CommandResponse] and the value [str] ("A" or "C")
+        """
+
+        # send the command and read the response
+        self.__sendCommand("CMD_CLASS", "GET")
+        response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_READ)
+        # parse the response
+        result = self.__parse(response, "CMD_CLASS")
+
+        return (self.__timed((result.status, result.value)))
+
+    @_exclusive
+    def get_Confirm(self):
+        """This method gets the Confirm Mode of the uplinks.
+
+        :return: the response of the command [CommandResponse] and the value [int] 
+        (0 = unconfirmed / 1 = confirmed)
+        """
+
+        # send the command and read the response
+        self.__sendCommand("CMD_CFM", "GET")
+        response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_READ)
+        # parse the response
+        result = self.__parse(response, "CMD_CFM")
+
+        return (self.__timed((result.status, result.value)))
+
+    @_exclusive
+    def get_ConfirmStatus(self):
+        """This method gets the Confirm Status of the last confirmed uplink.
+
+        :return: the response of the command [CommandResponse] and the value [int]
+        (1 if the network acknowledged the uplink, 0 otherwise)
+        """
+
+        # send the command and read the response
+        self.__sendCommand("CMD_CFS", "GET")
+        response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_READ)
+        # parse the response
+        result = self.__parse(response, "CMD_CFS")
+
+        return (self.__timed((result.status, result.value)))
+
+    @_exclusive
     def get_DevAddr(self):
         """This method gets the Device Address.
 
@@ -216,12 +891,11 @@ class SMW_SX1262M0:
         self.__sendCommand("CMD_DADDR", "GET")
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_READ)
         # parse the response
-        statusCommand = response.split()[-1]
-        response = response.split(statusCommand)[0].strip()
-        res = str(response) if response else None
+        result = self.__parse(response, "CMD_DADDR")
 
-        return (CommandResponse[statusCommand], res)
+        return (self.__timed((result.status, result.value)))
 
+    @_exclusive
     def get_DevEUI(self):
         """This method gets the Device EUI.
 
@@ -232,12 +906,11 @@ class SMW_SX1262M0:
         self.__sendCommand("CMD_DEVEUI", "GET")
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_READ)
         # parse the response
-        statusCommand = response.split()[-1]
-        response = response.split(statusCommand)[0].strip()
-        res = str(response) if response else None
+        result = self.__parse(response, "CMD_DEVEUI")
 
-        return (CommandResponse[statusCommand], res)
+        return (self.__timed((result.status, result.value)))
 
+    @_exclusive
     def get_DR(self):
         """This method gets the Data Rate.
 
@@ -248,12 +921,11 @@ class SMW_SX1262M0:
         self.__sendCommand("CMD_DR", "GET")
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_READ)
         # parse the response
-        statusCommand = response.split()[-1]
-        response = response.split(statusCommand)[0].strip()
-        res = int(response) if response else None
+        result = self.__parse(response, "CMD_DR")
 
-        return (CommandResponse[statusCommand], res)
+        return (self.__timed((result.status, result.value)))
 
+    @_exclusive
     def get_JoinMode(self):
         """This method gets the Network Join Mode.
 
@@ -264,12 +936,11 @@ class SMW_SX1262M0:
         self.__sendCommand("CMD_NJM", "GET")
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_READ)
         # parse the response
-        statusCommand = response.split()[-1]
-        response = response.split(statusCommand)[0].strip()
-        res = int(response) if response else None
+        result = self.__parse(response, "CMD_NJM")
 
-        return (CommandResponse[statusCommand], res)
+        return (self.__timed((result.status, result.value)))
 
+    @_exclusive
     def get_JoinStatus(self):
         """This method gets the Join Status.
 
@@ -280,12 +951,35 @@ class SMW_SX1262M0:
         self.__sendCommand("CMD_NJS", "GET")
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_READ)
         # parse the response
-        statusCommand = response.split()[-1]
-        response = response.split(statusCommand)[0].strip()
-        res = int(response[-1])
+        result = self.__parse(response, "CMD_NJS")
 
-        return (CommandResponse[statusCommand], res)
+        return (self.__timed((result.status, result.value)))
+
+    @_exclusive
+    def get_LinkQuality(self):
+        """This method gets the RSSI and the SNR of the last received message in a single round
+        trip (both commands are sent before reading the responses).
+
+        :return: the response of the commands [CommandResponse], the RSSI [int] and the SNR [int]
+        """
 
+        # send the commands and read the responses
+        self.__sendCommand("CMD_RSSI", "GET")
+        self.__sendCommand("CMD_SNR", "GET")
+        response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_READ, flush=False)
+        rssi = self.__parse(response, "CMD_RSSI")
+        stamp = self.lastTimestamp()
+        response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_READ)
+        snr = self.__parse(response, "CMD_SNR")
+
+        # report the first error
+        status = rssi.status if rssi.status != CommandResponse.OK else snr.status
+        if status == CommandResponse.OK:
+            self.__emit("link", "lorawan", rssi.value, snr.value)
+
+        return (self.__timed((status, rssi.value, snr.value), stamp))
+
+    @_exclusive
     def get_NwkSKey(self):
         """This method gets the Network Session Key.
 
@@ -296,12 +990,33 @@ class SMW_SX1262M0:
         self.__sendCommand("CMD_NWKSKEY", "GET")
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_READ)
         # parse the response
-        statusCommand = response.split()[-1]
-        response = response.split(statusCommand)[0].strip()
-        res = str(response) if response else None
+        result = self.__parse(response, "CMD_NWKSKEY")
+
+        return (self.__timed((result.status, result.value)))
 
-        return (CommandResponse[statusCommand], res)
+    @_exclusive
+    def get_P2PConfig(self):
+        """This method gets the radio parameters of the P2P communication.
 
+        :return: the response of the command [CommandResponse] and the configuration [P2PConfig]
+        (None if it could not be read)
+        """
+
+        # send the command and read the response
+        self.__sendCommand("CMD_LORA_CONFIG", "GET")
+        response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_READ)
+        # parse the response (the parameters can use several lines)
+        result = self.__parse(response)
+        config = None
+        if result.status == CommandResponse.OK:
+            config = P2PConfig.fromResponse(response.rstrip().rpartition("\n")[0])
+            if config is None:
+                self.__invalid(response)
+                result.status = CommandResponse.INVALID_RESPONSE
+
+        return (self.__timed((result.status, config)))
+
+    @_exclusive
     def get_RSSI(self):
         """This method gets the RSSI of the last received message.
 
@@ -312,12 +1027,13 @@ class SMW_SX1262M0:
         self.__sendCommand("CMD_RSSI", "GET")
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_READ)
         # parse the response
-        statusCommand = response.split()[-1]
-        response = response.split(statusCommand)[0].strip()
-        res = int(response) if response else None
+        result = self.__parse(response, "CMD_RSSI")
+        if result.status == CommandResponse.OK:
+            self.__emit("link", "lorawan", result.value, None)
 
-        return (CommandResponse[statusCommand], res)
+        return (self.__timed((result.status, result.value)))
 
+    @_exclusive
     def get_SNR(self):
         """This method gets the SNR of the last received message.
 
@@ -328,12 +1044,29 @@ class SMW_SX1262M0:
         self.__sendCommand("CMD_SNR", "GET")
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_READ)
         # parse the response
-        statusCommand = response.split()[-1]
-        response = response.split(statusCommand)[0].strip()
-        res = int(response) if response else None
+        result = self.__parse(response, "CMD_SNR")
+        if result.status == CommandResponse.OK:
+            self.__emit("link", "lorawan", None, result.value)
+
+        return (self.__timed((result.status, result.value)))
+
+    @_exclusive
+    def get_TxPower(self):
+        """This method gets the Transmit Power.
+
+        :return: the response of the command [CommandResponse] and the value [int] 
+        (0-14, each step is 2 dB below the maximum)
+        """
+
+        # send the command and read the response
+        self.__sendCommand("CMD_TXP", "GET")
+        response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_READ)
+        # parse the response
+        result = self.__parse(response, "CMD_TXP")
 
-        return (CommandResponse[statusCommand], res)
+        return (self.__timed((result.status, result.value)))
 
+    @_exclusive
     def get_Version(self):
         """This method gets the firmware version of the module.
 
@@ -344,12 +1077,11 @@ class SMW_SX1262M0:
         self.__sendCommand("CMD_VERSION", "GET")
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_READ)
         # parse the response
-        statusCommand = response.split()[-1]
-        response = response.split(statusCommand)[0].strip()
-        res = str(response) if response else None
+        result = self.__parse(response, "CMD_VERSION")
 
-        return (CommandResponse[statusCommand], res)
+        return (self.__timed((result.status, result.value)))
 
+    @_exclusive
     def isConnected(self):
         """This method checks if the module is connected to the network.
 
@@ -363,6 +1095,7 @@ class SMW_SX1262M0:
         else:
             return False
 
+    @_exclusive(retry=False)
     def join(self):
         """This method starts a join to the network.
 
@@ -373,75 +1106,93 @@ class SMW_SX1262M0:
         self.__sendCommand("CMD_JOIN", "RUN")
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_READ)
         # parse the response
-        statusCommand = response.split()[-1]
+        result = self.__parse(response)
 
-        return (CommandResponse[statusCommand])
+        return (result.status)
 
+    @_exclusive
     def P2P_listen(self, timeout_listen):
         """This method listens for incoming P2P messages.
 
         :param timeout_listen [int]: the time to wait, in [ms]
 
         :return: message [str], RSSI [int] and SNR [int] if a message was received 
-        or False [bool] otherwise
+        (a TimedResult) or False [bool] otherwise
         """
 
-        statusMessage = False
-        timeout = self.millis() + timeout_listen  # [ms]
-        while self.millis() < timeout:
-            buffer = self.__serialConnection.read(
-                self.__serialConnection.inWaiting())
-
-            if buffer:
-                # convert the response to UTF-8
-                self.__messageReceived += (buffer.decode(encoding="utf8",
-                                                         errors='ignore'))
-
-            # check if the message has ended
-            elif "\n\r" in self.__messageReceived or "Test Stop" in self.__messageReceived:
-                statusMessage = True
-                break
+        frame = self.__listen(timeout_listen)
+        if frame:
+            self.__emit("p2p", *frame)
 
-        # check if the message is True
-        if statusMessage:
+        return frame
 
-            try:
-                # parse the message
-                res = self.__messageReceived.replace("Test Stop", "")
-                # get the message
-                message = (res.split("Text-> ")[-1]).strip()
-                # get the RSSI and the SNR
-                res = res.split()
-                for word in res:
-                    if "RSSI=" in word:
-                        rssi = word.split("RSSI=")[-1]
-                    elif "SNR=" in word:
-                        snr = word.split("SNR=")[-1]
+    @_exclusive
+    def P2P_receive(self, timeout_listen):
+        """This method listens for an incoming P2P message sent with P2P_send().
 
-                self.__messageReceived = "" # clear the variable
-                self.flush()
+        :param timeout_listen [int]: the time to wait, in [ms]
 
-                return str(message), int(rssi), int(snr)
+        :return: data [bytes], RSSI [int] and SNR [int] if a message was received 
+        (a TimedResult) or False [bool] otherwise (also if the message was not hexadecimal)
+        """
 
-            except:
-                return False
+        frame = self.__listen(timeout_listen)
+        if not frame:
+            return False
 
-        else:
+        message, rssi, snr = frame
+        try:
+            data = bytes.fromhex(message)
+        except ValueError:
             return False
+        self.__emit("p2p", data, rssi, snr)
+
+        return TimedResult((data, rssi, snr), (frame.timestamp, frame.wallTime))
 
-    def P2P_start(self, frequency=915200, continuous=False, message=None):
+    @_exclusive(retry=False)
+    def P2P_send(self, data, frequency=None, continuous=False):
+        """This method sends binary data in a P2P message (hexadecimal on the air, so any byte 
+        value is allowed).
+
+        :param data [bytes]: the data to send (up to 255 bytes)
+        :param frequency [int]: the frequency to use for the wireless communication, in [kHz], 
+        or None for the one of the last set_P2PConfig() (915200 if not set) (default = None)
+        :param continuous [bool]: True to make the communication persistent (default = False)
+
+        :return: the response of the command [CommandResponse]
+        """
+
+        # check if the data fits in a LoRa frame
+        data = bytes(data)
+        if not data or len(data) > 255:
+            return (CommandResponse["PARAM_ERROR"])
+
+        return (self.P2P_start(frequency, continuous, data.hex().upper()))
+
+    @_exclusive(retry=False)
+    def P2P_start(self, frequency=None, continuous=False, message=None):
         """This method configures the module for a P2P communication.
 
-        :param frequency [int]: the frequency to use for the wireless communication, in [kHz]
+        :param frequency [int]: the frequency to use for the wireless communication, in [kHz], 
+        or None for the one of the last set_P2PConfig() (915200 if not set) (default = None)
         :param continuous [bool]: True to make the communication persistent
         :param message [str]: the message to be sent or None to set as receiver (default = None)
 
         :return: the response of the command [CommandResponse]
 
         Note: upon transmission, the module might need some time to effectively send the message 
-        after the command has been executed.
+        after the command has been executed. A message with line breaks is not accepted, use 
+        P2P_send() for binary data.
         """
 
+        # a line break would end the command
+        if message is not None and ("\n" in message or "\r" in message):
+            return (CommandResponse["PARAM_ERROR"])
+
+        # the command needs a frequency (the module is not queried, to keep the send fast)
+        if frequency is None:
+            frequency = self.__p2pConfig.frequency
+
         # send the command and read the response
 
         mode = 1 if continuous else 0 # check which mode was selected
@@ -457,11 +1208,11 @@ class SMW_SX1262M0:
 
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_READ)
         # parse the response
-        statusCommand = response.split()[-1]
-        response = response.split(statusCommand)[0].strip()
+        result = self.__parse(response)
 
-        return (CommandResponse[statusCommand])
+        return (result.status)
 
+    @_exclusive
     def P2P_stop(self):
         """This method stops the P2P communication.
 
@@ -472,10 +1223,47 @@ class SMW_SX1262M0:
         self.__sendCommand("CMD_LORA_OFF", "RUN")
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_READ)
         # parse the response
-        statusCommand = response.split()[-1]
+        result = self.__parse(response)
+
+        return (result.status)
+
+    @classmethod
+    def parseResponse(cls, response, cmd=None):
+        """This method parses the response of a command in a single pass.
+
+        :param response [str]: the response read from the module
+        :param cmd [str]: the command whose value must be converted (e.g. "CMD_RSSI"), 
+        or None to parse only the status (default = None)
+
+        :return: the parsed response [Response]
 
-        return (CommandResponse[statusCommand])
+        Note: the status is the last line of the response and the value is the line before it,
+        so asynchronous events sent before the value are ignored. An empty response (the module 
+        did not respond) has the status TIMEOUT, and a response without a valid status or value 
+        has the status INVALID_RESPONSE.
+        """
 
+        body, _, status = response.rstrip().rpartition("\n")
+        status = status.strip()
+        if not status:
+            return Response(CommandResponse.TIMEOUT, None, response)
+        if status not in cls.__statusNames:
+            return Response(CommandResponse.INVALID_RESPONSE, None, response)
+
+        value = None
+        if cmd is not None:
+            value = body.rstrip().rpartition("\n")[2].strip()
+            if value:
+                try:
+                    value = cls.__responseType.get(cmd, str)(value)
+                except ValueError:
+                    return Response(CommandResponse.INVALID_RESPONSE, None, response)
+            else:
+                value = None
+
+        return Response(CommandResponse[status], value, response)
+
+    @_exclusive
     def ping(self):
         """This method pings the module.
 
@@ -486,10 +1274,65 @@ class SMW_SX1262M0:
         self.__sendCommand(cmd="", action="RUN")
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_READ)
         # parse the response
-        statusCommand = response.split()[-1]
+        result = self.__parse(response)
+
+        return (result.status)
+
+    @_exclusive
+    def pipeline(self, commands, timeout=SMW_SX1262M0_TIMEOUT_WRITE, window=4):
+        """This method sends several raw AT commands without waiting for each response before
+        sending the next one.
+
+        :param commands [list]: the commands [str]
+        :param timeout [int]: the maximum time to wait for each response, in [ms]
+        (default = SMW_SX1262M0_TIMEOUT_WRITE)
+        :param window [int]: the maximum number of commands waiting for a response (default = 4)
+
+        :return: the responses [list], in the same order as the commands
+
+        Note: keep the window small, the module has a limited receive buffer.
+        """
+
+        commands = list(commands)
+        responses = []
+        sent = 0
+        while len(responses) < len(commands):
+            # keep the window full
+            while sent < len(commands) and sent - len(responses) < window:
+                self.__write(f"{commands[sent]}\n".encode())
+                sent += 1
 
-        return (CommandResponse[statusCommand])
+            # the buffer is cleared only after the last response
+            last = len(responses) == len(commands) - 1
+            responses.append(self.__readCommand(timeout, flush=last))
 
+        return responses
+
+    @_exclusive
+    def readLine(self, timeout=0):
+        """This method reads a line sent by the module outside of a command (e.g. an asynchronous
+        event).
+
+        :param timeout [int]: the time to wait for the line, in [ms] (default = 0)
+
+        :return: the line [str] or None if no complete line was received
+        """
+
+        timeout = self.millis() + timeout
+        while not self.__interrupted():
+            stamp = self.__receiveBuffer.timestamp()
+            line = self.__receiveBuffer.readline()
+            if line is not None:
+                self.__local.timestamp = stamp
+                self.__lastResponse = self.millis()
+                self.__emit("event", line)
+                return line
+            if not self.__fill() and self.millis() >= timeout:
+                return None
+
+        return None
+
+    @_exclusive
     def readT(self):
         """This method reads a text message from the module.
 
@@ -500,13 +1343,15 @@ class SMW_SX1262M0:
         self.__sendCommand(cmd="CMD_RECV", action="GET")
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_READ)
         # parse the response
-        statusCommand = response.split()[-1]
-        response = response.split(statusCommand)[0].strip()
-        # the first split is used to ignore asynchronous events (chapter 3.6 of AT command set V0.1_Rev2.14)
-        port, message = response.split()[-1].split(":")
+        # asynchronous events (chapter 3.6 of AT command set V0.1_Rev2.14) are ignored by the parser
+        result = self.__parse(response, "CMD_RECV")
+        port, message = result.value if result.value else (None, None)
+        if message:
+            self.__emit("downlink", port, message, False)
 
-        return (CommandResponse[statusCommand], int(port), str(message))
+        return (self.__timed((result.status, port, message)))
 
+    @_exclusive
     def readX(self):
         """This method reads a hexadecimal message from the module.
 
@@ -517,20 +1362,85 @@ class SMW_SX1262M0:
         self.__sendCommand(cmd="CMD_RECVB", action="GET")
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_READ)
         # parse the response
-        statusCommand = response.split()[-1]
-        response = response.split(statusCommand)[0].strip()
-        # the first split is used to ignore asynchronous events (chapter 3.6 of AT command set V0.1_Rev2.14)
-        port, message = response.split()[-1].split(":")
+        # asynchronous events (chapter 3.6 of AT command set V0.1_Rev2.14) are ignored by the parser
+        result = self.__parse(response, "CMD_RECVB")
+        port, message = result.value if result.value else (None, None)
+        if message:
+            self.__emit("downlink", port, message, True)
+
+        return (self.__timed((result.status, port, message)))
 
-        return (CommandResponse[statusCommand], int(port), str(message))
+    @_exclusive
+    def readSettings(self, names, window=4):
+        """This method reads several configurations at once, sending the commands without 
+        waiting for each response (see pipeline()).
 
+        :param names [list]: the names of the configurations (see SETTINGS)
+        :param window [int]: the maximum number of commands waiting for a response (default = 4)
+
+        :return: the response of the command [CommandResponse] and the value of each 
+        configuration [dict] (PARAM_ERROR and None for an unknown name)
+        """
+
+        results = {}
+        commands = []
+        known = []
+        for name in names:
+            if name not in self.__settingCommand:
+                results[name] = (CommandResponse.PARAM_ERROR, None)
+                continue
+            cmd = self.__settingCommand[name][0]
+            commands.append(self.__commandLine[(cmd, "GET")].decode().rstrip())
+            known.append((name, cmd))
+
+        responses = self.pipeline(commands, self.SMW_SX1262M0_TIMEOUT_READ, window)
+        for (name, cmd), response in zip(known, responses):
+            result = self.__parse(response, cmd)
+            results[name] = (result.status, result.value)
+
+        return results
+
+    @_exclusive
+    def resync(self, timeout=SMW_SX1262M0_TIMEOUT_READ, attempts=3):
+        """This method realigns the responses with the commands after an invalid response, 
+        without resetting the module: the serial port is drained until it is idle and a bare 
+        AT is sent until its response is exactly "OK".
+
+        :param timeout [int]: the time to wait for each response, in [ms] 
+        (default = SMW_SX1262M0_TIMEOUT_READ)
+        :param attempts [int]: the maximum number of AT commands (default = 3)
+
+        :return: the response of the command [CommandResponse] (OK if the responses are aligned)
+        """
+
+        self.__resyncs += 1
+        status = CommandResponse.TIMEOUT
+        for _ in range(attempts):
+            # at 9600 bps, 20 ms without bytes means that the module is not sending anything
+            self.drain(quiet=20)
+            self.__write(b"AT\n")
+            response = self.__readCommand(timeout)
+            lines = [line.strip() for line in response.splitlines() if line.strip()]
+            if lines == ["OK"]:
+                return (CommandResponse.OK)
+
+            status = self.parseResponse(response).status
+            if status == CommandResponse.OK:
+                status = CommandResponse.INVALID_RESPONSE  # other lines came with the "OK"
+            if self.__interrupted():
+                break
+
+        return (status)
+
+    @_exclusive(retry=False)
     def reset(self):
         """This method resets the module."""
 
         # send the command and read the response
-        self.__serialConnection.write("ATZ\n".encode())
+        self.__write(b"ATZ\n")
         self.__readCommand(self.SMW_SX1262M0_TIMEOUT_RESET)
 
+    @_exclusive
     def save(self):
         """This method saves the module's configuration."""
 
@@ -538,10 +1448,51 @@ class SMW_SX1262M0:
         self.__sendCommand("CMD_SAVE", "RUN")
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_WRITE)
         # parse the response
-        statusCommand = response.split()[-1]
+        result = self.__parse(response)
 
-        return (CommandResponse[statusCommand])
+        return (result.status)
 
+    @_exclusive
+    def saveSession(self, filename):
+        """This method stores the known configuration and the join state of the module in a file,
+        so that a later warmStart() can skip the reset, the configuration and the join.
+
+        :param filename [str]: the path of the session file
+
+        :return: the response of the command [CommandResponse]
+
+        Note: the file is created only readable by its owner, since it contains the keys.
+        """
+
+        # read the current state of the module
+        status, joined = self.get_JoinStatus()
+        if status != CommandResponse.OK:
+            return (status)
+        status, devAddr = self.get_DevAddr()
+        if status != CommandResponse.OK:
+            return (status)
+
+        session = {
+            "version": self.SESSION_VERSION,
+            "port": str(self.__port),
+            "settings": self.__settings,
+            "joined": joined,
+            "devAddr": devAddr,
+        }
+
+        # write to a temporary file first, so a crash never leaves a truncated session behind
+        # (only readable by the owner, since the settings include the keys)
+        temporary = f"{filename}.tmp"
+        if os.path.lexists(temporary):
+            os.remove(temporary)
+        descriptor = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(descriptor, "w") as file:
+            json.dump(session, file)
+        os.replace(temporary, filename)
+
+        return (CommandResponse.OK)
+
+    @_exclusive(retry=False)
     def sendT(self, port, message):
         """This method sends a text message.
 
@@ -557,10 +1508,11 @@ class SMW_SX1262M0:
         self.__sendCommand("CMD_SEND", "SET", param)
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_WRITE)
         # parse the response
-        statusCommand = response.split()[-1]
+        result = self.__parse(response)
 
-        return (CommandResponse[statusCommand])
+        return (result.status)
 
+    @_exclusive(retry=False)
     def sendX(self, port, message):
         """This method sends a hexadecimal message.
 
@@ -583,13 +1535,14 @@ class SMW_SX1262M0:
             self.__sendCommand("CMD_SENDB", "SET", param)
             response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_WRITE)
             # parse the response
-            statusCommand = response.split()[-1]
+            result = self.__parse(response)
 
-            return (CommandResponse[statusCommand])
+            return (result.status)
 
         else:
             return (CommandResponse["PARAM_ERROR"])
 
+    @_exclusive
     def set_ADR(self, adr):
         """This method sets the Adaptive Data Rate.
 
@@ -606,10 +1559,12 @@ class SMW_SX1262M0:
         self.__sendCommand("CMD_ADR", "SET", adr)
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_WRITE)
         # parse the response
-        statusCommand = response.split()[-1]
+        status = self.__parse(response).status
+        self.__remember("ADR", adr, status)
 
-        return (CommandResponse[statusCommand])
+        return (status)
 
+    @_exclusive
     def set_AJoin(self, mode):
         """This method sets the Automatic Join.
 
@@ -626,10 +1581,12 @@ class SMW_SX1262M0:
         self.__sendCommand("CMD_AJOIN", "SET", mode)
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_READ)
         # parse the response
-        statusCommand = response.split()[-1]
+        status = self.__parse(response).status
+        self.__remember("AJoin", mode, status)
 
-        return (CommandResponse[statusCommand])
+        return (status)
 
+    @_exclusive
     def set_AppEUI(self, appEui):
         """This method sets the Application EUI.
 
@@ -660,10 +1617,12 @@ class SMW_SX1262M0:
         self.__sendCommand("CMD_APPEUI", "SET", appEui)
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_WRITE)
         # parse the response
-        statusCommand = response.split()[-1]
+        status = self.__parse(response).status
+        self.__remember("AppEUI", appEui, status)
 
-        return (CommandResponse[statusCommand])
+        return (status)
 
+    @_exclusive
     def set_AppKey(self, key):
         """This method sets the Application Key.
 
@@ -694,10 +1653,12 @@ class SMW_SX1262M0:
         self.__sendCommand("CMD_APPKEY", "SET", key)
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_WRITE)
         # parse the response
-        statusCommand = response.split()[-1]
+        status = self.__parse(response).status
+        self.__remember("AppKey", key, status)
 
-        return (CommandResponse[statusCommand])
+        return (status)
 
+    @_exclusive
     def set_AppSKey(self, skey):
         """This method sets the Application Session Key.
 
@@ -728,10 +1689,60 @@ class SMW_SX1262M0:
         self.__sendCommand("CMD_APPSKEY", "SET", skey)
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_WRITE)
         # parse the response
-        statusCommand = response.split()[-1]
+        status = self.__parse(response).status
+        self.__remember("AppSKey", skey, status)
+
+        return (status)
+
+    @_exclusive
+    def set_Class(self, loraClass):
+        """This method sets the LoRaWAN Class.
+
+        :param loraClass [str]: the value for the Class ("A" or "C")
+
+        :return: the response of the command [CommandResponse]
+
+        Note: in Class C the module listens continuously, so downlinks arrive at any time
+        (see DownlinkReceiver).
+        """
+
+        # check if the value passed is valid
+        loraClass = str(loraClass).upper()
+        if loraClass not in ("A", "C"):
+            return (CommandResponse["PARAM_ERROR"])
+
+        # send the command and read the response
+        self.__sendCommand("CMD_CLASS", "SET", loraClass)
+        response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_WRITE)
+        # parse the response
+        status = self.__parse(response).status
+        self.__remember("Class", loraClass, status)
+
+        return (status)
+
+    @_exclusive
+    def set_Confirm(self, mode):
+        """This method sets the Confirm Mode of the uplinks.
 
-        return (CommandResponse[statusCommand])
+        :param mode [int]: the value for the mode (0 = unconfirmed / 1 = confirmed)
 
+        :return: the response of the command [CommandResponse]
+        """
+
+        # check if the value passed is within the range
+        if mode > 1:
+            return (CommandResponse["PARAM_ERROR"])
+
+        # send the command and read the response
+        self.__sendCommand("CMD_CFM", "SET", mode)
+        response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_WRITE)
+        # parse the response
+        status = self.__parse(response).status
+        self.__remember("Confirm", mode, status)
+
+        return (status)
+
+    @_exclusive
     def set_DevAddr(self, devAddr):
         """This method sets the Device Address.
 
@@ -762,10 +1773,12 @@ class SMW_SX1262M0:
         self.__sendCommand("CMD_DADDR", "SET", devAddr)
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_WRITE)
         # parse the response
-        statusCommand = response.split()[-1]
+        status = self.__parse(response).status
+        self.__remember("DevAddr", devAddr, status)
 
-        return (CommandResponse[statusCommand])
+        return (status)
 
+    @_exclusive
     def set_DR(self, dr):
         """This method sets the Data Rate.
 
@@ -782,10 +1795,12 @@ class SMW_SX1262M0:
         self.__sendCommand("CMD_DR", "SET", dr)
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_WRITE)
         # parse the response
-        statusCommand = response.split()[-1]
+        status = self.__parse(response).status
+        self.__remember("DR", dr, status)
 
-        return (CommandResponse[statusCommand])
+        return (status)
 
+    @_exclusive
     def set_JoinMode(self, mode):
         """This method sets the Network Join Mode.
 
@@ -802,10 +1817,12 @@ class SMW_SX1262M0:
         self.__sendCommand("CMD_NJM", "SET", mode)
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_WRITE)
         # parse the response
-        statusCommand = response.split()[-1]
+        status = self.__parse(response).status
+        self.__remember("JoinMode", mode, status)
 
-        return (CommandResponse[statusCommand])
+        return (status)
 
+    @_exclusive
     def set_NwkSKey(self, nwkSKey):
         """This method sets the Network Session Key.
 
@@ -836,9 +1853,125 @@ class SMW_SX1262M0:
         self.__sendCommand("CMD_NWKSKEY", "SET", nwkSKey)
         response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_WRITE)
         # parse the response
-        statusCommand = response.split()[-1]
+        status = self.__parse(response).status
+        self.__remember("NwkSKey", nwkSKey, status)
+
+        return (status)
+
+    @_exclusive
+    def set_P2PConfig(self, config):
+        """This method sets the radio parameters of the P2P communication (used by the next 
+        P2P_start()).
+
+        :param config [P2PConfig]: the configuration, or the name [str] of one of P2P_PRESETS 
+        (e.g. "maxThroughput")
+
+        :return: the response of the command [CommandResponse]
+        """
+
+        # check if the configuration is valid
+        if isinstance(config, str):
+            if config not in P2P_PRESETS:
+                return (CommandResponse["PARAM_ERROR"])
+            config = P2P_PRESETS[config]
+        if config.errors():
+            return (CommandResponse["PARAM_ERROR"])
+
+        # send the command and read the response
+        self.__sendCommand("CMD_LORA_CONFIG", "SET", config.toParameter())
+        response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_WRITE)
+        # parse the response
+        status = self.__parse(response).status
+        if status == CommandResponse.OK:
+            self.__p2pConfig = config
+
+        return (status)
+
+    @_exclusive
+    def set_TxPower(self, txPower):
+        """This method sets the Transmit Power.
+
+        :param txPower [int]: the value for the Transmit Power (0-14, 0 is the maximum power 
+        and each step is 2 dB below it)
+
+        :return: the response of the command [CommandResponse]
+        """
+
+        # check if the passed value is within the range
+        if txPower > 14:
+            return (CommandResponse["PARAM_ERROR"])
+
+        # send the command and read the response
+        self.__sendCommand("CMD_TXP", "SET", txPower)
+        response = self.__readCommand(self.SMW_SX1262M0_TIMEOUT_WRITE)
+        # parse the response
+        status = self.__parse(response).status
+        self.__remember("TxPower", txPower, status)
+
+        return (status)
+
+    @_exclusive
+    def warmStart(self, filename, settings=None):
+        """This method tries to resume the session stored by saveSession(). It only uses cheap
+        reads (ping, join status and device address) to check that the module is still in the
+        stored state.
+
+        :param filename [str]: the path of the session file
+        :param settings [dict]: the configuration the application would apply, using the names 
+        of the set_* methods as keys (e.g. {"DevAddr": "00000000", "JoinMode": 0}) (default = None)
+
+        :return: True [bool] if the session was resumed, so reset(), the configuration and join()
+        can be skipped, or False [bool] otherwise
+
+        Note: when False is returned, start the module as usual and call saveSession() after
+        joining the network.
+        """
+
+        # load the stored session
+        try:
+            with open(filename) as file:
+                session = json.load(file)
+            stored = session["settings"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+
+        if session.get("version") != self.SESSION_VERSION:
+            return False
+
+        # only a joined session can be resumed
+        if not session.get("joined"):
+            return False
+
+        # check if the requested configuration is the same as the stored one
+        if settings:
+            for name, value in settings.items():
+                if name not in stored:
+                    return False
+                if self.__normalize(value) != self.__normalize(stored[name]):
+                    return False
+
+        # check if the module is still in the stored state
+        try:
+            if self.ping() != CommandResponse.OK:
+                return False
+
+            status, joined = self.get_JoinStatus()
+            if status != CommandResponse.OK or joined != session["joined"]:
+                return False
+
+            status, devAddr = self.get_DevAddr()
+            if status != CommandResponse.OK:
+                return False
+            if self.__normalize(devAddr) != self.__normalize(session["devAddr"]):
+                return False
+
+        except (KeyError, IndexError, ValueError):
+            # no response or an unexpected one
+            return False
 
-        return (CommandResponse[statusCommand])
+        self.__settings = dict(stored)
+
+        return True
 
     def __sendCommand(self, cmd, action, parameter=""):
         """This method uses the serial connection to send commands to the module.
@@ -852,48 +1985,384 @@ class SMW_SX1262M0:
                    cmd   action  parameter
         """
 
-        if cmd:
-            finalCommand = f"AT+{self.__commandDictionary[cmd]}{self.__commandAction[action]}{parameter}"
-
-        else:
-            finalCommand = f"AT{self.__commandAction[action]}"
-
         # it is IMPORTANT not to use '\r' and '\n' together
-        # self.flush()
-        self.__serialConnection.write(f"{finalCommand}\n".encode())
+        if parameter == "":
+            self.__write(self.__commandLine[(cmd, action)])
+        else:
+            prefix = self.__commandPrefix[(cmd, action)]
+            self.__write(b"%b%b\n" % (prefix, str(parameter).encode()))
 
-    def __readCommand(self, timeout):
+    def __readCommand(self, timeout, flush=True):
         """This method reads the response of a command.
 
         :param timeout [int]: the time to wait, in [ms]
+        :param flush [bool]: True to clear the serial buffer after the response, False to keep 
+        the bytes received after it (default = True)
 
         :return: the module's response to the command sent [str]
         """
 
-        response = ""
+        lines = []
         stop = False
+        stamp = None
         timeout = self.millis() + timeout
-        while self.millis() < timeout:
-            buffer = self.__serialConnection.read(
-                self.__serialConnection.inWaiting())
-
-            if buffer:
-                # convert the response to UTF-8
-                response += (buffer.decode(encoding="utf8",
-                                           errors='ignore'))
-            # check if the command return code matches the code list expected
-            for index in CommandResponse:
-                if index.name in response:
+        while True:
+            # stop waiting if the deadline was reached or the command was cancelled
+            interrupted = self.__interrupted()
+            if interrupted is not None:
+                if self.__denied():
+                    return interrupted.name  # the module belongs to another thread
+                lines.append(interrupted.name)
+                self.__outstanding = self.__outstanding or self.__expected > 0
+                break
+
+            # decode only the complete lines (some may have been received with a previous response)
+            if stamp is None:
+                stamp = self.__receiveBuffer.timestamp()
+            line = self.__receiveBuffer.readline()
+            if line is not None:
+                lines.append(line)
+                # check if the command return code matches the code list expected
+                if line.strip() in self.__statusNames:
                     stop = True
                     break
+                continue
 
-            if stop:
+            if self.millis() >= timeout:
                 break
 
-        self.flush()
+            # accept a return code without the line break
+            if not self.__fill() and self.__receiveBuffer.pending() in self.__statusBytes:
+                if stamp is None:
+                    stamp = self.__receiveBuffer.timestamp()
+                lines.append(self.__receiveBuffer.readall())
+                stop = True
+                break
+
+        if stop:
+            self.__expected = max(self.__expected - 1, 0)
+            self.__lastResponse = self.millis()
+
+        # keep what was received before the timeout
+        elif self.__receiveBuffer and not self.__denied():
+            if stamp is None:
+                stamp = self.__receiveBuffer.timestamp()
+            lines.insert(-1 if interrupted else len(lines), self.__receiveBuffer.readall())
+
+        if not self.__denied():
+            self.__local.timestamp = stamp
+
+        if flush:
+            self.__expected = 0
+            self.flush()
+
+        return "\n".join(lines)
+
+    def __write(self, data):
+        """This method writes to the serial port, opening it if necessary. If the port fails, 
+        it is reopened and the data is written once more.
+
+        :param data [bytes]: the data to write
+
+        Note: nothing is written if the call was interrupted.
+        """
+
+        if self.__interrupted():
+            return
+
+        # discard the late response of an interrupted command
+        if self.__outstanding:
+            self.__readCommand(self.SMW_SX1262M0_TIMEOUT_READ)
+            if self.__interrupted():
+                return
+            self.__outstanding = False
+
+        self.open()
+        try:
+            self.__serialConnection.write(data)
+        except (serial.SerialException, OSError):
+            self.reconnect()
+            self.__serialConnection.write(data)
+        self.__expected += 1
+
+    def __fill(self):
+        """This method reads the bytes available in the serial port into the receive buffer, 
+        opening the port if necessary. If the port fails, it is reopened and nothing is read.
+
+        :return: the number of bytes read [int]
+
+        Note: when nothing is available, it waits SMW_SX1262M0_POLL_INTERVAL, so the loops that 
+        wait for the module do not keep the CPU busy.
+        """
+
+        if self.__denied():
+            return 0
+
+        self.open()
+        try:
+            count = self.__receiveBuffer.fill(self.__serialConnection)
+        except (serial.SerialException, OSError):
+            self.reconnect()
+            return 0
+        if not count:
+            sleep(self.SMW_SX1262M0_POLL_INTERVAL / 1000)
+
+        return count
+
+    def __denied(self):
+        """This method checks if the current thread could not take the module (its transaction 
+        was interrupted before starting), in which case the module must not be used.
+
+        :return: the state [bool]
+        """
+
+        return getattr(self.__local, "denied", False)
+
+    def __interrupted(self):
+        """This method checks if the current call must stop.
+
+        :return: CommandResponse.CANCELLED or CommandResponse.TIMEOUT [CommandResponse], 
+        or None to continue
+        """
+
+        local = self.__local
+        cancel = getattr(local, "cancel", None)
+        if cancel is not None and cancel.cancelled:
+            return CommandResponse.CANCELLED
+
+        deadline = getattr(local, "deadline", None)
+        if deadline is not None and self.millis() >= deadline:
+            return CommandResponse.TIMEOUT
+
+        if getattr(local, "denied", False):
+            # the status of a failed resynchronization (see __unaligned())
+            return getattr(local, "failure", None) or CommandResponse.TIMEOUT
+
+        return None
+
+    def __attempt(self, method, retry, args, kwargs):
+        """This method runs a method, resynchronizing the serial port and running it again if 
+        a response is invalid (see _exclusive()).
+
+        :param method [function]: the method
+        :param retry [bool]: True if the method can run again
+        :param args [tuple]: the positional arguments
+        :param kwargs [dict]: the keyword arguments
+
+        :return: the result of the method
+        """
+
+        local = self.__local
+        # a method called by another one is retried with it
+        if getattr(local, "depth", 0):
+            local.depth += 1
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                local.depth -= 1
+
+        attempts = self.__retries + 1 if retry else 1
+        local.depth = 1
+        try:
+            for attempt in range(attempts):
+                # the last attempt returns INVALID_RESPONSE instead of raising
+                local.strict = attempt < attempts - 1
+                local.invalid = False
+                try:
+                    result = method(self, *args, **kwargs)
+                except ProtocolError:
+                    status = self.resync()
+                    if status != CommandResponse.OK:
+                        # sending the command again would read the responses of other commands
+                        return self.__unaligned(method, args, kwargs, status)
+                    self.__retried += 1
+                    continue
+
+                if local.invalid:
+                    self.resync()
+
+                return result
+        finally:
+            local.depth = 0
+            local.strict = False
+
+    def __unaligned(self, method, args, kwargs, status):
+        """This method runs a method without using the module, after a resynchronization failed, 
+        so that it returns its usual result with the status of the resynchronization.
+
+        :param method [function]: the method
+        :param args [tuple]: the positional arguments
+        :param kwargs [dict]: the keyword arguments
+        :param status [CommandResponse]: the status returned by resync()
+
+        :return: the result of the method
+        """
+
+        local = self.__local
+        previous = (getattr(local, "denied", False), getattr(local, "failure", None))
+        local.strict = False
+        local.denied, local.failure = True, status
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            local.denied, local.failure = previous
+
+    def __listen(self, timeout_listen):
+        """This method reads an incoming P2P message (without the "p2p" event, which depends on 
+        the type of the message).
+
+        :param timeout_listen [int]: the time to wait, in [ms]
+
+        :return: message [str], RSSI [int] and SNR [int] if a message was received 
+        (a TimedResult) or False [bool] otherwise
+        """
+
+        statusMessage = False
+        timeout = self.millis() + timeout_listen  # [ms]
+        while self.millis() < timeout and not self.__interrupted():
+            # check if the message has ended (only when there is nothing else to read)
+            if not self.__fill():
+                if self.__receiveBuffer.find(b"\n\r") or self.__receiveBuffer.find(b"Test Stop"):
+                    statusMessage = True
+                    break
+
+        # check if the message is True
+        if statusMessage:
+
+            # decode the complete message at once
+            self.__local.timestamp = self.__receiveBuffer.timestamp()
+            res = self.__receiveBuffer.readall()
+            self.flush()
+
+            try:
+                # parse the message
+                res = res.replace("Test Stop", "")
+                # get the message
+                message = (res.split("Text-> ")[-1]).strip()
+                # get the RSSI and the SNR
+                res = res.split()
+                for word in res:
+                    if "RSSI=" in word:
+                        rssi = word.split("RSSI=")[-1]
+                    elif "SNR=" in word:
+                        snr = word.split("SNR=")[-1]
+
+                rssi = int(rssi)
+                snr = int(snr)
+                self.__emit("link", "p2p", rssi, snr)
+
+                return self.__timed((str(message), rssi, snr))
+
+            except:
+                return False
+
+        else:
+            return False
+
+    def __parse(self, response, cmd=None):
+        """This method parses a response (see parseResponse()), handling an invalid one.
+
+        :param response [str]: the response read from the module
+        :param cmd [str]: the command whose value must be converted, or None (default = None)
+
+        :return: the parsed response [Response]
+        """
+
+        result = self.parseResponse(response, cmd)
+        if result.status == CommandResponse.INVALID_RESPONSE:
+            self.__invalid(response)
+
+        return result
+
+    def __invalid(self, response):
+        """This method handles an invalid response: a ProtocolError is raised so that the 
+        command is sent again, or, on the last attempt, the serial port is resynchronized after 
+        the method returns.
 
-        return response # " ".join(response.split())
+        :param response [str]: the response read from the module
+        """
+
+        local = self.__local
+        if getattr(local, "strict", False):
+            raise ProtocolError(response)
+        local.invalid = True
+
+    def __timed(self, values, stamp=None):
+        """This method adds the time of the last response to a result.
+
+        :param values [tuple]: the values of the result
+        :param stamp [tuple]: the time, or None to use lastTimestamp() (default = None)
+
+        :return: the result [TimedResult]
+        """
+
+        return TimedResult(values, self.lastTimestamp() if stamp is None else stamp)
+
+    def __emit(self, event, *args):
+        """This method calls the functions registered for an event.
+
+        :param event [str]: the name of the event
+        :param args: the arguments of the event
+        """
+
+        for function in self.__callbacks.get(event, ()):
+            function(*args)
+
+    def __remember(self, name, value, status):
+        """This method keeps the value of a configuration to be stored by saveSession().
+
+        :param name [str]: the name of the configuration (e.g. "DevAddr")
+        :param value: the value sent to the module, [int] or [str]
+        :param status [CommandResponse]: the response of the command
+        """
+
+        if status == CommandResponse.OK:
+            self.__settings[name] = value
+
+    @classmethod
+    def __formatSetting(cls, name, value):
+        """This method checks a configuration value and converts it to the form sent to the module.
+
+        :param name [str]: the name of the configuration (see SETTINGS)
+        :param value: the value, [int] or [str]
+
+        :return: the converted value, [int] or [str] ("xx:xx:..." for hexadecimal values), 
+        or None if the name or the value is invalid
+        """
+
+        if name not in cls.__settingCommand:
+            return None
+        valid = cls.__settingCommand[name][1]
+
+        # hexadecimal values
+        if isinstance(valid, int):
+            digits = cls.__normalize(value)
+            if len(digits) != 2 * valid or not all(c in string.hexdigits for c in digits):
+                return None
+            return ":".join(digits[i:i+2] for i in range(0, len(digits), 2))
+
+        # integer values
+        if isinstance(valid, range):
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                return None
+            return value if value in valid else None
+
+        value = str(value).strip().upper()
+
+        return value if value in valid else None
+
+    @staticmethod
+    def __normalize(value):
+        """This method converts a configuration value to a comparable form.
+
+        :param value: the value, [int] or [str] (e.g. "00:00:00:00" or "00000000")
+
+        :return: the normalized value [str]
+        """
 
+        return str(value).replace(":", "").strip().upper()
 
 # DEBUG #
 # this condition will only be True if the file is executed directly
@@ -25,5 +25,23 @@
 
 #################################################################################################################
 
-from .RoboCore_SMW_SX1262M0 import SMW_SX1262M0, CommandResponse
-
+from .RoboCore_SMW_SX1262M0 import SMW_SX1262M0, CommandResponse, ProtocolError, Response, TimedResult
+from .arbiter import CancelToken, CommandArbiter, Priority
+
+from .transport import SocketTransport, StreamTransport, openTransport
+from .trace import TraceTransport, ReplayTransport, readTrace, analyzeTrace, latencyReport
+from .monitor import LinkMonitor
+from .airtime import timeOnAir, uplinkAirtime
+from .datarate import DataRateOptimizer
+from .confirm import Confirmation, ConfirmationState, ConfirmationTracker
+from .downlink import Downlink, DownlinkReceiver
+from .energy import EnergyModel, TxPowerController
+from .watchdog import HealthWatchdog
+from .provision import provisionAll, readManifest, writeReport
+from .compress import UplinkCompressor, UplinkDecoder
+from .daemon import ModuleServer, SMW_SX1262M0Client
+from .radio import P2PConfig, P2P_PRESETS, presetReport
+from .simulator import SimulatedAir, SimulatedModule
+from .sweep import P2PSweep
+from .archive import FrameArchive
+from .tdma import TDMACoordinator, TDMANode, TDMASchedule
@@ -0,0 +1,134 @@
+#################################################################################################################
+
+# RoboCore SMW-SX1262M0 Library (Python) (v1.0)
+
+# Library to use the SMW-SX1262M0 LoRaWAN module.
+
+# Copyright 2023 RoboCore.
+
+
+# This file is part of the SMW-SX1262M0 library ("SMW-SX1262M0-lib").
+
+# "SMW-SX1262M0-lib" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# "SMW-SX1262M0-lib" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with "SMW-SX1262M0-lib". If not, see <https://www.gnu.org/licenses/>
+
+#################################################################################################################
+
+
+# Necessary libraries
+from math import ceil, log10
+
+# spreading factor and bandwidth [kHz] of each Data Rate (AU915, used in Brazil)
+DATA_RATES = {
+
+    0: (12, 125),
+    1: (11, 125),
+    2: (10, 125),
+    3: (9, 125),
+    4: (8, 125),
+    5: (7, 125),
+    6: (8, 500),
+
+}
+
+# minimum SNR [dB] for demodulation at each spreading factor (SX1262 datasheet)
+REQUIRED_SNR = {
+
+    5: -2.5,
+    6: -5.0,
+    7: -7.5,
+    8: -10.0,
+    9: -12.5,
+    10: -15.0,
+    11: -17.5,
+    12: -20.0,
+
+}
+
+# bytes added by LoRaWAN to the application payload (MHDR + FHDR + FPort + MIC)
+LORAWAN_OVERHEAD = 13
+
+
+def timeOnAir(payloadSize, sf, bw=125, cr=1, preamble=8, explicitHeader=True, crc=True,
+              lowDataRateOptimize=None):
+    """This function calculates the time on air of a LoRa frame (Semtech AN1200.13, and the 
+    SX1261/2 datasheet for SF5 and SF6).
+
+    :param payloadSize [int]: the size of the PHY payload, in [bytes]
+    :param sf [int]: the spreading factor (5-12)
+    :param bw [int]: the bandwidth, in [kHz] (default = 125)
+    :param cr [int]: the coding rate (1-4 for 4/5-4/8) (default = 1)
+    :param preamble [int]: the number of preamble symbols (default = 8)
+    :param explicitHeader [bool]: True if the header is sent (default = True)
+    :param crc [bool]: True if the CRC is sent (default = True)
+    :param lowDataRateOptimize [bool]: True to use the optimization, or None to use it when the 
+    symbol lasts 16 ms or more (default = None)
+
+    :return: the time on air, in [ms] [float]
+    """
+
+    symbolTime = (2 ** sf) / bw  # [ms]
+    if lowDataRateOptimize is None:
+        lowDataRateOptimize = symbolTime >= 16
+
+    if sf < 7:
+        # SF5 and SF6 use 2 more preamble symbols and no extra 8 bits in the first block
+        numerator = 8 * payloadSize - 4 * sf + 16 * crc + 20 * explicitHeader
+        preamble += 2
+    else:
+        numerator = 8 * payloadSize - 4 * sf + 28 + 16 * crc - 20 * (not explicitHeader)
+    denominator = 4 * (sf - 2 * lowDataRateOptimize)
+    payloadSymbols = 8 + max(ceil(numerator / denominator) * (cr + 4), 0)
+
+    return (preamble + 4.25 + payloadSymbols) * symbolTime
+
+
+def bitrate(sf, bw=125, cr=1):
+    """This function calculates the raw bit rate of a LoRa configuration.
+
+    :param sf [int]: the spreading factor (5-12)
+    :param bw [int]: the bandwidth, in [kHz] (default = 125)
+    :param cr [int]: the coding rate (1-4 for 4/5-4/8) (default = 1)
+
+    :return: the bit rate, in [bit/s] [float]
+    """
+
+    return sf * (bw * 1000) / (2 ** sf) * 4 / (4 + cr)
+
+
+def requiredSNR(dr):
+    """This function gets the minimum SNR of a Data Rate, as measured in 125 kHz (a wider 
+    bandwidth has more noise, so the same signal has a lower SNR).
+
+    :param dr [int]: the Data Rate (see DATA_RATES)
+
+    :return: the SNR, in [dB] [float]
+    """
+
+    sf, bw = DATA_RATES[dr]
+
+    return REQUIRED_SNR[sf] + 10 * log10(bw / 125)
+
+
+def uplinkAirtime(payloadSize, dr):
+    """This function calculates the time on air of a LoRaWAN uplink.
+
+    :param payloadSize [int]: the size of the application payload, in [bytes]
+    :param dr [int]: the Data Rate (see DATA_RATES)
+
+    :return: the time on air, in [ms] [float]
+    """
+
+    sf, bw = DATA_RATES[dr]
+
+    return timeOnAir(payloadSize + LORAWAN_OVERHEAD, sf, bw)
@@ -0,0 +1,214 @@
+#################################################################################################################
+
+# RoboCore SMW-SX1262M0 Library (Python) (v1.0)
+
+# Library to use the SMW-SX1262M0 LoRaWAN module.
+
+# Copyright 2023 RoboCore.
+
+
+# This file is part of the SMW-SX1262M0 library ("SMW-SX1262M0-lib").
+
+# "SMW-SX1262M0-lib" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# "SMW-SX1262M0-lib" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with "SMW-SX1262M0-lib". If not, see <https://www.gnu.org/licenses/>
+
+#################################################################################################################
+
+
+# Necessary libraries
+import threading
+from enum import IntEnum
+from time import monotonic
+
+
+class Priority(IntEnum):
+    """This class is used as enumeration (enum) of the command priorities."""
+
+    HIGH = 0  # e.g. uplinks
+    NORMAL = 1  # default
+    LOW = 2  # e.g. health checks
+
+
+class CancelToken:
+    """This class is used to cancel blocking calls from another thread (e.g. on shutdown)."""
+
+    def __init__(self):
+        """This method is the constructor of the class."""
+
+        self.__event = threading.Event()
+
+    @property
+    def cancelled(self):
+        """This property checks if the token was cancelled.
+
+        :return: the state of the token [bool]
+        """
+
+        return self.__event.is_set()
+
+    def cancel(self):
+        """This method cancels the calls using the token (a token cannot be reused)."""
+
+        self.__event.set()
+
+
+class CommandArbiter:
+    """This class gives the module to one thread at a time, so that each command and its 
+    response are never mixed with another thread's.
+
+    Waiting threads are served by priority and, within the same priority, in arrival order.
+    A waiting thread gains one priority level for each "aging" seconds it waits, so no 
+    thread waits forever. The lock is reentrant.
+    """
+
+    def __init__(self, aging=0.5):
+        """This method is the constructor of the class.
+
+        :param aging [float]: the waiting time that raises a waiting thread by one priority
+        level, in [s] (default = 0.5)
+        """
+
+        self.__aging = aging
+        self.__lock = threading.Lock()  # protects the attributes below
+        self.__owner = None  # thread using the module
+        self.__depth = 0  # number of nested acquisitions of the owner
+        self.__waiting = []  # [priority, arrival, order, event] of each waiting thread
+        self.__order = 0
+        self.__released = monotonic()  # time the module became idle [s]
+
+        # metrics
+        self.__count = {priority: 0 for priority in Priority}
+        self.__waitTotal = {priority: 0.0 for priority in Priority}
+        self.__waitMax = {priority: 0.0 for priority in Priority}
+
+    def acquire(self, priority=Priority.NORMAL, timeout=None, cancel=None):
+        """This method waits for the module to be free and takes it.
+
+        :param priority [Priority]: the priority of the thread (default = Priority.NORMAL)
+        :param timeout [float]: the maximum time to wait, in [s], or None to wait until the 
+        module is free (default = None)
+        :param cancel [CancelToken]: a token that stops the wait when cancelled (default = None)
+
+        :return: True [bool] if the module was taken, False if the wait was cancelled or timed out
+        """
+
+        thread = threading.get_ident()
+        arrival = monotonic()
+        with self.__lock:
+            if self.__owner == thread:
+                self.__depth += 1
+                return True
+
+            if cancel is not None and cancel.cancelled:
+                return False
+
+            if self.__owner is None and not self.__waiting:
+                self.__take(thread, priority, arrival)
+                return True
+
+            event = threading.Event()
+            self.__order += 1
+            waiter = (priority, arrival, self.__order, event)
+            self.__waiting.append(waiter)
+
+        # the releasing thread gives the module to this thread before setting the event
+        end = None if timeout is None else arrival + timeout
+        while True:
+            wait = None if cancel is None else 0.01  # the token is checked every 10 ms
+            if end is not None:
+                remaining = max(end - monotonic(), 0)
+                wait = remaining if wait is None else min(wait, remaining)
+            if event.wait(wait):
+                break
+
+            if (cancel is not None and cancel.cancelled) or (end is not None and monotonic() >= end):
+                with self.__lock:
+                    # the module may have been given to this thread in the meantime
+                    if not event.is_set():
+                        self.__waiting.remove(waiter)
+                        return False
+                break
+
+        with self.__lock:
+            self.__take(thread, priority, arrival)
+
+        return True
+
+    def release(self):
+        """This method frees the module and gives it to the next waiting thread."""
+
+        with self.__lock:
+            if self.__owner != threading.get_ident():
+                raise RuntimeError("the module is not owned by this thread")
+
+            self.__depth -= 1
+            if self.__depth:
+                return
+
+            self.__owner = None
+            self.__released = monotonic()
+            if self.__waiting:
+                now = self.__released
+                chosen = min(self.__waiting,
+                             key=lambda waiter: (waiter[0] - (now - waiter[1]) / self.__aging, waiter[2]))
+                self.__waiting.remove(chosen)
+                self.__owner = chosen[3]  # reserved until the thread wakes up
+                chosen[3].set()
+
+    def __take(self, thread, priority, arrival):
+        """This method gives the module to a thread and updates the metrics 
+        (must be called with the internal lock).
+
+        :param thread [int]: the identifier of the thread
+        :param priority [Priority]: the priority of the thread
+        :param arrival [float]: the time the thread asked for the module, in [s]
+        """
+
+        self.__owner = thread
+        self.__depth = 1
+        wait = monotonic() - arrival
+        self.__count[priority] += 1
+        self.__waitTotal[priority] += wait
+        self.__waitMax[priority] = max(self.__waitMax[priority], wait)
+
+    def idleTime(self):
+        """This method gets the time since the module was last used.
+
+        :return: the time, in [s] [float], or 0 if the module is in use
+        """
+
+        with self.__lock:
+            if self.__owner is not None or self.__waiting:
+                return 0.0
+
+            return monotonic() - self.__released
+
+    def metrics(self):
+        """This method gets the waiting time of the threads.
+
+        :return: for each priority [dict], the number of transactions and the mean and maximum 
+        waiting time, in [ms], and the number of threads waiting now ("waiting")
+        """
+
+        with self.__lock:
+            metrics = {}
+            for priority in Priority:
+                count = self.__count[priority]
+                metrics[priority.name] = {
+                    "count": count,
+                    "waitMean": self.__waitTotal[priority] / count * 1000 if count else 0.0,
+                    "waitMax": self.__waitMax[priority] * 1000,
+                }
+            metrics["waiting"] = len(self.__waiting)
+
+            return metrics
@@ -0,0 +1,500 @@
+#################################################################################################################
+
+# RoboCore SMW-SX1262M0 Library (Python) (v1.0)
+
+# Library to use the SMW-SX1262M0 LoRaWAN module.
+
+# Copyright 2023 RoboCore.
+
+
+# This file is part of the SMW-SX1262M0 library ("SMW-SX1262M0-lib").
+
+# "SMW-SX1262M0-lib" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# "SMW-SX1262M0-lib" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with "SMW-SX1262M0-lib". If not, see <https://www.gnu.org/licenses/>
+
+#################################################################################################################
+
+
+# Necessary libraries
+import glob
+import json
+import mmap
+import os
+import struct
+import threading
+from array import array
+from bisect import bisect_left
+from time import monotonic_ns, time_ns
+
+# NumPy is optional, it is only used to return the columns as arrays and to filter them
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# segment file: [header] [record 0] [record 1] ...
+SEGMENT_MAGIC = b"SMWARCH\x02"
+# magic, record size, count, first and last (latest) time, and 1 if the records are in 
+# chronological order
+SEGMENT_HEADER = struct.Struct("<8sIIqqI4x")
+
+# kind of each record
+KIND_P2P = 0  # P2P frame (P2P_listen())
+KIND_TEXT = 1  # text downlink (readT())
+KIND_BINARY = 2  # binary downlink (readX())
+
+NO_VALUE = -32768  # RSSI or SNR not available
+
+# columns of each record: time [ns] (wall clock), source, kind, port, RSSI [dBm], SNR [dB], 
+# payload length and payload (truncated to the payload size of the archive)
+COLUMNS = ("time", "source", "kind", "port", "rssi", "snr", "length", "payload")
+
+
+def _wallTime(stamp):
+    """This function converts the timestamp of a result to the wall clock.
+
+    :param stamp [tuple]: the monotonic and the wall-clock time, in [ns] (see TimedResult), 
+    or None for now
+
+    :return: the time, in [ns] of time.time_ns() [int]
+    """
+
+    if stamp is None:
+        return time_ns()
+    if stamp[1] is not None:
+        return stamp[1]
+    if stamp[0] is None:
+        return time_ns()
+
+    return time_ns() - (monotonic_ns() - stamp[0])
+
+
+class _Segment:
+    """This class is a memory-mapped file with a fixed number of fixed-size records."""
+
+    def __init__(self, path, record, capacity=None):
+        """This method is the constructor of the class.
+
+        :param path [str]: the path of the file
+        :param record [struct.Struct]: the format of the records
+        :param capacity [int]: the number of records of a new file, or None to open an 
+        existing one (default = None)
+        """
+
+        self.path = path
+        self.record = record
+        if capacity is not None:
+            with open(path, "wb") as file:
+                file.write(SEGMENT_HEADER.pack(SEGMENT_MAGIC, record.size, 0, 0, 0, 1))
+                file.truncate(SEGMENT_HEADER.size + capacity * record.size)
+
+        self.__file = open(path, "r+b")
+        self.map = mmap.mmap(self.__file.fileno(), 0)
+        magic, size, self.count, self.firstTime, self.lastTime, self.sorted = \
+            SEGMENT_HEADER.unpack_from(self.map)
+        if magic != SEGMENT_MAGIC or size != record.size:
+            self.close()
+            raise ValueError(f"{path} is not a segment with records of {record.size} bytes")
+        self.capacity = (len(self.map) - SEGMENT_HEADER.size) // record.size
+        self.__sources = None  # positions of the records of each source
+
+    def close(self):
+        """This method closes the file."""
+
+        self.map.close()
+        self.__file.close()
+
+    def append(self, values):
+        """This method writes a record after the last one.
+
+        :param values [tuple]: the values, in the order of COLUMNS
+        """
+
+        self.record.pack_into(self.map, SEGMENT_HEADER.size + self.count * self.record.size, *values)
+        if self.count == 0:
+            self.firstTime = self.lastTime = values[0]
+        elif values[0] < self.lastTime:
+            self.sorted = 0  # the time index cannot be used anymore (see lowerBound())
+        self.lastTime = max(self.lastTime, values[0])
+        if self.__sources is not None:
+            self.__sources.setdefault(values[1], array("I")).append(self.count)
+        self.count += 1
+        # the count is written last, so an interrupted write only loses its own record
+        SEGMENT_HEADER.pack_into(self.map, 0, SEGMENT_MAGIC, self.record.size, self.count,
+                                 self.firstTime, self.lastTime, self.sorted)
+
+    def time(self, position):
+        """This method reads the time of a record.
+
+        :param position [int]: the position of the record
+
+        :return: the time, in [ns] [int]
+        """
+
+        return struct.unpack_from("<q", self.map, SEGMENT_HEADER.size + position * self.record.size)[0]
+
+    def lowerBound(self, time):
+        """This method finds the first record at or after a time (time index, only valid if the 
+        records are in chronological order, see "sorted").
+
+        :param time [int]: the time, in [ns]
+
+        :return: the position [int]
+        """
+
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.time(middle) < time:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+    def sourcePositions(self, source):
+        """This method gets the positions of the records of a source (per-source index, built 
+        when first used).
+
+        :param source [int]: the identifier of the source
+
+        :return: the positions, in increasing order [array]
+        """
+
+        if self.__sources is None:
+            sources = {}
+            offset = struct.calcsize("<q")
+            for position in range(self.count):
+                start = SEGMENT_HEADER.size + position * self.record.size + offset
+                value = struct.unpack_from("<H", self.map, start)[0]
+                sources.setdefault(value, array("I")).append(position)
+            self.__sources = sources
+
+        return self.__sources.get(source, array("I"))
+
+
+class FrameArchive:
+    """This class stores the received P2P frames and downlinks in an append-only archive of 
+    fixed-size binary records, split in memory-mapped segment files.
+
+    The records are found by time (binary search, since they are usually stored in 
+    chronological order, or a scan of the segments with a record out of order, e.g. after the 
+    clock was set back) and by source (an index of the positions of each source), and query() 
+    returns columns (NumPy arrays, if available) without parsing text.
+
+    Example: archive = FrameArchive("frames")
+             archive.attach(lorawan, "gateway-1")
+             columns = archive.query(source="gateway-1", start=time.time() - 3600, maxSNR=-10)
+    """
+
+    def __init__(self, directory, payloadSize=48, segmentRecords=65536):
+        """This method is the constructor of the class.
+
+        :param directory [str]: the directory of the archive (created if necessary)
+        :param payloadSize [int]: the bytes of payload stored in each record (longer payloads are 
+        truncated, the "length" column keeps the original size) (default = 48)
+        :param segmentRecords [int]: the number of records of each segment file (default = 65536)
+        """
+
+        os.makedirs(directory, exist_ok=True)
+        self.__directory = directory
+        self.__payloadSize = payloadSize
+        self.__segmentRecords = segmentRecords
+        self.__record = struct.Struct(f"<qHBBhhH{payloadSize}s")
+        self.__lock = threading.RLock()
+        self.__callbacks = []  # (lorawan, event, function) registered by attach()
+
+        # names of the sources and their identifiers
+        self.__sourcesPath = os.path.join(directory, "sources.json")
+        try:
+            with open(self.__sourcesPath) as file:
+                self.__sources = json.load(file)
+        except FileNotFoundError:
+            self.__sources = {}
+
+        self.__segments = [_Segment(path, self.__record)
+                           for path in sorted(glob.glob(os.path.join(directory, "segment-*.dat")))]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def close(self):
+        """This method detaches the archive from the modules and closes the segment files."""
+
+        with self.__lock:
+            for lorawan, event, function in self.__callbacks:
+                lorawan.removeCallback(event, function)
+            self.__callbacks = []
+            for segment in self.__segments:
+                segment.close()
+            self.__segments = []
+
+    def attach(self, lorawan, source):
+        """This method stores every P2P frame and downlink received by a module 
+        (see the "p2p" and "downlink" events of SMW_SX1262M0). The frames received with 
+        P2P_receive() are stored as the decoded bytes.
+
+        :param lorawan [SMW_SX1262M0]: the module
+        :param source [str]: the name of the source (e.g. the name of the link)
+        """
+
+        def frame(message, rssi, snr):
+            self.record(source, message, rssi, snr, kind=KIND_P2P, stamp=lorawan.lastTimestamp())
+
+        def downlink(port, message, binary):
+            payload = bytes.fromhex(message) if binary else message
+            self.record(source, payload, port=port, kind=KIND_BINARY if binary else KIND_TEXT,
+                        stamp=lorawan.lastTimestamp())
+
+        with self.__lock:
+            for event, function in (("p2p", frame), ("downlink", downlink)):
+                lorawan.addCallback(event, function)
+                self.__callbacks.append((lorawan, event, function))
+
+    def recordFrame(self, source, frame):
+        """This method stores a frame returned by P2P_listen() or P2P_receive().
+
+        :param source [str]: the name of the source
+        :param frame [TimedResult]: the message [str] or [bytes], the RSSI and the SNR
+        """
+
+        if frame:
+            message, rssi, snr = frame
+            self.record(source, message, rssi, snr, kind=KIND_P2P, stamp=_stamp(frame))
+
+    def recordDownlink(self, source, result, binary=False):
+        """This method stores a downlink returned by readT() or readX().
+
+        :param source [str]: the name of the source
+        :param result [TimedResult]: the response of the command, the port and the message
+        :param binary [bool]: True if the result is from readX() (default = False)
+        """
+
+        _, port, message = result
+        if message:
+            payload = bytes.fromhex(message) if binary else message
+            self.record(source, payload, port=port, kind=KIND_BINARY if binary else KIND_TEXT,
+                        stamp=_stamp(result))
+
+    def record(self, source, payload, rssi=None, snr=None, port=0, kind=KIND_P2P, stamp=None):
+        """This method stores a record.
+
+        :param source [str]: the name of the source
+        :param payload [bytes] or [str]: the payload
+        :param rssi [int]: the RSSI, in [dBm], or None (default = None)
+        :param snr [int]: the SNR, in [dB], or None (default = None)
+        :param port [int]: the port of a downlink (default = 0)
+        :param kind [int]: KIND_P2P, KIND_TEXT or KIND_BINARY (default = KIND_P2P)
+        :param stamp [tuple]: the monotonic and the wall-clock time, in [ns] (see TimedResult), 
+        or None for now (default = None)
+        """
+
+        if isinstance(payload, str):
+            payload = payload.encode()
+        values = (_wallTime(stamp), self.sourceId(source), kind, port or 0,
+                  NO_VALUE if rssi is None else rssi, NO_VALUE if snr is None else snr,
+                  min(len(payload), 0xFFFF), payload[:self.__payloadSize])
+
+        with self.__lock:
+            segment = self.__segments[-1] if self.__segments else None
+            if segment is None or segment.count >= segment.capacity:
+                path = os.path.join(self.__directory, f"segment-{len(self.__segments):06d}.dat")
+                segment = _Segment(path, self.__record, self.__segmentRecords)
+                self.__segments.append(segment)
+            segment.append(values)
+
+    def sourceId(self, source):
+        """This method gets the identifier of a source, registering it if necessary.
+
+        :param source [str]: the name of the source
+
+        :return: the identifier [int]
+        """
+
+        with self.__lock:
+            if source not in self.__sources:
+                self.__sources[source] = len(self.__sources)
+                temporary = self.__sourcesPath + ".tmp"
+                with open(temporary, "w") as file:
+                    json.dump(self.__sources, file)
+                os.replace(temporary, self.__sourcesPath)
+
+            return self.__sources[source]
+
+    def sources(self):
+        """This method gets the sources of the archive.
+
+        :return: the identifier of each name [dict]
+        """
+
+        return dict(self.__sources)
+
+    def __len__(self):
+        return sum(segment.count for segment in self.__segments)
+
+    def query(self, source=None, start=None, end=None, kind=None, minSNR=None, maxSNR=None,
+              minRSSI=None, maxRSSI=None):
+        """This method finds the records that match all the conditions given.
+
+        :param source [str]: the name of the source, or None for all (default = None)
+        :param start [float]: the earliest time, in [s] of time.time(), or None (default = None)
+        :param end [float]: the time limit (exclusive), in [s] of time.time(), or None 
+        (default = None)
+        :param kind [int]: KIND_P2P, KIND_TEXT or KIND_BINARY, or None for all (default = None)
+        :param minSNR [int]: the minimum SNR, in [dB], or None (default = None)
+        :param maxSNR [int]: the maximum SNR, in [dB], or None (default = None)
+        :param minRSSI [int]: the minimum RSSI, in [dBm], or None (default = None)
+        :param maxRSSI [int]: the maximum RSSI, in [dBm], or None (default = None)
+
+        :return: the values of each column (see COLUMNS) [dict], as NumPy arrays or, without 
+        NumPy, lists; the time is in [ns] of time.time_ns(). With NumPy, each payload is the 
+        fixed-size field of the record [numpy.void], padded with zeros: bytes(payload)[:length] 
+        gives the bytes stored, as the lists do
+
+        Note: the RSSI and the SNR conditions exclude the records without those values.
+        """
+
+        sourceId = None
+        if source is not None:
+            sourceId = self.__sources.get(source)
+            if sourceId is None:
+                return self.__columns([])
+        start = None if start is None else round(start * 1e9)
+        end = None if end is None else round(end * 1e9)
+
+        # the conditions on the values are checked after the indexes
+        conditions = []
+        if kind is not None:
+            conditions.append(("kind", kind, kind))
+        if minSNR is not None or maxSNR is not None:
+            conditions.append(("snr", NO_VALUE + 1 if minSNR is None else minSNR, maxSNR))
+        if minRSSI is not None or maxRSSI is not None:
+            conditions.append(("rssi", NO_VALUE + 1 if minRSSI is None else minRSSI, maxRSSI))
+
+        parts = []
+        with self.__lock:
+            for segment in self.__segments:
+                if segment.count == 0:
+                    continue
+                if (start is not None and segment.lastTime < start) or \
+                        (end is not None and segment.sorted and segment.firstTime >= end):
+                    continue
+
+                # time index
+                checks = conditions
+                if segment.sorted:
+                    low = 0 if start is None else segment.lowerBound(start)
+                    high = segment.count if end is None else segment.lowerBound(end)
+                    if low >= high:
+                        continue
+                else:
+                    # records out of order: the time is checked with the values
+                    low, high = 0, segment.count
+                    if start is not None or end is not None:
+                        checks = conditions + [("time", -2 ** 63 if start is None else start, 
+                                                None if end is None else end - 1)]
+
+                # source index
+                if sourceId is None:
+                    positions = range(low, high)
+                else:
+                    indexed = segment.sourcePositions(sourceId)
+                    positions = indexed[bisect_left(indexed, low):bisect_left(indexed, high)]
+
+                if len(positions):
+                    parts.append(self.__read(segment, positions, checks))
+
+        return self.__columns(parts)
+
+    def __read(self, segment, positions, conditions):
+        """This method reads records of a segment and checks the conditions.
+
+        :param segment [_Segment]: the segment
+        :param positions [range] or [array]: the positions of the records
+        :param conditions [list]: the column, the minimum and the maximum (or None) of each 
+        condition
+
+        :return: the records [numpy.ndarray] or [list]
+        """
+
+        if numpy is not None:
+            records = numpy.frombuffer(segment.map, self.__dtype(), segment.count, SEGMENT_HEADER.size)
+            if isinstance(positions, range):
+                selected = records[positions.start:positions.stop].copy()
+            else:
+                selected = records[numpy.frombuffer(positions, numpy.uint32)]
+            del records  # release the memory map
+            for column, low, high in conditions:
+                mask = selected[column] >= low
+                if high is not None:
+                    mask &= selected[column] <= high
+                selected = selected[mask]
+            return selected
+
+        selected = []
+        for position in positions:
+            values = segment.record.unpack_from(segment.map,
+                                                SEGMENT_HEADER.size + position * segment.record.size)
+            for column, low, high in conditions:
+                value = values[COLUMNS.index(column)]
+                if value < low or (high is not None and value > high):
+                    break
+            else:
+                selected.append(values)
+
+        return selected
+
+    def __columns(self, parts):
+        """This method joins the records of the segments in columns.
+
+        :param parts [list]: the records of each segment
+
+        :return: the values of each column [dict]
+        """
+
+        if numpy is not None:
+            records = numpy.concatenate(parts) if parts else numpy.empty(0, self.__dtype())
+            return {column: records[column] for column in COLUMNS}
+
+        records = [values for part in parts for values in part]
+        columns = {column: [values[i] for values in records] for i, column in enumerate(COLUMNS)}
+        columns["payload"] = [payload[:length]
+                              for payload, length in zip(columns["payload"], columns["length"])]
+
+        return columns
+
+    def __dtype(self):
+        """This method gets the NumPy type of the records (the same layout as the files).
+
+        :return: the type [numpy.dtype]
+        """
+
+        return numpy.dtype([("time", "<i8"), ("source", "<u2"), ("kind", "u1"), ("port", "u1"),
+                            ("rssi", "<i2"), ("snr", "<i2"), ("length", "<u2"),
+                            ("payload", f"V{self.__payloadSize}")])
+
+
+def _stamp(result):
+    """This function gets the timestamp of a result, if it has one.
+
+    :param result [tuple]: the result (e.g. a TimedResult)
+
+    :return: the monotonic and the wall-clock time, in [ns] [tuple], or None
+    """
+
+    timestamp = getattr(result, "timestamp", None)
+
+    return None if timestamp is None else (timestamp, getattr(result, "wallTime", None))
@@ -0,0 +1,289 @@
+#################################################################################################################
+
+# RoboCore SMW-SX1262M0 Library (Python) (v1.0)
+
+# Library to use the SMW-SX1262M0 LoRaWAN module.
+
+# Copyright 2023 RoboCore.
+
+
+# This file is part of the SMW-SX1262M0 library ("SMW-SX1262M0-lib").
+
+# "SMW-SX1262M0-lib" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# "SMW-SX1262M0-lib" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with "SMW-SX1262M0-lib". If not, see <https://www.gnu.org/licenses/>
+
+#################################################################################################################
+
+
+# Necessary libraries
+import threading
+
+# frame format:
+#   keyframe: [0x80 | sequence] [value 1] ... [value N]
+#   delta:    [sequence] [reference sequence] [value 1 - reference 1] ... [value N - reference N]
+# the values are signed integers in zigzag + varint encoding (1 byte for -64 to 63)
+KEYFRAME = 0x80
+SEQUENCE_MASK = 0x7F
+SEQUENCES = 128
+
+# the delta frames only refer to frames less than MAX_REFERENCE_AGE frames old, so that the 
+# sequence numbers are never ambiguous
+MAX_REFERENCE_AGE = 64
+
+
+def _zigzag(value):
+    """This function maps a signed integer to an unsigned one (0, -1, 1, -2... to 0, 1, 2, 3...).
+
+    :param value [int]: the value
+
+    :return: the mapped value [int]
+    """
+
+    return (value << 1) if value >= 0 else ((-value << 1) - 1)
+
+
+def _unzigzag(value):
+    """This function reverts _zigzag().
+
+    :param value [int]: the mapped value
+
+    :return: the value [int]
+    """
+
+    return (value >> 1) if not value & 1 else -((value + 1) >> 1)
+
+
+def _writeVarint(value, output):
+    """This function appends an unsigned integer with 7 bits per byte (the high bit is set in all 
+    but the last byte).
+
+    :param value [int]: the value
+    :param output [bytearray]: the buffer
+    """
+
+    while value > 0x7F:
+        output.append((value & 0x7F) | 0x80)
+        value >>= 7
+    output.append(value)
+
+
+def _readVarint(data, index):
+    """This function reads an unsigned integer written by _writeVarint().
+
+    :param data [bytes]: the buffer
+    :param index [int]: the position of the first byte
+
+    :return: the value [int] and the position after it [int]
+    """
+
+    value = 0
+    shift = 0
+    while True:
+        byte = data[index]
+        index += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, index
+        shift += 7
+
+
+class UplinkCompressor:
+    """This class encodes periodic readings as the difference to the last acknowledged frame.
+
+    A keyframe (with the absolute values) is sent when there is no acknowledged reference, every 
+    keyframeInterval frames and whenever it is not larger than the delta frame, so that the 
+    decoder resynchronizes after lost frames. Call acknowledge() when a frame is known to have 
+    reached the network (e.g. from the callback of ConfirmationTracker).
+    """
+
+    def __init__(self, fields, scales=None, keyframeInterval=10, rawSize=None):
+        """This method is the constructor of the class.
+
+        :param fields [int]: the number of values of each reading
+        :param scales [list]: the factor of each value, so that round(value * scale) keeps the 
+        resolution needed (e.g. 100 for 0.01 °C), or None to send integers (default = None)
+        :param keyframeInterval [int]: the maximum number of frames between keyframes 
+        (default = 10)
+        :param rawSize [int]: the size of a reading without compression, in [bytes], used by 
+        metrics(), or None for 4 bytes per value (default = None)
+        """
+
+        self.__fields = fields
+        self.__scales = list(scales) if scales else [1] * fields
+        self.__keyframeInterval = keyframeInterval
+        self.__rawSize = 4 * fields if rawSize is None else rawSize
+
+        self.__lock = threading.Lock()
+        self.__count = 0  # number of frames encoded
+        self.__sent = {}  # values and number of each recent frame, by sequence
+        self.__reference = None  # number and values of the last acknowledged frame
+        self.__lastKeyframe = None  # number of the last keyframe
+
+        self.__frames = 0
+        self.__keyframes = 0
+        self.__bytes = 0
+
+    def encode(self, values):
+        """This method encodes a reading.
+
+        :param values [list]: the values (int or float), in the order of the fields
+
+        :return: the sequence number [int] and the frame [bytes]
+        """
+
+        if len(values) != self.__fields:
+            raise ValueError(f"expected {self.__fields} values, got {len(values)}")
+        values = [round(value * scale) for value, scale in zip(values, self.__scales)]
+
+        with self.__lock:
+            number = self.__count
+            sequence = number % SEQUENCES
+
+            keyframe = bytearray([KEYFRAME | sequence])
+            for value in values:
+                _writeVarint(_zigzag(value), keyframe)
+            frame = keyframe
+
+            # use a delta frame if there is a recent reference and it is smaller
+            reference = self.__reference
+            if (reference is not None and number - reference[0] < MAX_REFERENCE_AGE
+                    and number - self.__lastKeyframe < self.__keyframeInterval):
+                delta = bytearray([sequence, reference[0] % SEQUENCES])
+                for value, previous in zip(values, reference[1]):
+                    _writeVarint(_zigzag(value - previous), delta)
+                if len(delta) < len(keyframe):
+                    frame = delta
+
+            if frame is keyframe:
+                self.__lastKeyframe = number
+                self.__keyframes += 1
+            self.__sent[sequence] = (number, values)
+            self.__count += 1
+            self.__frames += 1
+            self.__bytes += len(frame)
+
+        return sequence, bytes(frame)
+
+    def acknowledge(self, sequence=None):
+        """This method marks a frame as received by the network, so that the next frames are 
+        encoded against it.
+
+        :param sequence [int]: the sequence number returned by encode(), or None for the last 
+        frame (default = None)
+        """
+
+        with self.__lock:
+            if sequence is None:
+                sequence = (self.__count - 1) % SEQUENCES
+            sent = self.__sent.get(sequence)
+            if sent is None:
+                return
+            # ignore a late acknowledgement of an older frame
+            if self.__reference is None or sent[0] > self.__reference[0]:
+                self.__reference = sent
+
+    def reset(self):
+        """This method forgets the reference, so that the next frame is a keyframe (e.g. after 
+        joining the network again)."""
+
+        with self.__lock:
+            self.__reference = None
+
+    def send(self, lorawan, port, values):
+        """This method encodes a reading and sends it with sendX().
+
+        :param lorawan [SMW_SX1262M0]: the module
+        :param port [int]: the port to send the message
+        :param values [list]: the values, in the order of the fields
+
+        :return: the response of the command [CommandResponse] and the sequence number [int]
+
+        Note: call acknowledge() with the sequence number once the frame is confirmed.
+        """
+
+        sequence, frame = self.encode(values)
+
+        return (lorawan.sendX(port, frame.hex().upper()), sequence)
+
+    def metrics(self):
+        """This method gets the results of the compression.
+
+        :return: the number of frames and keyframes, the bytes sent and the bytes the readings 
+        would use without compression, and the compression ratio [dict]
+        """
+
+        with self.__lock:
+            raw = self.__frames * self.__rawSize
+            return {
+                "frames": self.__frames,
+                "keyframes": self.__keyframes,
+                "bytes": self.__bytes,
+                "rawBytes": raw,
+                "ratio": raw / self.__bytes if self.__bytes else None,
+            }
+
+
+class UplinkDecoder:
+    """This class decodes the frames of UplinkCompressor (e.g. in the backend)."""
+
+    def __init__(self, fields, scales=None):
+        """This method is the constructor of the class.
+
+        :param fields [int]: the number of values of each reading
+        :param scales [list]: the same factors given to UplinkCompressor, or None (default = None)
+        """
+
+        self.__fields = fields
+        self.__scales = list(scales) if scales else [1] * fields
+        self.__received = {}  # values of each recent frame, by sequence
+
+    def decode(self, frame):
+        """This method decodes a frame.
+
+        :param frame [bytes]: the frame, or [str] in hexadecimal
+
+        :return: the sequence number [int] and the values [list], or None if the frame refers to 
+        a frame that was not received (the values are recovered by the next keyframe)
+        """
+
+        if isinstance(frame, str):
+            frame = bytes.fromhex(frame)
+        if not frame:
+            return None
+
+        sequence = frame[0] & SEQUENCE_MASK
+        keyframe = bool(frame[0] & KEYFRAME)
+        index = 1
+        reference = None
+        if not keyframe:
+            reference = self.__received.get(frame[1] & SEQUENCE_MASK)
+            if reference is None:
+                return None
+            index = 2
+
+        values = []
+        try:
+            for i in range(self.__fields):
+                value, index = _readVarint(frame, index)
+                value = _unzigzag(value)
+                values.append(value if keyframe else reference[i] + value)
+        except IndexError:
+            return None  # truncated frame
+
+        # forget the frames that can no longer be referenced
+        self.__received = {key: stored for key, stored in self.__received.items()
+                           if (sequence - key) % SEQUENCES < MAX_REFERENCE_AGE}
+        self.__received[sequence] = values
+
+        return sequence, [value / scale if scale != 1 else value
+                          for value, scale in zip(values, self.__scales)]
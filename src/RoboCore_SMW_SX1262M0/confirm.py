@@ -0,0 +1,372 @@
+#################################################################################################################
+
+# RoboCore SMW-SX1262M0 Library (Python) (v1.0)
+
+# Library to use the SMW-SX1262M0 LoRaWAN module.
+
+# Copyright 2023 RoboCore.
+
+
+# This file is part of the SMW-SX1262M0 library ("SMW-SX1262M0-lib").
+
+# "SMW-SX1262M0-lib" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# "SMW-SX1262M0-lib" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with "SMW-SX1262M0-lib". If not, see <https://www.gnu.org/licenses/>
+
+#################################################################################################################
+
+
+# Necessary libraries
+import threading
+from collections import deque
+from enum import IntEnum
+
+from .RoboCore_SMW_SX1262M0 import CommandResponse
+from .arbiter import Priority
+
+MAX_CHECK_INTERVAL = 2000  # longest time between two reads of the Confirm Status, in [ms]
+
+
+class ConfirmationState(IntEnum):
+    """This class is used as enumeration (enum) of the states of a confirmed uplink."""
+
+    QUEUED = 0  # waiting for the previous uplinks to be confirmed
+    SENT = 1  # sent, waiting for the acknowledgement
+    ACKNOWLEDGED = 2  # acknowledged by the network
+    FAILED = 3  # not acknowledged after all the attempts (or rejected by the module)
+
+
+class Confirmation:
+    """This class is the handle of a confirmed uplink, returned right after it is queued."""
+
+    def __init__(self, port, message, binary, callback=None):
+        """This method is the constructor of the class.
+
+        :param port [int]: the port of the uplink
+        :param message [str]: the message
+        :param binary [bool]: True for a hexadecimal message (sendX), False for text (sendT)
+        :param callback [function]: function(confirmation) called when the uplink is 
+        acknowledged or fails (default = None)
+        """
+
+        self.port = port
+        self.message = message
+        self.binary = binary
+        self.state = ConfirmationState.QUEUED
+        self.status = None  # response of the last send command [CommandResponse]
+        self.attempts = 0  # number of times the uplink was sent
+        self.latency = None  # time from the first send to the acknowledgement, in [ms]
+        self.sentAt = None  # time of the first send, in [ms] of millis()
+        self.lastSent = None  # time of the last send, in [ms] of millis()
+        self.__callback = callback
+        self.__done = threading.Event()
+
+    @property
+    def acknowledged(self):
+        """This property checks if the uplink was acknowledged.
+
+        :return: the result [bool]
+        """
+
+        return self.state == ConfirmationState.ACKNOWLEDGED
+
+    def done(self):
+        """This method checks if the uplink was acknowledged or failed.
+
+        :return: the result [bool]
+        """
+
+        return self.__done.is_set()
+
+    def wait(self, timeout=None):
+        """This method waits for the uplink to be acknowledged or to fail.
+
+        :param timeout [float]: the maximum time to wait, in [s], or None to wait 
+        forever (default = None)
+
+        :return: True [bool] if the uplink was acknowledged
+        """
+
+        self.__done.wait(timeout)
+
+        return self.acknowledged
+
+    def _resolve(self, state):
+        """This method ends the tracking of the uplink (used by ConfirmationTracker).
+
+        :param state [ConfirmationState]: ACKNOWLEDGED or FAILED
+        """
+
+        self.state = state
+        self.__done.set()
+
+    def _notify(self):
+        """This method calls the callback of the uplink (used by ConfirmationTracker, without 
+        its lock, so the callback can use the tracker from any thread).
+        """
+
+        if self.__callback is not None:
+            self.__callback(self)
+
+    def __repr__(self):
+        return f"Confirmation(port={self.port}, state={self.state.name}, attempts={self.attempts})"
+
+
+class ConfirmationTracker:
+    """This class sends confirmed uplinks and tracks their acknowledgement (CFM and CFS commands)
+    without blocking the application.
+
+    The module handles one confirmed uplink at a time, so the uplinks are queued and sent in 
+    order by poll(). Call poll() periodically or start() to poll from a background thread.
+
+    The Confirm Mode is enabled only while uplinks are pending, the previous mode is restored 
+    afterwards.
+    """
+
+    def __init__(self, lorawan, timeout=8000, retries=2, checkDelay=2500, checkInterval=500):
+        """This method is the constructor of the class.
+
+        :param lorawan [SMW_SX1262M0]: the module
+        :param timeout [int]: the time to wait for the acknowledgement of each attempt, 
+        in [ms] (default = 8000)
+        :param retries [int]: the number of times an uplink is sent again (default = 2)
+        :param checkDelay [int]: the time after sending before the Confirm Status is read, 
+        in [ms] (it must cover the receive windows) (default = 2500)
+        :param checkInterval [int]: the time between the first reads of the Confirm Status, 
+        in [ms] (it doubles after each read, up to MAX_CHECK_INTERVAL) (default = 500)
+        """
+
+        self.__lorawan = lorawan
+        self.__timeout = timeout
+        self.__retries = retries
+        self.__checkDelay = checkDelay
+        self.__checkInterval = checkInterval
+        self.__lock = threading.Lock()
+        self.__queue = deque()  # appended without the lock (deque.append() is thread safe)
+        self.__resolved = []  # uplinks whose callbacks were not called yet
+        self.__current = None  # uplink waiting for the acknowledgement
+        self.__confirmMode = False  # True after the Confirm Mode was enabled
+        self.__previousMode = None  # Confirm Mode before it was enabled
+        self.__nextCheck = None  # time of the next read of the Confirm Status, in [ms]
+        self.__interval = checkInterval  # time until the next read, in [ms]
+        self.__cleared = False  # True if the Confirm Status was 0 after the last send
+        self.__thread = None
+        self.__stopped = threading.Event()
+
+        # metrics
+        self.__acknowledged = 0
+        self.__failed = 0
+        self.__retried = 0
+        self.__latencyTotal = 0.0
+
+    def sendT(self, port, message, callback=None):
+        """This method queues a confirmed text uplink (it is sent by poll()).
+
+        :param port [int]: the port to send the message
+        :param message [str]: the message to send
+        :param callback [function]: function(confirmation) called at the end (default = None)
+
+        :return: the handle of the uplink [Confirmation]
+        """
+
+        return self.__enqueue(Confirmation(port, message, False, callback))
+
+    def sendX(self, port, message, callback=None):
+        """This method queues a confirmed hexadecimal uplink (it is sent by poll()).
+
+        :param port [int]: the port to send the message
+        :param message [str]: the message to send
+        :param callback [function]: function(confirmation) called at the end (default = None)
+
+        :return: the handle of the uplink [Confirmation]
+        """
+
+        return self.__enqueue(Confirmation(port, message, True, callback))
+
+    def pending(self):
+        """This method gets the number of uplinks not acknowledged or failed yet.
+
+        :return: the number of uplinks [int]
+        """
+
+        with self.__lock:
+            return len(self.__queue) + (self.__current is not None)
+
+    def poll(self):
+        """This method advances the tracking: it reads the Confirm Status when it is due, sends
+        the uplink again after a timeout and sends the next queued uplink. The callbacks of the 
+        uplinks that ended are called at the end, without the lock of the tracker.
+
+        :return: the number of uplinks not acknowledged or failed yet [int]
+        """
+
+        with self.__lock:
+            current = self.__current
+            if current is not None:
+                now = self.__lorawan.millis()
+                if now >= self.__nextCheck:
+                    status, confirmed = self.__readStatus()
+
+                    # a status of 1 that was not cleared by this uplink is from the previous one
+                    if status == CommandResponse.OK and confirmed == 1 and self.__cleared:
+                        current.latency = now - current.sentAt
+                        self.__finish(ConfirmationState.ACKNOWLEDGED)
+                    elif now - current.lastSent >= self.__timeout:
+                        if current.attempts <= self.__retries:
+                            self.__retried += 1
+                            self.__send(current)
+                        else:
+                            self.__finish(ConfirmationState.FAILED)
+                    else:
+                        # back off, the acknowledgement is rarely late
+                        self.__nextCheck = min(now + self.__interval, current.lastSent + self.__timeout)
+                        self.__interval = min(self.__interval * 2, MAX_CHECK_INTERVAL)
+
+            if self.__current is None and self.__queue:
+                self.__current = self.__queue.popleft()
+                self.__send(self.__current)
+
+            # restore the Confirm Mode of the application when nothing is pending
+            if self.__current is None and self.__confirmMode:
+                previous = self.__previousMode
+                if previous == 1 or self.__lorawan.set_Confirm(previous) == CommandResponse.OK:
+                    self.__confirmMode = False
+
+            pending = len(self.__queue) + (self.__current is not None)
+            resolved, self.__resolved = self.__resolved, []
+
+        for confirmation in resolved:
+            confirmation._notify()
+
+        return pending
+
+    def start(self, interval=100):
+        """This method polls the uplinks from a background thread.
+
+        :param interval [int]: the time between polls, in [ms] (default = 100)
+        """
+
+        if self.__thread is not None:
+            return
+
+        self.__stopped.clear()
+
+        def run():
+            while not self.__stopped.wait(interval / 1000):
+                self.poll()
+
+        self.__thread = threading.Thread(target=run, name="ConfirmationTracker", daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """This method stops the background thread started by start()."""
+
+        if self.__thread is not None:
+            self.__stopped.set()
+            self.__thread.join()
+            self.__thread = None
+
+    def metrics(self):
+        """This method gets the results of the confirmed uplinks.
+
+        :return: the number of acknowledged, failed and retried uplinks, the mean latency of 
+        the acknowledgement, in [ms], and the number of pending uplinks [dict]
+        """
+
+        with self.__lock:
+            return {
+                "acknowledged": self.__acknowledged,
+                "failed": self.__failed,
+                "retries": self.__retried,
+                "latencyMean": self.__latencyTotal / self.__acknowledged if self.__acknowledged else None,
+                "pending": len(self.__queue) + (self.__current is not None),
+            }
+
+    def __enqueue(self, confirmation):
+        """This method queues an uplink. It does not wait for the lock, so a poll() using the 
+        module does not delay the caller.
+
+        :param confirmation [Confirmation]: the uplink
+
+        :return: the uplink [Confirmation]
+        """
+
+        self.__queue.append(confirmation)
+
+        return confirmation
+
+    def __send(self, confirmation):
+        """This method sends an uplink (must be called with the lock).
+
+        :param confirmation [Confirmation]: the uplink
+        """
+
+        if not self.__confirmMode:
+            status, previous = self.__lorawan.get_Confirm()
+            if status == CommandResponse.OK and previous != 1:
+                status = self.__lorawan.set_Confirm(1)
+            if status != CommandResponse.OK:
+                confirmation.status = status
+                self.__finish(ConfirmationState.FAILED)
+                return
+            self.__previousMode = previous
+            self.__confirmMode = True
+
+        send = self.__lorawan.sendX if confirmation.binary else self.__lorawan.sendT
+        confirmation.status = send(confirmation.port, confirmation.message)
+        confirmation.attempts += 1
+        confirmation.lastSent = self.__lorawan.millis()
+        if confirmation.sentAt is None:
+            confirmation.sentAt = confirmation.lastSent
+        confirmation.state = ConfirmationState.SENT
+        self.__nextCheck = confirmation.lastSent + self.__checkDelay
+        self.__interval = self.__checkInterval
+
+        # an uplink rejected by the module is not retried
+        if confirmation.status != CommandResponse.OK:
+            self.__finish(ConfirmationState.FAILED)
+            return
+
+        # read the status before the receive windows, so a value left by the previous uplink 
+        # is not taken as the acknowledgement of this one
+        self.__cleared = False
+        self.__readStatus()
+
+    def __readStatus(self):
+        """This method reads the Confirm Status (must be called with the lock).
+
+        :return: the response of the command [CommandResponse] and the value [int]
+        """
+
+        # the status is a cheap read, it must not delay other commands
+        with self.__lorawan.priority(Priority.LOW):
+            status, confirmed = self.__lorawan.get_ConfirmStatus()
+        if status == CommandResponse.OK and confirmed == 0:
+            self.__cleared = True
+
+        return status, confirmed
+
+    def __finish(self, state):
+        """This method ends the tracking of the current uplink (must be called with the lock).
+
+        :param state [ConfirmationState]: ACKNOWLEDGED or FAILED
+        """
+
+        confirmation = self.__current
+        self.__current = None
+        if state == ConfirmationState.ACKNOWLEDGED:
+            self.__acknowledged += 1
+            self.__latencyTotal += confirmation.latency
+        else:
+            self.__failed += 1
+        confirmation._resolve(state)
+        self.__resolved.append(confirmation)
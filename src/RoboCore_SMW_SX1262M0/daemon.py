@@ -0,0 +1,809 @@
+#################################################################################################################
+
+# RoboCore SMW-SX1262M0 Library (Python) (v1.0)
+
+# Library to use the SMW-SX1262M0 LoRaWAN module.
+
+# Copyright 2023 RoboCore.
+
+
+# This file is part of the SMW-SX1262M0 library ("SMW-SX1262M0-lib").
+
+# "SMW-SX1262M0-lib" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# "SMW-SX1262M0-lib" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with "SMW-SX1262M0-lib". If not, see <https://www.gnu.org/licenses/>
+
+#################################################################################################################
+
+
+# Necessary libraries
+import argparse
+import builtins
+import json
+import os
+import queue
+import socket
+import socketserver
+import stat
+import struct
+import tempfile
+import threading
+from contextlib import ExitStack, contextmanager
+from time import monotonic
+
+from .RoboCore_SMW_SX1262M0 import SMW_SX1262M0, CommandResponse, TimedResult
+from .arbiter import Priority
+from .downlink import DownlinkReceiver
+from .radio import P2PConfig
+
+# default path of the socket (in a directory only accessible by the user, see socketPath())
+SOCKET_PATH = None
+
+# frame: [payload size (uint32)] [type (uint8)] [payload (compact JSON)]
+FRAME_HEADER = struct.Struct("<IB")
+REQUEST = 1  # [method, args, kwargs]
+RESPONSE = 2  # [result, error]
+EVENT = 3  # [event, args]
+SUBSCRIBE = 4  # [event]
+UNSUBSCRIBE = 5  # [event]
+
+# frames queued for each client (a client that falls further behind is disconnected)
+OUTBOX_SIZE = 256
+
+# events sent to the subscribers (see SMW_SX1262M0.addCallback())
+EVENTS = ("downlink", "event", "link", "p2p")
+
+# requests handled by the daemon itself
+NOP = "nop"  # no operation (measures the overhead of the daemon)
+TRANSACTION = "transaction"  # [priority, deadline]
+PRIORITY = "priority"  # [priority]
+END = "end"  # ends the last transaction or priority block
+
+# methods of SMW_SX1262M0 that the clients can call (the others, e.g. saveSession(), which 
+# uses files, or close(), which is local to each client, are refused)
+REMOTE_METHODS = frozenset((
+    "P2P_listen", "P2P_receive", "P2P_send", "P2P_start", "P2P_stop", "configure", "drain",
+    "execute", "flush", "get_ADR", "get_Ajoin", "get_AppEUI", "get_AppKey", "get_AppSKey",
+    "get_Class", "get_Confirm", "get_ConfirmStatus", "get_DR", "get_DevAddr", "get_DevEUI",
+    "get_JoinMode", "get_JoinStatus", "get_LinkQuality", "get_NwkSKey", "get_P2PConfig",
+    "get_RSSI", "get_SNR", "get_TxPower", "get_Version", "idleTime", "isConnected", "join",
+    "lastResponse", "lastTimestamp", "metrics", "ping", "pipeline", "readLine", "readSettings",
+    "readT", "readX", "reconnect", "reset", "resync", "save", "sendT", "sendX", "set_ADR",
+    "set_AJoin", "set_AppEUI", "set_AppKey", "set_AppSKey", "set_Class", "set_Confirm",
+    "set_DR", "set_DevAddr", "set_JoinMode", "set_NwkSKey", "set_P2PConfig", "set_TxPower",
+))
+
+
+def socketPath():
+    """This function gets the default path of the socket, in a directory of the user 
+    ($XDG_RUNTIME_DIR, or a directory created in the temporary directory).
+
+    :return: the path [str]
+    """
+
+    directory = os.environ.get("XDG_RUNTIME_DIR")
+    if not directory:
+        directory = os.path.join(tempfile.gettempdir(), f"smw_sx1262m0-{os.getuid()}")
+
+    return os.path.join(directory, "smw_sx1262m0.sock")
+
+
+def _privateDirectory(directory):
+    """This function creates a directory only accessible by the user, or checks that an 
+    existing one is.
+
+    :param directory [str]: the path of the directory
+
+    Note: a PermissionError is raised if the directory belongs to another user or can be 
+    used by others.
+    """
+
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f"{directory} is not a private directory of the user")
+
+
+def _removeStale(path):
+    """This function removes the socket left by a daemon that is not running anymore.
+
+    :param path [str]: the path of the socket
+
+    Note: a FileExistsError is raised if the path is not a socket or if a daemon is using it.
+    """
+
+    try:
+        info = os.lstat(path)
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(info.st_mode):
+        raise FileExistsError(f"{path} exists and is not a socket")
+
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        os.unlink(path)  # left by a previous daemon
+        return
+    finally:
+        probe.close()
+
+    raise FileExistsError(f"{path} is used by another daemon")
+
+
+def _encode(value):
+    """This function converts a value to the types supported by JSON, keeping the statuses, 
+    the tuples and the timestamps.
+
+    :param value: the value
+
+    :return: the converted value
+    """
+
+    if isinstance(value, CommandResponse):
+        return {"__status__": int(value)}
+    if isinstance(value, (bytes, bytearray)):
+        return {"__bytes__": bytes(value).hex()}
+    if isinstance(value, P2PConfig):
+        return {"__p2p__": [getattr(value, name) for name in P2PConfig.FIELDS]}
+    if isinstance(value, TimedResult):
+        return {"__tuple__": [_encode(item) for item in value], 
+                "__stamp__": [value.timestamp, value.wallTime]}
+    if isinstance(value, tuple):
+        return {"__tuple__": [_encode(item) for item in value]}
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _encode(item) for key, item in value.items()}
+
+    return value
+
+
+def _decode(value):
+    """This function reverts _encode().
+
+    :param value: the converted value
+
+    :return: the value
+    """
+
+    if isinstance(value, dict):
+        if "__status__" in value:
+            return CommandResponse(value["__status__"])
+        if "__bytes__" in value:
+            return bytes.fromhex(value["__bytes__"])
+        if "__p2p__" in value:
+            return P2PConfig(*value["__p2p__"])
+        if "__stamp__" in value:
+            return TimedResult([_decode(item) for item in value["__tuple__"]], value["__stamp__"])
+        if "__tuple__" in value:
+            return tuple(_decode(item) for item in value["__tuple__"])
+        return {key: _decode(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+
+    return value
+
+
+def _frame(kind, payload):
+    """This function creates a frame.
+
+    :param kind [int]: the type of the frame
+    :param payload: the payload (converted with _encode())
+
+    :return: the frame [bytes]
+    """
+
+    data = json.dumps(_encode(payload), separators=(",", ":")).encode()
+
+    return FRAME_HEADER.pack(len(data), kind) + data
+
+
+def _sendFrame(sock, kind, payload):
+    """This function sends a frame.
+
+    :param sock [socket]: the socket
+    :param kind [int]: the type of the frame
+    :param payload: the payload (converted with _encode())
+    """
+
+    sock.sendall(_frame(kind, payload))
+
+
+def _exception(error):
+    """This function creates the exception of an error sent by the daemon, with the same type 
+    as in the daemon when it is a built-in one (e.g. ValueError), or OSError otherwise.
+
+    :param error [list]: the name of the type and the message
+
+    :return: the exception [Exception]
+    """
+
+    name, message = error
+    cls = getattr(builtins, name, None)
+    if isinstance(cls, type) and issubclass(cls, Exception):
+        try:
+            return cls(message)
+        except TypeError:
+            pass  # the constructor needs other arguments (e.g. UnicodeDecodeError)
+
+    return OSError(f"{name}: {message}")
+
+
+def _receiveExactly(sock, size):
+    """This function reads a number of bytes from a socket.
+
+    :param sock [socket]: the socket
+    :param size [int]: the number of bytes
+
+    :return: the bytes [bytes], or None if the connection was closed
+    """
+
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+
+    return bytes(data)
+
+
+def _receiveFrame(sock):
+    """This function reads a frame.
+
+    :param sock [socket]: the socket
+
+    :return: the type [int] and the payload, or None if the connection was closed
+    """
+
+    header = _receiveExactly(sock, FRAME_HEADER.size)
+    if header is None:
+        return None
+    size, kind = FRAME_HEADER.unpack(header)
+    data = _receiveExactly(sock, size)
+    if data is None:
+        return None
+
+    return kind, _decode(json.loads(data))
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    """This class serves a client of ModuleServer (each client has its own thread, and another 
+    one that sends its frames, so a slow client does not delay the module).
+    """
+
+    def setup(self):
+        """This method registers the client."""
+
+        self.events = set()
+        self.outbox = queue.Queue(OUTBOX_SIZE)  # frames not sent yet
+        self.writer = threading.Thread(target=self.__write, name="ModuleServer writer", daemon=True)
+        self.writer.start()
+        self.server.clients.add(self)
+
+    def handle(self):
+        """This method runs the requests of the client, one at a time."""
+
+        lorawan = self.server.lorawan
+        # transactions and priorities opened by the client
+        blocks = []
+        try:
+            while True:
+                try:
+                    frame = _receiveFrame(self.request)
+                except (KeyError, TypeError, ValueError) as exception:
+                    # the whole frame was read, so the next ones can still be read
+                    self.__send(RESPONSE, [None, ["ValueError", f"invalid frame: {exception}"]])
+                    continue
+                if frame is None:
+                    break
+                kind, payload = frame
+
+                result, error = None, None
+                try:
+                    if kind == SUBSCRIBE:
+                        self.events.add(payload[0])
+                        continue
+                    if kind == UNSUBSCRIBE:
+                        self.events.discard(payload[0])
+                        continue
+                    if kind != REQUEST:
+                        raise ValueError(f"invalid frame type: {kind}")
+
+                    method, args, kwargs = payload
+                    if method == NOP:
+                        pass
+                    elif method == TRANSACTION:
+                        block = ExitStack()
+                        priority = None if args[0] is None else Priority(args[0])
+                        block.enter_context(lorawan.transaction(priority, args[1]))
+                        blocks.append(block)
+                    elif method == PRIORITY:
+                        block = ExitStack()
+                        block.enter_context(lorawan.priority(Priority(args[0])))
+                        blocks.append(block)
+                    elif method == END:
+                        if blocks:
+                            blocks.pop().close()
+                    elif method not in REMOTE_METHODS:
+                        error = ["AttributeError", f"'{method}' is not available remotely"]
+                    else:
+                        result = getattr(lorawan, method)(*args, **kwargs)
+                except Exception as exception:
+                    error = [type(exception).__name__, str(exception)]
+
+                try:
+                    self.__send(RESPONSE, [result, error])
+                except (TypeError, ValueError) as exception:
+                    # the result cannot be encoded (nothing was queued)
+                    error = [type(exception).__name__, f"the result cannot be sent: {exception}"]
+                    self.__send(RESPONSE, [None, error])
+
+        except OSError:
+            pass  # the client disconnected
+        finally:
+            # release the module held by the client
+            while blocks:
+                blocks.pop().close()
+
+    def finish(self):
+        """This method unregisters the client and stops its writer."""
+
+        self.server.clients.discard(self)
+        try:
+            self.outbox.put(None, timeout=1)
+        except queue.Full:
+            self.__disconnect()  # the writer discards the frames left
+            self.outbox.put(None)
+
+    def notify(self, event, args):
+        """This method queues an event for the client, if it subscribed to it (it does not wait 
+        for the client, see OUTBOX_SIZE).
+
+        :param event [str]: the name of the event
+        :param args [tuple]: the arguments of the event
+        """
+
+        if event not in self.events:
+            return
+        try:
+            self.__send(EVENT, [event, list(args)])
+        except (TypeError, ValueError):
+            pass  # the arguments cannot be encoded
+
+    def __send(self, kind, payload):
+        """This method queues a frame for the writer. A client that does not read its frames 
+        fast enough to keep less than OUTBOX_SIZE of them queued is disconnected.
+
+        :param kind [int]: the type of the frame
+        :param payload: the payload (converted with _encode())
+        """
+
+        try:
+            self.outbox.put_nowait(_frame(kind, payload))
+        except queue.Full:
+            self.__disconnect()
+
+    def __write(self):
+        """This method sends the queued frames (runs in its own thread)."""
+
+        connected = True
+        while True:
+            data = self.outbox.get()
+            if data is None:
+                break
+            if not connected:
+                continue  # discard the frames of a client that disconnected
+            try:
+                self.request.sendall(data)
+            except OSError:
+                connected = False
+                self.__disconnect()
+
+    def __disconnect(self):
+        """This method closes the connection, which ends handle()."""
+
+        try:
+            self.request.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass  # already closed
+
+
+class ModuleServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """This class owns the module and serves it to several processes through a Unix socket.
+
+    Each client has its own thread in the server, so the transactions and priorities of the 
+    clients work as the ones of the threads of a single process. The events of the module 
+    ("downlink", "event", "link" and "p2p") are sent to every client subscribed to them.
+
+    The socket is only accessible by the user running the daemon, and only the methods in 
+    REMOTE_METHODS can be called.
+    """
+
+    daemon_threads = True
+    block_on_close = False
+
+    def __init__(self, lorawan, path=SOCKET_PATH, receive=False):
+        """This method is the constructor of the class.
+
+        :param lorawan [SMW_SX1262M0]: the module
+        :param path [str]: the path of the socket, or None for socketPath() 
+        (default = SOCKET_PATH)
+        :param receive [bool]: True to read the downlinks as soon as they arrive 
+        (see DownlinkReceiver) (default = False)
+        """
+
+        if path is None:
+            path = socketPath()
+            _privateDirectory(os.path.dirname(path))
+        _removeStale(path)
+        super().__init__(path, _Handler)
+
+        self.path = path
+        self.lorawan = lorawan
+        self.clients = set()
+        self.receiver = DownlinkReceiver(lorawan) if receive else None
+
+        for event in EVENTS:
+            lorawan.addCallback(event, lambda *args, event=event: self.broadcast(event, args))
+
+    def server_bind(self):
+        """This method creates the socket only accessible by the user."""
+
+        super().server_bind()
+        os.chmod(self.server_address, 0o600)
+
+    def broadcast(self, event, args):
+        """This method sends an event to the subscribed clients.
+
+        :param event [str]: the name of the event
+        :param args [tuple]: the arguments of the event
+        """
+
+        for client in list(self.clients):
+            client.notify(event, args)
+
+    def serve_forever(self, poll_interval=0.5):
+        """This method serves the clients until shutdown() is called.
+
+        :param poll_interval [float]: the time between checks of shutdown(), in [s] (default = 0.5)
+        """
+
+        if self.receiver is not None:
+            self.receiver.start()
+        try:
+            super().serve_forever(poll_interval)
+        finally:
+            if self.receiver is not None:
+                self.receiver.stop()
+
+    def server_close(self):
+        """This method closes the socket and removes its file."""
+
+        super().server_close()
+        try:
+            if stat.S_ISSOCK(os.lstat(self.path).st_mode):
+                os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class SMW_SX1262M0Client:
+    """This class uses a module shared by ModuleServer, with the same methods as SMW_SX1262M0.
+
+    Example: lorawan = SMW_SX1262M0Client()  # instead of SMW_SX1262M0("/dev/serial0")
+             lorawan.sendT(1, "Hello")
+
+    Note: a CancelToken cannot be sent to the daemon, so the "cancel" argument is ignored (the 
+    "deadline" argument works, since millis() is the same in every process).
+    """
+
+    parseResponse = SMW_SX1262M0.parseResponse
+    SETTINGS = SMW_SX1262M0.SETTINGS
+    SMW_SX1262M0_TIMEOUT_READ = SMW_SX1262M0.SMW_SX1262M0_TIMEOUT_READ
+    SMW_SX1262M0_TIMEOUT_WRITE = SMW_SX1262M0.SMW_SX1262M0_TIMEOUT_WRITE
+    SMW_SX1262M0_TIMEOUT_RESET = SMW_SX1262M0.SMW_SX1262M0_TIMEOUT_RESET
+
+    def __init__(self, path=SOCKET_PATH, lazy=True):
+        """This method is the constructor of the class.
+
+        :param path [str]: the path of the socket of the daemon, or None for socketPath() 
+        (default = SOCKET_PATH)
+        :param lazy [bool]: True to connect only when the first command is sent, 
+        False to connect right away (default = True)
+        """
+
+        self.__path = socketPath() if path is None else path
+        self.__socket = None
+        self.__reader = None
+        self.__dispatcher = None
+        self.__responses = queue.Queue()
+        self.__events = queue.Queue()
+        self.__requestLock = threading.Lock()
+        self.__callbacks = {}
+
+        if not lazy:
+            self.open()
+
+    def __enter__(self):
+        """This method connects to the daemon when entering a "with" block.
+
+        :return: the object itself [SMW_SX1262M0Client]
+        """
+
+        self.open()
+
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        """This method disconnects from the daemon when leaving a "with" block."""
+
+        self.close()
+
+    def __getattr__(self, name):
+        """This method creates the methods of SMW_SX1262M0 that run in the daemon.
+
+        :param name [str]: the name of the method
+
+        :return: the method [function]
+        """
+
+        if name not in REMOTE_METHODS:
+            raise AttributeError(name)
+
+        def method(*args, **kwargs):
+            kwargs.pop("cancel", None)
+            return self.__request(name, list(args), kwargs)
+
+        method.__name__ = name
+        method.__doc__ = getattr(SMW_SX1262M0, name).__doc__
+
+        return method
+
+    def open(self):
+        """This method connects to the daemon, if not connected yet."""
+
+        if self.__socket is not None:
+            return
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(self.__path)
+        self.__socket = sock
+        self.__responses = queue.Queue()
+        self.__events = queue.Queue()
+        self.__reader = threading.Thread(target=self.__read, args=(sock,), 
+                                         name="SMW_SX1262M0Client", daemon=True)
+        self.__reader.start()
+        # the callbacks run in another thread, so that they can send commands
+        self.__dispatcher = threading.Thread(target=self.__dispatch, args=(self.__events,),
+                                             name="SMW_SX1262M0Client events", daemon=True)
+        self.__dispatcher.start()
+        for event in self.__callbacks:
+            _sendFrame(sock, SUBSCRIBE, [event])
+
+    def close(self):
+        """This method disconnects from the daemon (the module stays open in the daemon)."""
+
+        if self.__socket is None:
+            return
+
+        try:
+            self.__socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.__socket.close()
+        self.__reader.join()
+        if self.__dispatcher is not threading.current_thread():
+            self.__dispatcher.join()
+        self.__socket = None
+        self.__reader = None
+        self.__dispatcher = None
+
+    def isOpen(self):
+        """This method checks if the client is connected to the daemon.
+
+        :return: the state [bool]
+        """
+
+        return self.__socket is not None
+
+    def millis(self):
+        """This method gets the time in ms.
+        
+        :return: the value [int] 
+        """
+
+        return round(monotonic() * 1000)
+
+    def addCallback(self, event, function):
+        """This method registers a function to be called on an event of the module 
+        (see SMW_SX1262M0.addCallback()).
+
+        :param event [str]: the name of the event
+        :param function [function]: the function to call (from a thread of the client)
+        """
+
+        functions = self.__callbacks.setdefault(event, [])
+        functions.append(function)
+        if self.__socket is None:
+            self.open()  # subscribes to the events registered
+        elif len(functions) == 1:
+            with self.__requestLock:
+                _sendFrame(self.__socket, SUBSCRIBE, [event])
+
+    def removeCallback(self, event, function):
+        """This method unregisters a function registered with addCallback().
+
+        :param event [str]: the name of the event
+        :param function [function]: the function to remove
+        """
+
+        functions = self.__callbacks.get(event, [])
+        if function in functions:
+            functions.remove(function)
+            if not functions:
+                del self.__callbacks[event]
+                if self.__socket is not None:
+                    with self.__requestLock:
+                        _sendFrame(self.__socket, UNSUBSCRIBE, [event])
+
+    @contextmanager
+    def transaction(self, priority=None, deadline=None, cancel=None):
+        """This method gives the module to this client inside a "with" block 
+        (see SMW_SX1262M0.transaction()).
+
+        :param priority [Priority]: the priority, or None to use the priority of the client 
+        (default = None)
+        :param deadline [int]: the time limit of the block, in [ms] of millis() (default = None)
+        :param cancel [CancelToken]: ignored (default = None)
+        """
+
+        self.__request(TRANSACTION, [None if priority is None else int(priority), deadline], {})
+        try:
+            yield
+        finally:
+            self.__request(END, [], {})
+
+    @contextmanager
+    def priority(self, priority):
+        """This method sets the priority of the commands of this client inside a "with" block.
+
+        :param priority [Priority]: the priority (HIGH, NORMAL or LOW)
+        """
+
+        self.__request(PRIORITY, [int(priority)], {})
+        try:
+            yield
+        finally:
+            self.__request(END, [], {})
+
+    def nop(self):
+        """This method sends a request that does not use the module (see benchmark())."""
+
+        self.__request(NOP, [], {})
+
+    def __request(self, method, args, kwargs):
+        """This method runs a method in the daemon and waits for the result.
+
+        :param method [str]: the name of the method
+        :param args [list]: the positional arguments
+        :param kwargs [dict]: the keyword arguments
+
+        :return: the result of the method
+        """
+
+        with self.__requestLock:
+            self.open()
+            _sendFrame(self.__socket, REQUEST, [method, args, kwargs])
+            response = self.__responses.get()
+
+        if response is None:
+            self.close()
+            raise ConnectionError("the daemon closed the connection")
+        result, error = response
+        if error is not None:
+            raise _exception(error)
+
+        return result
+
+    def __read(self, sock):
+        """This method receives the frames of the daemon (runs in its own thread).
+
+        :param sock [socket]: the socket
+        """
+
+        try:
+            while True:
+                frame = _receiveFrame(sock)
+                if frame is None:
+                    break
+                kind, payload = frame
+                if kind == RESPONSE:
+                    self.__responses.put(payload)
+                elif kind == EVENT:
+                    self.__events.put(payload)
+        except OSError:
+            pass  # the connection was closed
+        finally:
+            self.__responses.put(None)
+            self.__events.put(None)
+
+    def __dispatch(self, events):
+        """This method calls the functions registered for the events received (runs in its 
+        own thread).
+
+        :param events [queue.Queue]: the events received by __read()
+        """
+
+        while True:
+            payload = events.get()
+            if payload is None:
+                break
+            event, args = payload
+            for function in list(self.__callbacks.get(event, ())):
+                function(*args)
+
+
+def benchmark(path=SOCKET_PATH, count=200):
+    """This function measures the time added by the daemon to each command.
+
+    :param path [str]: the path of the socket of the daemon, or None for socketPath() 
+    (default = SOCKET_PATH)
+    :param count [int]: the number of requests of each kind (default = 200)
+
+    :return: for "nop" (the overhead of the daemon) and "ping" (a command to the module) [dict], 
+    the mean, median, 95th percentile and maximum time, in [ms]
+    """
+
+    results = {}
+    with SMW_SX1262M0Client(path) as lorawan:
+        for name, function in (("nop", lorawan.nop), ("ping", lorawan.ping)):
+            times = []
+            for _ in range(count):
+                start = monotonic()
+                function()
+                times.append((monotonic() - start) * 1000)
+            times.sort()
+            results[name] = {
+                "mean": sum(times) / len(times),
+                "p50": times[len(times) // 2],
+                "p95": times[min(int(len(times) * 0.95), len(times) - 1)],
+                "max": times[-1],
+            }
+
+    return results
+
+
+# this condition will only be True if the file is executed directly
+# (e.g. python -m RoboCore_SMW_SX1262M0.daemon /dev/serial0)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Share an SMW-SX1262M0 module between processes.")
+    parser.add_argument("port", nargs="?", default="/dev/serial0", help="serial port of the module")
+    parser.add_argument("--socket", default=SOCKET_PATH,
+                        help="path of the Unix socket (default: in a directory of the user)")
+    parser.add_argument("--receive", action="store_true", help="read the downlinks as they arrive")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="measure the latency of a running daemon and exit")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        print(f"{'request':<10}{'mean':>10}{'p50':>10}{'p95':>10}{'max':>10}  [ms]")
+        for name, stats in benchmark(args.socket).items():
+            print(f"{name:<10}" + "".join(f"{stats[key]:>10.3f}" for key in ("mean", "p50", "p95", "max")))
+    else:
+        with SMW_SX1262M0(args.port) as lorawan, ModuleServer(lorawan, args.socket, args.receive) as server:
+            print(f"Serving {args.port} on {server.path}")
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
@@ -0,0 +1,194 @@
+#################################################################################################################
+
+# RoboCore SMW-SX1262M0 Library (Python) (v1.0)
+
+# Library to use the SMW-SX1262M0 LoRaWAN module.
+
+# Copyright 2023 RoboCore.
+
+
+# This file is part of the SMW-SX1262M0 library ("SMW-SX1262M0-lib").
+
+# "SMW-SX1262M0-lib" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# "SMW-SX1262M0-lib" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with "SMW-SX1262M0-lib". If not, see <https://www.gnu.org/licenses/>
+
+#################################################################################################################
+
+
+# Necessary libraries
+from collections import deque
+
+from .RoboCore_SMW_SX1262M0 import CommandResponse
+from .airtime import requiredSNR, uplinkAirtime
+from .monitor import LinkMonitor
+
+
+class DataRateOptimizer:
+    """This class chooses the fastest Data Rate that keeps a safe SNR margin (client-side ADR).
+
+    The SNR of the downlinks (read with get_SNR() or get_LinkQuality()) is used as an estimate 
+    of the link budget. The Data Rate goes up only when the margin exceeds the target by the 
+    hysteresis, and goes down as soon as the margin is lost or the downlinks start to fail.
+    """
+
+    def __init__(self, lorawan, monitor=None, margin=10.0, hysteresis=3.0, window=20,
+                 minDR=0, maxDR=5, payloadSize=12, minSaving=5.0):
+        """This method is the constructor of the class.
+
+        :param lorawan [SMW_SX1262M0]: the module
+        :param monitor [LinkMonitor]: the monitor with the SNR history, or None to create one 
+        attached to the module (default = None)
+        :param margin [float]: the SNR margin required above the demodulation limit, 
+        in [dB] (default = 10.0)
+        :param hysteresis [float]: the extra margin required to increase the Data Rate, 
+        in [dB] (default = 3.0)
+        :param window [int]: the number of recent samples used (default = 20)
+        :param minDR [int]: the slowest Data Rate allowed (default = 0)
+        :param maxDR [int]: the fastest Data Rate allowed (default = 5)
+        :param payloadSize [int]: the typical size of the uplinks, in [bytes] (default = 12)
+        :param minSaving [float]: the minimum airtime saved per uplink for a change to be worth
+        the command, in [ms] (default = 5.0)
+        """
+
+        self.__lorawan = lorawan
+        if monitor is None:
+            monitor = LinkMonitor()
+            monitor.attach(lorawan)
+        self.__monitor = monitor
+        self.__margin = margin
+        self.__hysteresis = hysteresis
+        self.__window = window
+        self.__minDR = minDR
+        self.__maxDR = maxDR
+        self.__payloadSize = payloadSize
+        self.__minSaving = minSaving
+
+        self.__dr = None  # Data Rate in use
+        self.__baseline = None  # Data Rate when the optimizer was enabled
+        self.__downlinks = deque(maxlen=window)  # success of the recent downlinks
+        self.__uplinks = 0
+        self.__changes = 0
+        self.__airtime = 0.0  # [ms]
+        self.__saved = 0.0  # [ms]
+
+    def enable(self):
+        """This method disables the network ADR and reads the current Data Rate.
+
+        :return: the response of the command [CommandResponse]
+        """
+
+        status = self.__lorawan.set_ADR(0)
+        if status != CommandResponse.OK:
+            return (status)
+
+        status, dr = self.__lorawan.get_DR()
+        if status == CommandResponse.OK:
+            self.__dr = dr
+            self.__baseline = dr
+
+        return (status)
+
+    def recordDownlink(self, success):
+        """This method stores the result of an expected downlink (e.g. the acknowledgement of a 
+        confirmed uplink).
+
+        :param success [bool]: True if the downlink was received
+        """
+
+        self.__downlinks.append(bool(success))
+
+    def recordUplink(self, payloadSize=None):
+        """This method accounts the airtime of an uplink sent with the current Data Rate.
+
+        :param payloadSize [int]: the size of the payload, in [bytes], or None to use the 
+        typical size (default = None)
+        """
+
+        if self.__dr is None:
+            return
+
+        size = self.__payloadSize if payloadSize is None else payloadSize
+        airtime = uplinkAirtime(size, self.__dr)
+        self.__uplinks += 1
+        self.__airtime += airtime
+        self.__saved += uplinkAirtime(size, self.__baseline) - airtime
+
+    def target(self):
+        """This method calculates the Data Rate recommended by the recent history.
+
+        :return: the Data Rate [int], or None if there is not enough data
+        """
+
+        if self.__dr is None:
+            return None
+
+        # go down one step if the downlinks are failing (even without SNR samples)
+        if len(self.__downlinks) >= 4 and sum(self.__downlinks) < len(self.__downlinks) / 2:
+            return max(self.__dr - 1, self.__minDR)
+
+        snr = self.__monitor.statistics("lorawan", self.__window)["snr"]
+        if snr is None:
+            return None
+
+        # the 10th percentile is used so that fades are taken into account
+        best = self.__minDR
+        for dr in range(self.__minDR, self.__maxDR + 1):
+            required = requiredSNR(dr) + self.__margin
+            if dr > self.__dr:
+                required += self.__hysteresis
+            if snr["p10"] >= required:
+                best = dr
+
+        return best
+
+    def update(self):
+        """This method applies the recommended Data Rate with set_DR(), if it is worth the 
+        command.
+
+        :return: the new Data Rate [int], or None if it was not changed
+        """
+
+        dr = self.target()
+        if dr is None or dr == self.__dr:
+            return None
+
+        # going up must save enough airtime; going down is always applied (link safety)
+        if dr > self.__dr:
+            saving = uplinkAirtime(self.__payloadSize, self.__dr) - uplinkAirtime(self.__payloadSize, dr)
+            if saving < self.__minSaving:
+                return None
+
+        if self.__lorawan.set_DR(dr) != CommandResponse.OK:
+            return None
+
+        self.__dr = dr
+        self.__changes += 1
+        self.__downlinks.clear()
+
+        return dr
+
+    def report(self):
+        """This method gets the results of the optimizer.
+
+        :return: the current and the initial Data Rate, the number of changes and uplinks, and 
+        the airtime used and saved, in [ms] [dict]
+        """
+
+        return {
+            "dr": self.__dr,
+            "baseline": self.__baseline,
+            "changes": self.__changes,
+            "uplinks": self.__uplinks,
+            "airtime": self.__airtime,
+            "airtimeSaved": self.__saved,
+        }
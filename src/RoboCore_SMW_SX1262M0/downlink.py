@@ -0,0 +1,201 @@
+#################################################################################################################
+
+# RoboCore SMW-SX1262M0 Library (Python) (v1.0)
+
+# Library to use the SMW-SX1262M0 LoRaWAN module.
+
+# Copyright 2023 RoboCore.
+
+
+# This file is part of the SMW-SX1262M0 library ("SMW-SX1262M0-lib").
+
+# "SMW-SX1262M0-lib" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# "SMW-SX1262M0-lib" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with "SMW-SX1262M0-lib". If not, see <https://www.gnu.org/licenses/>
+
+#################################################################################################################
+
+
+# Necessary libraries
+import queue
+import threading
+
+from .arbiter import Priority
+
+# start of the asynchronous events that report a downlink (other events are ignored)
+DOWNLINK_EVENTS = ("+EVT:RX",)
+
+
+class Downlink:
+    """This class stores a downlink received by the module."""
+
+    __slots__ = ("port", "message", "binary", "timestamp", "arrival", "wallTime")
+
+    def __init__(self, port, message, binary, timestamp, arrival=None, wallTime=None):
+        """This method is the constructor of the class.
+
+        :param port [int]: the port of the downlink
+        :param message [str]: the message (hexadecimal if binary)
+        :param binary [bool]: True if the message was read with readX()
+        :param timestamp [int]: the time the downlink was read, in [ms] of millis()
+        :param arrival [int]: the time the module reported the downlink (the first byte of 
+        the event, or of the response of readT()/readX()), in [ns] of time.monotonic_ns() 
+        (default = None)
+        :param wallTime [int]: the same time, in [ns] of time.time_ns(), or None if the wall 
+        clock is not enabled (default = None)
+        """
+
+        self.port = port
+        self.message = message
+        self.binary = binary
+        self.timestamp = timestamp
+        self.arrival = arrival
+        self.wallTime = wallTime
+
+    def __repr__(self):
+        return f"Downlink(port={self.port}, message={self.message!r})"
+
+
+class DownlinkReceiver:
+    """This class delivers the downlinks as soon as the module reports them (e.g. in Class C),
+    without polling readT()/readX().
+
+    A background thread waits for the asynchronous events of the module, with low priority so 
+    that other commands are not delayed. When an event arrives, the message is read and 
+    delivered to the callbacks and to the iterator. Downlinks read by the application with 
+    readT()/readX() are delivered too.
+    """
+
+    def __init__(self, lorawan, binary=True, fallback=None, events=DOWNLINK_EVENTS):
+        """This method is the constructor of the class.
+
+        :param lorawan [SMW_SX1262M0]: the module
+        :param binary [bool]: True to read the messages with readX(), False to use readT() 
+        (default = True)
+        :param fallback [int]: the period, in [ms], to read the message even without event 
+        (an event can be consumed by a command of another thread), or None to disable 
+        (default = None)
+        :param events [tuple]: the start of the event lines that report a downlink 
+        (default = DOWNLINK_EVENTS)
+        """
+
+        self.__lorawan = lorawan
+        self.__binary = binary
+        self.__fallback = fallback
+        self.__events = tuple(events)
+        self.__callbacks = []
+        self.__queue = queue.Queue()
+        self.__thread = None
+        self.__stopped = threading.Event()
+        self.__eventStamp = None  # time of the event being handled by the thread
+
+    def addCallback(self, function):
+        """This method registers a function to be called with each downlink.
+
+        :param function [function]: function(downlink)
+        """
+
+        self.__callbacks.append(function)
+
+    def start(self):
+        """This method starts the background thread."""
+
+        if self.__thread is not None:
+            return
+
+        self.__stopped.clear()
+        self.__lorawan.addCallback("downlink", self.__deliver)
+        self.__thread = threading.Thread(target=self.__run, name="DownlinkReceiver", daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """This method stops the background thread (the iterators end)."""
+
+        if self.__thread is None:
+            return
+
+        self.__stopped.set()
+        self.__thread.join()
+        self.__thread = None
+        self.__lorawan.removeCallback("downlink", self.__deliver)
+        self.__queue.put(None)  # wakes up the iterators
+
+    def __iter__(self):
+        """This method iterates over the downlinks until stop() is called.
+
+        :return: the downlinks [Downlink]
+        """
+
+        while True:
+            downlink = self.__queue.get()
+            if downlink is None:
+                return
+            yield downlink
+
+    def get(self, timeout=None):
+        """This method waits for the next downlink.
+
+        :param timeout [float]: the maximum time to wait, in [s], or None to wait 
+        forever (default = None)
+
+        :return: the downlink [Downlink] or None if no downlink was received
+        """
+
+        try:
+            return self.__queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def __run(self):
+        """This method waits for events and reads the messages (background thread)."""
+
+        lorawan = self.__lorawan
+        nextRead = None if self.__fallback is None else lorawan.millis() + self.__fallback
+        while not self.__stopped.is_set():
+            with lorawan.priority(Priority.LOW):
+                # the module is released every 20 ms so other commands can be sent
+                line = lorawan.readLine(20)
+                event = line is not None and line.strip().startswith(self.__events)
+                due = nextRead is not None and lorawan.millis() >= nextRead
+                if event or due:
+                    self.__eventStamp = lorawan.lastTimestamp() if event else None
+                    self.__read()
+                    if nextRead is not None:
+                        nextRead = lorawan.millis() + self.__fallback
+
+    def __read(self):
+        """This method reads the message reported by an event (it is delivered by the
+        "downlink" event of the module)."""
+
+        if self.__binary:
+            self.__lorawan.readX()
+        else:
+            self.__lorawan.readT()
+
+    def __deliver(self, port, message, binary):
+        """This method delivers a downlink ("downlink" event of the module).
+
+        :param port [int]: the port of the downlink
+        :param message [str]: the message
+        :param binary [bool]: True if the message is hexadecimal
+        """
+
+        # the event is the earliest sign of the downlink
+        stamp = self.__lorawan.lastTimestamp()
+        if self.__eventStamp is not None and threading.current_thread() is self.__thread:
+            stamp = self.__eventStamp
+        arrival, wallTime = stamp if stamp is not None else (None, None)
+
+        downlink = Downlink(port, message, binary, self.__lorawan.millis(), arrival, wallTime)
+        self.__queue.put(downlink)
+        for function in self.__callbacks:
+            function(downlink)
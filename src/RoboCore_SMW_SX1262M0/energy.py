@@ -0,0 +1,317 @@
+#################################################################################################################
+
+# RoboCore SMW-SX1262M0 Library (Python) (v1.0)
+
+# Library to use the SMW-SX1262M0 LoRaWAN module.
+
+# Copyright 2023 RoboCore.
+
+
+# This file is part of the SMW-SX1262M0 library ("SMW-SX1262M0-lib").
+
+# "SMW-SX1262M0-lib" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# "SMW-SX1262M0-lib" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with "SMW-SX1262M0-lib". If not, see <https://www.gnu.org/licenses/>
+
+#################################################################################################################
+
+
+# Necessary libraries
+from collections import deque
+
+from .RoboCore_SMW_SX1262M0 import CommandResponse
+from .airtime import DATA_RATES, requiredSNR, uplinkAirtime
+from .monitor import LinkMonitor
+
+# maximum EIRP [dBm] of AU915 (TXP = 0) and the step of each TXP index [dB]
+MAX_EIRP = 30
+TX_POWER_STEP = 2
+TX_POWER_INDEXES = 15  # 0-14
+
+# maximum output power of the SX1262 [dBm]
+MAX_OUTPUT_POWER = 22
+
+# supply current [mA] while transmitting at each output power [dBm] (SX1262 datasheet, DC-DC, 3.3 V)
+TX_CURRENT = {
+
+    22: 118.0,
+    20: 102.0,
+    17: 90.0,
+    14: 45.0,
+    10: 32.0,
+    0: 17.0,
+
+}
+
+RX_CURRENT = 4.6  # [mA]
+SLEEP_CURRENT = 0.0012  # [mA]
+RX_WINDOW_SYMBOLS = 8  # symbols of each receive window with no downlink
+
+
+def outputPower(txPower):
+    """This function converts a TXP index into the output power of the module.
+
+    :param txPower [int]: the TXP index (0-14)
+
+    :return: the output power, in [dBm] [int]
+    """
+
+    return min(MAX_EIRP - TX_POWER_STEP * txPower, MAX_OUTPUT_POWER)
+
+
+def txCurrent(power):
+    """This function interpolates the supply current while transmitting.
+
+    :param power [float]: the output power, in [dBm]
+
+    :return: the current, in [mA] [float]
+    """
+
+    points = sorted(TX_CURRENT.items())
+    if power <= points[0][0]:
+        return points[0][1]
+    for (p0, i0), (p1, i1) in zip(points, points[1:]):
+        if power <= p1:
+            return i0 + (i1 - i0) * (power - p0) / (p1 - p0)
+
+    return points[-1][1]
+
+
+class EnergyModel:
+    """This class estimates the charge used by the uplinks of a Class A node.
+
+    Each uplink is modelled as the transmission (see uplinkAirtime()) followed by the two receive 
+    windows with no downlink; the rest of the time the module sleeps. The default currents are 
+    typical values of the SX1262 and can be replaced with the values measured on the board.
+    """
+
+    def __init__(self, voltage=3.3, rxCurrent=RX_CURRENT, sleepCurrent=SLEEP_CURRENT,
+                 txCurrents=None):
+        """This method is the constructor of the class.
+
+        :param voltage [float]: the supply voltage, in [V] (default = 3.3)
+        :param rxCurrent [float]: the current while receiving, in [mA] (default = RX_CURRENT)
+        :param sleepCurrent [float]: the current while sleeping, in [mA] (default = SLEEP_CURRENT)
+        :param txCurrents [dict]: the current while transmitting, in [mA], for each TXP index, or 
+        None to use TX_CURRENT (default = None)
+        """
+
+        self.voltage = voltage
+        self.rxCurrent = rxCurrent
+        self.sleepCurrent = sleepCurrent
+        self.txCurrents = dict(txCurrents) if txCurrents else {}
+
+    def uplink(self, payloadSize, dr, txPower=0):
+        """This method estimates the charge of a single uplink.
+
+        :param payloadSize [int]: the size of the application payload, in [bytes]
+        :param dr [int]: the Data Rate (see DATA_RATES)
+        :param txPower [int]: the TXP index (0-14) (default = 0)
+
+        :return: the airtime and the receive time, in [ms], the charge, in [mC], and the 
+        energy, in [mJ] [dict]
+        """
+
+        airtime = uplinkAirtime(payloadSize, dr)
+        sf, bw = DATA_RATES[dr]
+        rxTime = 2 * RX_WINDOW_SYMBOLS * (2 ** sf) / bw  # [ms]
+
+        current = self.txCurrents.get(txPower)
+        if current is None:
+            current = txCurrent(outputPower(txPower))
+
+        # [mA] * [ms] = [uC]
+        charge = (current * airtime + self.rxCurrent * rxTime) / 1000
+
+        return {
+            "airtime": airtime,
+            "rxTime": rxTime,
+            "charge": charge,
+            "energy": charge * self.voltage,
+        }
+
+    def daily(self, payloadSize, dr, txPower=0, uplinksPerDay=96):
+        """This method estimates the charge used per day.
+
+        :param payloadSize [int]: the size of the application payload, in [bytes]
+        :param dr [int]: the Data Rate (see DATA_RATES)
+        :param txPower [int]: the TXP index (0-14) (default = 0)
+        :param uplinksPerDay [float]: the number of uplinks per day (default = 96)
+
+        :return: the charge, in [mAh], the energy, in [J], the average current, in [mA], and 
+        the share of the charge used by the radio [dict]
+        """
+
+        uplink = self.uplink(payloadSize, dr, txPower)
+        active = uplinksPerDay * (uplink["airtime"] + uplink["rxTime"])  # [ms]
+        radio = uplinksPerDay * uplink["charge"]  # [mC]
+        sleep = self.sleepCurrent * max(86400000 - active, 0) / 1000  # [mC]
+        charge = radio + sleep
+
+        return {
+            "charge": charge / 3600,
+            "energy": charge * self.voltage / 1000,
+            "current": charge / 86400,
+            "radioShare": radio / charge if charge else 0.0,
+        }
+
+
+class TxPowerController:
+    """This class chooses the lowest Transmit Power that keeps a safe SNR margin.
+
+    The SNR of the downlinks is used as an estimate of the link budget at the maximum power: 
+    every TXP step lowers the uplink SNR by TX_POWER_STEP, so the power is reduced only while 
+    the margin of the current Data Rate allows it. The power goes down by one step at a time 
+    (with hysteresis) and goes back up at once when the margin is lost or the downlinks fail.
+    """
+
+    def __init__(self, lorawan, monitor=None, dr=None, margin=10.0, hysteresis=2.0, window=20,
+                 maxTxPower=TX_POWER_INDEXES - 1):
+        """This method is the constructor of the class.
+
+        :param lorawan [SMW_SX1262M0]: the module
+        :param monitor [LinkMonitor]: the monitor with the SNR history, or None to create one 
+        attached to the module (default = None)
+        :param dr [int]: the Data Rate in use, or None to read it in enable() (default = None)
+        :param margin [float]: the SNR margin required above the demodulation limit, 
+        in [dB] (default = 10.0)
+        :param hysteresis [float]: the extra margin required to lower the power, in [dB] 
+        (default = 2.0)
+        :param window [int]: the number of recent samples used (default = 20)
+        :param maxTxPower [int]: the highest TXP index (lowest power) allowed (default = 14)
+        """
+
+        self.__lorawan = lorawan
+        if monitor is None:
+            monitor = LinkMonitor()
+            monitor.attach(lorawan)
+        self.__monitor = monitor
+        self.__dr = dr
+        self.__margin = margin
+        self.__hysteresis = hysteresis
+        self.__window = window
+        self.__maxTxPower = maxTxPower
+
+        self.__txPower = None  # TXP index in use
+        self.__downlinks = deque(maxlen=window)  # success of the recent downlinks
+        self.__changes = 0
+
+    def enable(self):
+        """This method reads the current Transmit Power (and the Data Rate, if not given).
+
+        :return: the response of the command [CommandResponse]
+        """
+
+        status, txPower = self.__lorawan.get_TxPower()
+        if status != CommandResponse.OK:
+            return (status)
+        self.__txPower = txPower
+
+        if self.__dr is None:
+            status, dr = self.__lorawan.get_DR()
+            if status == CommandResponse.OK:
+                self.__dr = dr
+
+        return (status)
+
+    def setDR(self, dr):
+        """This method informs the controller of a new Data Rate (e.g. from DataRateOptimizer).
+
+        :param dr [int]: the Data Rate in use
+        """
+
+        self.__dr = dr
+
+    def recordDownlink(self, success):
+        """This method stores the result of an expected downlink (e.g. the acknowledgement of a 
+        confirmed uplink).
+
+        :param success [bool]: True if the downlink was received
+        """
+
+        self.__downlinks.append(bool(success))
+
+    def target(self):
+        """This method calculates the Transmit Power recommended by the recent history.
+
+        :return: the TXP index [int], or None if there is not enough data
+        """
+
+        if self.__txPower is None or self.__dr is None:
+            return None
+
+        # go back to the maximum power if the downlinks are failing
+        if len(self.__downlinks) >= 4 and sum(self.__downlinks) < len(self.__downlinks) / 2:
+            return 0
+
+        snr = self.__monitor.statistics("lorawan", self.__window)["snr"]
+        if snr is None:
+            return None
+
+        # the 10th percentile is used so that fades are taken into account
+        # (the same limit as DataRateOptimizer, so both judge the SNR in the same way)
+        surplus = snr["p10"] - requiredSNR(self.__dr) - self.__margin
+        best = 0
+        for txPower in range(1, self.__maxTxPower + 1):
+            reduction = MAX_OUTPUT_POWER - outputPower(txPower)
+            required = reduction
+            if txPower > self.__txPower:
+                required += self.__hysteresis
+            if surplus >= required:
+                best = txPower
+            else:
+                break
+
+        # a change that keeps the same output power is not worth the command
+        if outputPower(best) == outputPower(self.__txPower):
+            return self.__txPower
+
+        # lower the power one step at a time
+        if best > self.__txPower:
+            step = self.__txPower + 1
+            while step < best and outputPower(step) == outputPower(self.__txPower):
+                step += 1
+            best = step
+
+        return best
+
+    def update(self):
+        """This method applies the recommended Transmit Power with set_TxPower().
+
+        :return: the new TXP index [int], or None if it was not changed
+        """
+
+        txPower = self.target()
+        if txPower is None or txPower == self.__txPower:
+            return None
+
+        if self.__lorawan.set_TxPower(txPower) != CommandResponse.OK:
+            return None
+
+        self.__txPower = txPower
+        self.__changes += 1
+        self.__downlinks.clear()
+
+        return txPower
+
+    def report(self):
+        """This method gets the results of the controller.
+
+        :return: the current TXP index and output power, in [dBm], and the number of 
+        changes [dict]
+        """
+
+        return {
+            "txPower": self.__txPower,
+            "outputPower": None if self.__txPower is None else outputPower(self.__txPower),
+            "changes": self.__changes,
+        }
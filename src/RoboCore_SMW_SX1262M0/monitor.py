@@ -0,0 +1,276 @@
+#################################################################################################################
+
+# RoboCore SMW-SX1262M0 Library (Python) (v1.0)
+
+# Library to use the SMW-SX1262M0 LoRaWAN module.
+
+# Copyright 2023 RoboCore.
+
+
+# This file is part of the SMW-SX1262M0 library ("SMW-SX1262M0-lib").
+
+# "SMW-SX1262M0-lib" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# "SMW-SX1262M0-lib" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with "SMW-SX1262M0-lib". If not, see <https://www.gnu.org/licenses/>
+
+#################################################################################################################
+
+
+# Necessary libraries
+from array import array
+from math import isnan, nan
+from time import monotonic
+
+# NumPy is optional, it is only used to speed up the statistics
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class _LinkSeries:
+    """This class stores the samples of a link in fixed-size ring buffers."""
+
+    __slots__ = ("time", "rssi", "snr", "index", "count")
+
+    def __init__(self, size):
+        """This method is the constructor of the class.
+
+        :param size [int]: the number of samples kept
+        """
+
+        self.time = array("d", [nan]) * size
+        self.rssi = array("d", [nan]) * size
+        self.snr = array("d", [nan]) * size
+        self.index = 0  # position of the next sample
+        self.count = 0  # number of samples stored
+
+    def positions(self, window=None):
+        """This method gets the positions of the newest samples, from the oldest to the newest.
+
+        :param window [int]: the number of samples, or None for all (default = None)
+
+        :return: the positions [range] or [list]
+        """
+
+        size = len(self.time)
+        count = self.count if window is None else min(window, self.count)
+        start = self.index - count
+        if start >= 0:
+            return range(start, self.index)
+
+        return list(range(start % size, size)) + list(range(self.index))
+
+
+def percentile(values, percent):
+    """This function calculates a percentile with linear interpolation (like NumPy).
+
+    :param values [list]: the sorted values
+    :param percent [float]: the percentile (0-100)
+
+    :return: the percentile [float]
+    """
+
+    position = (len(values) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def _summary(times, values):
+    """This function calculates the statistics of a series (without NumPy).
+
+    :param times [list]: the time of each sample, in [s]
+    :param values [list]: the value of each sample (NaN if not read)
+
+    :return: the statistics [dict] or None if there is no sample
+    """
+
+    pairs = [(t, v) for t, v in zip(times, values) if not isnan(v)]
+    if not pairs:
+        return None
+
+    ordered = sorted(v for _, v in pairs)
+    count = len(pairs)
+    mean = sum(ordered) / count
+
+    # least squares slope, in [unit/s]
+    trend = 0.0
+    if count > 1:
+        meanTime = sum(t for t, _ in pairs) / count
+        variance = sum((t - meanTime) ** 2 for t, _ in pairs)
+        if variance:
+            trend = sum((t - meanTime) * (v - mean) for t, v in pairs) / variance
+
+    return {
+        "count": count,
+        "mean": mean,
+        "min": ordered[0],
+        "p10": percentile(ordered, 10),
+        "p50": percentile(ordered, 50),
+        "p90": percentile(ordered, 90),
+        "max": ordered[-1],
+        "trend": trend,
+    }
+
+
+def _summaryNumpy(times, values):
+    """This function calculates the statistics of a series with NumPy.
+
+    :param times [numpy.ndarray]: the time of each sample, in [s]
+    :param values [numpy.ndarray]: the value of each sample (NaN if not read)
+
+    :return: the statistics [dict] or None if there is no sample
+    """
+
+    valid = ~numpy.isnan(values)
+    times = times[valid]
+    values = values[valid]
+    if not len(values):
+        return None
+
+    p10, p50, p90 = numpy.percentile(values, (10, 50, 90))
+
+    # least squares slope, in [unit/s]
+    trend = 0.0
+    if len(values) > 1:
+        centered = times - times.mean()
+        variance = float(numpy.dot(centered, centered))
+        if variance:
+            trend = float(numpy.dot(centered, values - values.mean())) / variance
+
+    return {
+        "count": int(len(values)),
+        "mean": float(values.mean()),
+        "min": float(values.min()),
+        "p10": float(p10),
+        "p50": float(p50),
+        "p90": float(p90),
+        "max": float(values.max()),
+        "trend": trend,
+    }
+
+
+class LinkMonitor:
+    """This class keeps the recent RSSI and SNR of each link and calculates rolling statistics.
+
+    The samples come from the commands the application already sends (see attach()), so the 
+    monitor adds no round trip to the module.
+    """
+
+    def __init__(self, size=256):
+        """This method is the constructor of the class.
+
+        :param size [int]: the number of samples kept for each link (default = 256)
+        """
+
+        self.__size = size
+        self.__links = {}
+        self.__callbacks = {}  # function registered on each module
+
+    def attach(self, lorawan, link=None):
+        """This method records the RSSI and SNR read or received by a module.
+
+        :param lorawan [SMW_SX1262M0]: the module
+        :param link [str]: the name of the link, or None to use the source of the samples 
+        ("lorawan" or "p2p") (default = None)
+        """
+
+        def record(source, rssi, snr):
+            self.record(link if link is not None else source, rssi, snr)
+
+        self.detach(lorawan)
+        self.__callbacks[id(lorawan)] = record
+        lorawan.addCallback("link", record)
+
+    def detach(self, lorawan):
+        """This method stops recording the samples of a module.
+
+        :param lorawan [SMW_SX1262M0]: the module
+        """
+
+        record = self.__callbacks.pop(id(lorawan), None)
+        if record is not None:
+            lorawan.removeCallback("link", record)
+
+    def links(self):
+        """This method gets the name of the links with samples.
+
+        :return: the names [list]
+        """
+
+        return list(self.__links)
+
+    def record(self, link, rssi=None, snr=None, timestamp=None):
+        """This method stores a sample.
+
+        :param link [str]: the name of the link
+        :param rssi [int]: the RSSI, or None if not read (default = None)
+        :param snr [int]: the SNR, or None if not read (default = None)
+        :param timestamp [float]: the time of the sample, in [s] of time.monotonic(), 
+        or None for now (default = None)
+        """
+
+        series = self.__links.get(link)
+        if series is None:
+            series = self.__links[link] = _LinkSeries(self.__size)
+
+        index = series.index
+        series.time[index] = monotonic() if timestamp is None else timestamp
+        series.rssi[index] = nan if rssi is None else rssi
+        series.snr[index] = nan if snr is None else snr
+        series.index = (index + 1) % self.__size
+        series.count = min(series.count + 1, self.__size)
+
+    def series(self, link, window=None):
+        """This method gets the samples of a link, from the oldest to the newest.
+
+        :param link [str]: the name of the link
+        :param window [int]: the number of newest samples, or None for all (default = None)
+
+        :return: the time, the RSSI and the SNR of the samples [tuple] (NumPy arrays if NumPy is 
+        available, lists otherwise; NaN marks a value not read)
+        """
+
+        series = self.__links.get(link)
+        if series is None:
+            return ([], [], [])
+        positions = series.positions(window)
+
+        if numpy is not None:
+            # the ring buffers are viewed without copy, and the indexing copies only the samples 
+            # selected (so the result is not changed by the next samples)
+            positions = numpy.asarray(positions, dtype=numpy.intp)
+            return tuple(numpy.frombuffer(data, dtype=numpy.float64)[positions]
+                         for data in (series.time, series.rssi, series.snr))
+
+        return tuple([data[i] for i in positions] for data in (series.time, series.rssi, series.snr))
+
+    def statistics(self, link, window=None):
+        """This method calculates the statistics of a link.
+
+        :param link [str]: the name of the link
+        :param window [int]: the number of newest samples used, or None for all (default = None)
+
+        :return: the statistics of the RSSI and of the SNR [dict], each with the count, the mean, 
+        the minimum, the percentiles 10, 50 and 90, the maximum and the trend, in [unit/s] 
+        (None if there is no sample)
+        """
+
+        if link not in self.__links:
+            return {"rssi": None, "snr": None}
+
+        times, rssi, snr = self.series(link, window)
+        summary = _summaryNumpy if numpy is not None else _summary
+
+        return {"rssi": summary(times, rssi), "snr": summary(times, snr)}
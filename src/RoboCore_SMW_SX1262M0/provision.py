@@ -0,0 +1,276 @@
+#################################################################################################################
+
+# RoboCore SMW-SX1262M0 Library (Python) (v1.0)
+
+# Library to use the SMW-SX1262M0 LoRaWAN module.
+
+# Copyright 2023 RoboCore.
+
+
+# This file is part of the SMW-SX1262M0 library ("SMW-SX1262M0-lib").
+
+# "SMW-SX1262M0-lib" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# "SMW-SX1262M0-lib" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with "SMW-SX1262M0-lib". If not, see <https://www.gnu.org/licenses/>
+
+#################################################################################################################
+
+
+# Necessary libraries
+import argparse
+import csv
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from serial.tools import list_ports
+
+from .RoboCore_SMW_SX1262M0 import SMW_SX1262M0, CommandResponse
+
+# serial ports probed by discoverPorts() (the HAT uses /dev/serial0, USB adapters the others)
+PORT_PREFIXES = ("/dev/serial", "/dev/ttyUSB", "/dev/ttyACM", "/dev/ttyAMA", "COM")
+
+# columns of the report written by writeReport()
+REPORT_FIELDS = ("port", "devEUI", "result", "errors", "duration")
+
+
+def _key(devEUI):
+    """This function converts a Device EUI to the form used as key of the manifest.
+
+    :param devEUI [str]: the Device EUI (e.g. "00:11:22:33:44:55:66:77" or "0011223344556677")
+
+    :return: the key [str]
+    """
+
+    return str(devEUI).replace(":", "").strip().upper()
+
+
+def readManifest(filename):
+    """This function reads the configuration of each device from a CSV or JSON file.
+
+    :param filename [str]: the path of the manifest. A CSV file has a "DevEUI" column and one 
+    column for each configuration (see SMW_SX1262M0.SETTINGS). A JSON file has a list of 
+    objects with the same keys, or an object with the Device EUIs as keys.
+
+    :return: the configuration of each device [dict], with the Device EUI (without ":") as key
+
+    Note: empty cells and unknown columns are ignored. A row without a Device EUI, or with the 
+    Device EUI of a previous row, raises a ValueError with its number (the line of a CSV file, 
+    or the position in a JSON list, from 1).
+    """
+
+    with open(filename, newline="") as file:
+        if os.path.splitext(filename)[1].lower() == ".json":
+            devices = json.load(file)
+            if isinstance(devices, dict):
+                devices = [dict(settings, DevEUI=devEUI) if isinstance(settings, dict) else settings
+                           for devEUI, settings in devices.items()]
+            elif not isinstance(devices, list):
+                raise ValueError(f"{filename}: expected a list or an object of devices")
+            rows = enumerate(devices, 1)
+        else:
+            # the first line is the header
+            rows = list(enumerate(csv.DictReader(file), 2))
+
+    manifest = {}
+    for row, device in rows:
+        if not isinstance(device, dict):
+            raise ValueError(f"{filename}: row {row}: expected an object, not {device!r}")
+        devEUI = _key(device.get("DevEUI") or "")
+        if not devEUI:
+            raise ValueError(f"{filename}: row {row}: no DevEUI")
+        if devEUI in manifest:
+            raise ValueError(f"{filename}: row {row}: duplicate DevEUI {device['DevEUI']}")
+
+        settings = {name: value for name, value in device.items()
+                    if name in SMW_SX1262M0.SETTINGS and name != "DevEUI"
+                    and value not in (None, "")}
+        manifest[devEUI] = settings
+
+    return manifest
+
+
+def discoverPorts(prefixes=PORT_PREFIXES, workers=8):
+    """This function finds the serial ports with a module attached.
+
+    :param prefixes [tuple]: the beginning of the names of the ports to probe 
+    (default = PORT_PREFIXES)
+    :param workers [int]: the maximum number of ports probed at once (default = 8)
+
+    :return: the ports that responded to ping() [list]
+    """
+
+    candidates = sorted({port.device for port in list_ports.comports(include_links=True)
+                         if port.device.startswith(prefixes)})
+
+    def probe(port):
+        lorawan = SMW_SX1262M0(port)
+        try:
+            return lorawan.ping() == CommandResponse.OK
+        except OSError:
+            return False
+        finally:
+            lorawan.close()
+
+    if not candidates:
+        return []
+
+    with ThreadPoolExecutor(min(workers, len(candidates))) as executor:
+        found = list(executor.map(probe, candidates))
+
+    # the links (e.g. /dev/serial0) and their targets are the same module
+    ports = []
+    devices = set()
+    for port, ok in zip(candidates, found):
+        device = os.path.realpath(port)
+        if ok and device not in devices:
+            devices.add(device)
+            ports.append(port)
+
+    return ports
+
+
+def provisionPort(port, manifest, save=True, window=4):
+    """This function configures the module of a serial port with its entry of the manifest.
+
+    :param port: the serial port [str] or a transport object (see SMW_SX1262M0)
+    :param manifest [dict]: the configuration of each device (see readManifest())
+    :param save [bool]: True to save the configuration in the module (default = True)
+    :param window [int]: the maximum number of commands waiting for a response (default = 4)
+
+    :return: the port, the Device EUI, the result ("ok", "no response", "unknown device", 
+    "configuration error", "save error" or "verification error"), the configurations with 
+    errors [list] and the duration, in [ms] [dict]
+    """
+
+    lorawan = SMW_SX1262M0(port)
+    start = lorawan.millis()
+    report = {"port": str(port), "devEUI": None, "result": "ok", "errors": []}
+
+    try:
+        with lorawan.transaction():
+            report["result"] = _provision(lorawan, manifest, save, window, report)
+    except OSError:
+        report["result"] = "no response"
+    finally:
+        lorawan.close()
+
+    report["duration"] = lorawan.millis() - start
+
+    return report
+
+
+def _provision(lorawan, manifest, save, window, report):
+    """This function runs the steps of provisionPort().
+
+    :param lorawan [SMW_SX1262M0]: the module
+    :param manifest [dict]: the configuration of each device
+    :param save [bool]: True to save the configuration in the module
+    :param window [int]: the maximum number of commands waiting for a response
+    :param report [dict]: the report of the port, updated with the Device EUI and the errors
+
+    :return: the result [str]
+    """
+
+    # identify the module (no reset is needed)
+    status, devEUI = lorawan.get_DevEUI()
+    if status != CommandResponse.OK:
+        return "no response"
+    report["devEUI"] = devEUI
+    settings = manifest.get(_key(devEUI))
+    if settings is None:
+        return "unknown device"
+
+    # configure everything in a single pipeline
+    statuses = lorawan.configure(settings, window)
+    report["errors"] = [name for name, status in statuses.items() if status != CommandResponse.OK]
+    if report["errors"]:
+        return "configuration error"
+
+    if save and lorawan.save() != CommandResponse.OK:
+        return "save error"
+
+    # read back and compare
+    values = lorawan.readSettings(settings, window)
+    for name, value in settings.items():
+        status, stored = values[name]
+        if status != CommandResponse.OK or _key(stored) != _key(value):
+            report["errors"].append(name)
+    if report["errors"]:
+        return "verification error"
+
+    return "ok"
+
+
+def provisionAll(ports, manifest, save=True, window=4):
+    """This function configures the modules of several serial ports in parallel.
+
+    :param ports [list]: the serial ports
+    :param manifest [dict]: the configuration of each device (see readManifest())
+    :param save [bool]: True to save the configuration in the modules (default = True)
+    :param window [int]: the maximum number of commands waiting for a response (default = 4)
+
+    :return: the report of each port [list] (see provisionPort()), in the same order
+    """
+
+    if not ports:
+        return []
+
+    # each port has its own thread (the time is spent waiting for the modules)
+    with ThreadPoolExecutor(len(ports)) as executor:
+        return list(executor.map(lambda port: provisionPort(port, manifest, save, window), ports))
+
+
+def writeReport(reports, filename):
+    """This function writes the reports of provisionAll() to a CSV or JSON file.
+
+    :param reports [list]: the reports
+    :param filename [str]: the path of the file
+    """
+
+    with open(filename, "w", newline="") as file:
+        if os.path.splitext(filename)[1].lower() == ".json":
+            json.dump(reports, file, indent=2)
+            return
+
+        writer = csv.DictWriter(file, REPORT_FIELDS)
+        writer.writeheader()
+        for report in reports:
+            writer.writerow(dict(report, errors=" ".join(report["errors"])))
+
+
+# this condition will only be True if the file is executed directly
+# (e.g. python -m RoboCore_SMW_SX1262M0.provision devices.csv --report report.csv)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Configure several SMW-SX1262M0 modules at once.")
+    parser.add_argument("manifest", help="CSV or JSON file with the configuration of each DevEUI")
+    parser.add_argument("--ports", nargs="+", help="serial ports to use (default: discover them)")
+    parser.add_argument("--report", help="CSV or JSON file for the report")
+    parser.add_argument("--no-save", action="store_true", help="do not save the configuration")
+    parser.add_argument("--window", type=int, default=4, help="commands in flight per module")
+    args = parser.parse_args()
+
+    try:
+        manifest = readManifest(args.manifest)
+    except ValueError as exception:
+        parser.error(str(exception))
+    ports = args.ports or discoverPorts()
+    print(f"{len(manifest)} devices in the manifest, {len(ports)} modules found")
+
+    reports = provisionAll(ports, manifest, not args.no_save, args.window)
+    for report in reports:
+        errors = " ".join(report["errors"])
+        print(f"{report['port']:<16}{str(report['devEUI']):<26}{report['result']:<22}"
+              f"{report['duration']:>7} ms  {errors}")
+
+    if args.report:
+        writeReport(reports, args.report)
@@ -0,0 +1,211 @@
+#################################################################################################################
+
+# RoboCore SMW-SX1262M0 Library (Python) (v1.0)
+
+# Library to use the SMW-SX1262M0 LoRaWAN module.
+
+# Copyright 2023 RoboCore.
+
+
+# This file is part of the SMW-SX1262M0 library ("SMW-SX1262M0-lib").
+
+# "SMW-SX1262M0-lib" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# "SMW-SX1262M0-lib" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with "SMW-SX1262M0-lib". If not, see <https://www.gnu.org/licenses/>
+
+#################################################################################################################
+
+
+# Necessary libraries
+import re
+from types import MappingProxyType
+
+from .airtime import bitrate, timeOnAir
+
+# valid values of the LoRa parameters (SX1262)
+BANDWIDTHS = (125, 250, 500)  # [kHz]
+SPREADING_FACTORS = range(5, 13)
+CODING_RATES = range(1, 5)  # 4/5 to 4/8
+POWERS = range(-9, 23)  # [dBm]
+FREQUENCIES = range(150000, 960001)  # [kHz]
+
+
+class P2PConfig:
+    """This class stores the radio parameters of the P2P communication (AT+TCONF).
+
+    The parameters are sent in the order of FIELDS, separated by ":" 
+    (e.g. AT+TCONF=915200:14:125:7:1:8). A configuration cannot be changed, use replace() to 
+    create another one.
+    """
+
+    __slots__ = ("frequency", "power", "bandwidth", "sf", "cr", "preamble")
+
+    # order of the parameters of AT+TCONF (assumed from the order of the LoRa parameters in the 
+    # AT command set, check it with get_P2PConfig() on a new firmware version)
+    FIELDS = __slots__
+
+    def __init__(self, frequency=915200, power=14, bandwidth=125, sf=7, cr=1, preamble=8):
+        """This method is the constructor of the class.
+
+        :param frequency [int]: the frequency, in [kHz] (default = 915200)
+        :param power [int]: the output power, in [dBm] (-9 to 22) (default = 14)
+        :param bandwidth [int]: the bandwidth, in [kHz] (125, 250 or 500) (default = 125)
+        :param sf [int]: the spreading factor (5-12) (default = 7)
+        :param cr [int]: the coding rate (1-4 for 4/5-4/8) (default = 1)
+        :param preamble [int]: the number of preamble symbols (6-65535) (default = 8)
+        """
+
+        values = (frequency, power, bandwidth, sf, cr, preamble)
+        for name, value in zip(self.FIELDS, values):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("P2PConfig cannot be changed, use replace()")
+
+    def __delattr__(self, name):
+        raise AttributeError("P2PConfig cannot be changed, use replace()")
+
+    def __hash__(self):
+        return hash(tuple(getattr(self, name) for name in self.FIELDS))
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.FIELDS)
+        return f"P2PConfig({values})"
+
+    def __eq__(self, other):
+        if not isinstance(other, P2PConfig):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.FIELDS)
+
+    def errors(self):
+        """This method checks the parameters.
+
+        :return: the names of the invalid parameters [list] (empty if all are valid)
+        """
+
+        valid = {
+            "frequency": FREQUENCIES,
+            "power": POWERS,
+            "bandwidth": BANDWIDTHS,
+            "sf": SPREADING_FACTORS,
+            "cr": CODING_RATES,
+            "preamble": range(6, 65536),
+        }
+
+        return [name for name in self.FIELDS
+                if not isinstance(getattr(self, name), int) or getattr(self, name) not in valid[name]]
+
+    def bitrate(self):
+        """This method calculates the raw bit rate of the configuration.
+
+        :return: the bit rate, in [bit/s] [float]
+        """
+
+        return bitrate(self.sf, self.bandwidth, self.cr)
+
+    def timeOnAir(self, payloadSize):
+        """This method calculates the time on air of a frame.
+
+        :param payloadSize [int]: the size of the payload, in [bytes]
+
+        :return: the time on air, in [ms] [float]
+        """
+
+        return timeOnAir(payloadSize, self.sf, self.bandwidth, self.cr, self.preamble)
+
+    def replace(self, **changes):
+        """This method creates a copy of the configuration with some parameters changed.
+
+        :param changes: the new values (e.g. frequency=916000)
+
+        :return: the new configuration [P2PConfig]
+        """
+
+        values = {name: getattr(self, name) for name in self.FIELDS}
+        values.update(changes)
+
+        return P2PConfig(**values)
+
+    def toParameter(self):
+        """This method converts the configuration to the parameter of AT+TCONF.
+
+        :return: the parameter [str]
+        """
+
+        return ":".join(str(getattr(self, name)) for name in self.FIELDS)
+
+    @classmethod
+    def fromResponse(cls, response):
+        """This method reads the configuration from the response of AT+TCONF=?.
+
+        :param response [str]: the response, with the values in a single line separated by ":" 
+        or one value per line (e.g. "Freq= 915200000 Hz")
+
+        :return: the configuration [P2PConfig], or None if it could not be read
+        """
+
+        lines = [line.strip() for line in response.splitlines() if line.strip()]
+
+        # a single line with all the values
+        for line in lines:
+            values = line.split(":")
+            if len(values) == len(cls.FIELDS) and all(re.fullmatch(r"-?\d+", v.strip()) for v in values):
+                return cls(*(int(value) for value in values))
+
+        # one value per line
+        patterns = {
+            "frequency": r"freq\w*\s*=\s*(\d+)",
+            "power": r"power\s*=\s*(-?\d+)",
+            "bandwidth": r"bandwidth\s*=\s*(\d+)",
+            "sf": r"\bsf\s*=\s*(\d+)",
+            "cr": r"\bcr\s*=\s*4/(\d)",
+            "preamble": r"preamble\w*\s*=\s*(\d+)",
+        }
+        values = {}
+        for line in lines:
+            for name, pattern in patterns.items():
+                match = re.search(pattern, line, re.IGNORECASE)
+                if match and name not in values:
+                    values[name] = int(match.group(1))
+        if not {"frequency", "bandwidth", "sf"} <= values.keys():
+            return None
+
+        if values["frequency"] > FREQUENCIES[-1]:
+            values["frequency"] //= 1000  # [Hz]
+        if "cr" in values:
+            values["cr"] -= 4
+
+        return cls(**values)
+
+
+# configurations from the longest range to the highest throughput (read-only)
+P2P_PRESETS = MappingProxyType({
+
+    "maxRange": P2PConfig(sf=12, bandwidth=125, cr=4, power=22),
+    "longRange": P2PConfig(sf=10, bandwidth=125, cr=1, power=22),
+    "balanced": P2PConfig(sf=9, bandwidth=125, cr=1),
+    "fast": P2PConfig(sf=7, bandwidth=250, cr=1),
+    "maxThroughput": P2PConfig(sf=5, bandwidth=500, cr=1, power=10),
+
+})
+
+
+def presetReport(payloadSize=16):
+    """This function calculates the bit rate and the time on air of each preset.
+
+    :param payloadSize [int]: the size of the payload, in [bytes] (default = 16)
+
+    :return: the bit rate, in [bit/s], and the time on air, in [ms], of each preset [dict]
+    """
+
+    return {name: {"bitrate": config.bitrate(), "timeOnAir": config.timeOnAir(payloadSize)}
+            for name, config in P2P_PRESETS.items()}
@@ -0,0 +1,291 @@
+#################################################################################################################
+
+# RoboCore SMW-SX1262M0 Library (Python) (v1.0)
+
+# Library to use the SMW-SX1262M0 LoRaWAN module.
+
+# Copyright 2023 RoboCore.
+
+
+# This file is part of the SMW-SX1262M0 library ("SMW-SX1262M0-lib").
+
+# "SMW-SX1262M0-lib" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# "SMW-SX1262M0-lib" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with "SMW-SX1262M0-lib". If not, see <https://www.gnu.org/licenses/>
+
+#################################################################################################################
+
+
+# Necessary libraries
+import random
+import threading
+from math import exp, log10
+from time import monotonic, sleep
+
+from .airtime import REQUIRED_SNR
+from .radio import P2PConfig
+
+NOISE_FIGURE = 6  # noise figure of the receiver, in [dB]
+
+
+class SimulatedAir:
+    """This class simulates the radio channel between SimulatedModule objects.
+
+    The RSSI follows the log-distance path loss (free space at 1 m) with log-normal shadowing, 
+    the SNR is the RSSI over the thermal noise of the bandwidth, and a frame is received with 
+    a probability that rises from 0 to 1 around the demodulation limit of its spreading factor.
+    """
+
+    def __init__(self, distance=100.0, exponent=2.7, shadowing=4.0, timeScale=1.0, seed=None):
+        """This method is the constructor of the class.
+
+        :param distance [float]: the distance between the modules, in [m] (default = 100.0)
+        :param exponent [float]: the path loss exponent (2 in free space) (default = 2.7)
+        :param shadowing [float]: the standard deviation of the shadowing, in [dB] 
+        (default = 4.0)
+        :param timeScale [float]: the factor applied to the time on air and to the response 
+        time of the modules (0 for no delay) (default = 1.0)
+        :param seed [int]: the seed of the random numbers, or None (default = None)
+        """
+
+        self.distance = distance
+        self.exponent = exponent
+        self.shadowing = shadowing
+        self.timeScale = timeScale
+        self.random = random.Random(seed)
+        self.__modules = []
+        self.__lock = threading.Lock()
+
+    def attach(self, module):
+        """This method places a module in the channel.
+
+        :param module [SimulatedModule]: the module
+        """
+
+        with self.__lock:
+            self.__modules.append(module)
+
+    def transmit(self, sender, config, message):
+        """This method sends a frame to the modules that are listening with the same parameters.
+
+        :param sender [SimulatedModule]: the transmitter
+        :param config [P2PConfig]: the radio parameters of the transmitter
+        :param message [str]: the message
+        """
+
+        arrival = monotonic() + config.timeOnAir(len(message)) / 1000 * self.timeScale
+        with self.__lock:
+            receivers = [module for module in self.__modules if module is not sender]
+
+        for receiver in receivers:
+            listening = receiver.listening
+            if listening is None:
+                continue
+            if (listening.frequency, listening.sf, listening.bandwidth) != \
+                    (config.frequency, config.sf, config.bandwidth):
+                continue
+
+            rssi, snr = self.link(config)
+            # probability of demodulation (about 0.5 at the limit, ~1 at 3 dB above it)
+            margin = snr - REQUIRED_SNR[config.sf]
+            if self.random.random() < 1 / (1 + exp(-2 * margin)):
+                receiver.receive(arrival, message, round(rssi), round(snr))
+
+    def link(self, config):
+        """This method draws the RSSI and the SNR of a frame.
+
+        :param config [P2PConfig]: the radio parameters
+
+        :return: the RSSI, in [dBm] [float], and the SNR, in [dB] [float]
+        """
+
+        frequency = config.frequency / 1000  # [MHz]
+        pathLoss = (20 * log10(frequency) - 27.55
+                    + 10 * self.exponent * log10(max(self.distance, 1)))
+        rssi = config.power - pathLoss + self.random.gauss(0, self.shadowing)
+        noise = -174 + 10 * log10(config.bandwidth * 1000) + NOISE_FIGURE  # [dBm]
+
+        # the RSSI cannot go below the noise floor (the SNR can)
+        return max(rssi, noise), rssi - noise
+
+
+class SimulatedModule:
+    """This class simulates an SMW-SX1262M0 module attached to a SimulatedAir, and can be 
+    given to SMW_SX1262M0 instead of a serial port (e.g. SMW_SX1262M0(SimulatedModule(air))).
+
+    The P2P commands (TCONF, TXLRA, RXLRA and TOFF) use the channel (a continuous transmission 
+    sends a single frame); the other commands only store and return their values. Each command 
+    runs when its last byte would arrive through the serial port, so write() takes the time of 
+    the bytes written.
+    """
+
+    RESPONSE_TIME = 0.005  # [s]
+
+    def __init__(self, air, name="module", baudrate=9600):
+        """This method is the constructor of the class.
+
+        :param air [SimulatedAir]: the channel
+        :param name [str]: the name of the module (default = "module")
+        :param baudrate [int]: the baud rate of the serial port, or None to run the commands 
+        as soon as they are written (default = 9600)
+        """
+
+        self.name = name
+        self.baudrate = baudrate
+        self.is_open = True
+        self.config = P2PConfig()
+        self.listening = None  # radio parameters while receiving
+        self.__air = air
+        self.__continuous = False
+        self.__state = {"DEUI": "00:00:00:00:00:00:00:00", "VER": "SIMULATOR", "NJS": "0"}
+        self.__received = bytearray()
+        self.__scheduled = []  # (time, bytes) not delivered yet
+        self.__lock = threading.Lock()
+        air.attach(self)
+
+    @property
+    def in_waiting(self):
+        """This property gets the number of bytes available to read.
+
+        :return: the number of bytes [int]
+        """
+
+        now = monotonic()
+        with self.__lock:
+            while self.__scheduled and self.__scheduled[0][0] <= now:
+                self.__received += self.__scheduled.pop(0)[1]
+
+            return len(self.__received)
+
+    def readinto(self, buffer):
+        """This method reads the available bytes into a buffer.
+
+        :param buffer: the buffer to fill [bytearray] or [memoryview]
+
+        :return: the number of bytes read [int]
+        """
+
+        with self.__lock:
+            count = min(len(buffer), len(self.__received))
+            buffer[:count] = self.__received[:count]
+            del self.__received[:count]
+
+        return count
+
+    def write(self, data):
+        """This method runs the commands sent to the module.
+
+        :param data [bytes]: the command lines
+
+        :return: the number of bytes written [int]
+        """
+
+        for line in bytes(data).decode(errors="ignore").splitlines(keepends=True):
+            # 10 bits per byte (start, 8 data bits and stop)
+            if self.baudrate:
+                sleep(len(line) * 10 / self.baudrate * self.__air.timeScale)
+            if line.strip():
+                self.__command(line.strip())
+
+        return len(data)
+
+    def reset_input_buffer(self):
+        """This method discards the bytes not read."""
+
+        with self.__lock:
+            self.__received.clear()
+
+    def open(self):
+        """This method opens the connection."""
+
+        self.is_open = True
+
+    def close(self):
+        """This method closes the connection."""
+
+        self.is_open = False
+
+    def receive(self, arrival, message, rssi, snr):
+        """This method delivers a frame received from the channel.
+
+        :param arrival [float]: the time of the end of the frame, in [s] of time.monotonic()
+        :param message [str]: the message
+        :param rssi [int]: the RSSI, in [dBm]
+        :param snr [int]: the SNR, in [dB]
+        """
+
+        if not self.__continuous:
+            self.listening = None
+        self.__schedule(f"\r\nRX: RSSI={rssi} SNR={snr} Text-> {message}\n\r", arrival)
+
+    def __schedule(self, text, when=None):
+        """This method queues bytes to be read by the driver.
+
+        :param text [str]: the bytes
+        :param when [float]: the time they arrive, in [s] of time.monotonic(), or None for the 
+        response time of the module (default = None)
+        """
+
+        if when is None:
+            when = monotonic() + self.RESPONSE_TIME * self.__air.timeScale
+        with self.__lock:
+            self.__scheduled.append((when, text.encode()))
+            self.__scheduled.sort(key=lambda item: item[0])
+
+    def __command(self, line):
+        """This method runs a command.
+
+        :param line [str]: the command (e.g. "AT+TCONF=?")
+        """
+
+        if line in ("AT", "ATZ"):
+            if line == "ATZ":
+                self.listening = None
+            self.__schedule("\r\nOK\r\n")
+            return
+        if not line.startswith("AT+"):
+            self.__schedule("\r\nAT_ERROR\r\n")
+            return
+
+        name, _, parameter = line[3:].partition("=")
+        if name == "TCONF" and parameter == "?":
+            self.__schedule(f"\r\n{self.config.toParameter()}\r\nOK\r\n")
+        elif name == "TCONF":
+            config = P2PConfig.fromResponse(parameter)
+            if config is None or config.errors():
+                self.__schedule("\r\nAT_PARAM_ERROR\r\n")
+                return
+            self.config = config
+            self.__schedule("\r\nOK\r\n")
+        elif name == "RXLRA":
+            frequency, _, mode = parameter.partition(":")
+            self.config = self.config.replace(frequency=int(frequency))
+            self.__continuous = mode == "1"
+            self.listening = self.config
+            self.__schedule("\r\nOK\r\n")
+        elif name == "TXLRA":
+            frequency, _, rest = parameter.partition(":")
+            _, _, message = rest.partition(":")
+            self.config = self.config.replace(frequency=int(frequency))
+            self.listening = None
+            self.__schedule("\r\nOK\r\n")
+            self.__air.transmit(self, self.config, message)
+        elif name == "TOFF":
+            self.listening = None
+            self.__schedule("\r\nOK\r\n")
+        elif parameter == "?":
+            self.__schedule(f"\r\n{self.__state.get(name, '')}\r\nOK\r\n")
+        elif parameter:
+            self.__state[name] = parameter
+            self.__schedule("\r\nOK\r\n")
+        else:
+            self.__schedule("\r\nOK\r\n")
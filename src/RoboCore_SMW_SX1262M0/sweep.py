@@ -0,0 +1,262 @@
+#################################################################################################################
+
+# RoboCore SMW-SX1262M0 Library (Python) (v1.0)
+
+# Library to use the SMW-SX1262M0 LoRaWAN module.
+
+# Copyright 2023 RoboCore.
+
+
+# This file is part of the SMW-SX1262M0 library ("SMW-SX1262M0-lib").
+
+# "SMW-SX1262M0-lib" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# "SMW-SX1262M0-lib" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with "SMW-SX1262M0-lib". If not, see <https://www.gnu.org/licenses/>
+
+#################################################################################################################
+
+
+# Necessary libraries
+import argparse
+import itertools
+import string
+
+from .RoboCore_SMW_SX1262M0 import SMW_SX1262M0, CommandResponse
+from .monitor import percentile
+from .radio import P2PConfig
+from .simulator import SimulatedAir, SimulatedModule
+
+# extra time to wait for a frame after its time on air, in [ms]
+LISTEN_GUARD = 300
+
+
+class P2PSweep:
+    """This class measures the P2P link between two modules for several radio configurations.
+
+    For each configuration, both modules are configured with set_P2PConfig(), the receiver 
+    listens continuously and the transmitter sends numbered frames one at a time. The frames 
+    received give the packet error rate (PER), the RSSI and SNR distribution and the goodput 
+    (payload bits received per second of the test, including the time of the commands).
+    """
+
+    def __init__(self, transmitter, receiver, frames=20, base=None):
+        """This method is the constructor of the class.
+
+        :param transmitter [SMW_SX1262M0]: the module that sends the frames
+        :param receiver [SMW_SX1262M0]: the module that receives the frames
+        :param frames [int]: the number of frames sent for each configuration (default = 20)
+        :param base [P2PConfig]: the parameters that are not swept (e.g. power), or None to use 
+        the defaults of P2PConfig (default = None)
+        """
+
+        self.__transmitter = transmitter
+        self.__receiver = receiver
+        self.__frames = frames
+        self.__base = P2PConfig() if base is None else base
+
+    def run(self, frequencies=(915200,), sfs=(7, 9, 12), bandwidths=(125, 500), payloadSizes=(16,),
+            callback=None):
+        """This method tests every combination of the parameters.
+
+        :param frequencies [list]: the frequencies, in [kHz] (default = (915200,))
+        :param sfs [list]: the spreading factors (default = (7, 9, 12))
+        :param bandwidths [list]: the bandwidths, in [kHz] (default = (125, 500))
+        :param payloadSizes [list]: the sizes of the payload, in [bytes] (default = (16,))
+        :param callback [function]: function(result) called after each configuration 
+        (default = None)
+
+        :return: the results [list] (see measure())
+        """
+
+        results = []
+        for frequency, sf, bandwidth, size in itertools.product(frequencies, sfs, bandwidths,
+                                                                payloadSizes):
+            config = self.__base.replace(frequency=frequency, sf=sf, bandwidth=bandwidth)
+            result = self.measure(config, size)
+            results.append(result)
+            if callback is not None:
+                callback(result)
+
+        return results
+
+    def measure(self, config, payloadSize):
+        """This method tests a configuration.
+
+        :param config [P2PConfig]: the radio parameters
+        :param payloadSize [int]: the size of the payload, in [bytes] (at least 4)
+
+        :return: the parameters, the number of frames sent and received, the PER, the RSSI and 
+        SNR statistics (mean, min, p10, p50, p90, max), the goodput, in [bit/s], and the time on 
+        air, in [ms] [dict]
+        """
+
+        tx, rx = self.__transmitter, self.__receiver
+        result = {"frequency": config.frequency, "sf": config.sf, "bandwidth": config.bandwidth,
+                  "payloadSize": payloadSize, "sent": 0, "received": 0, "per": None,
+                  "rssi": None, "snr": None, "goodput": 0.0, "timeOnAir": config.timeOnAir(payloadSize),
+                  "error": None}
+
+        for module in (tx, rx):
+            status = module.set_P2PConfig(config)
+            if status != CommandResponse.OK:
+                result["error"] = f"set_P2PConfig: {CommandResponse(status).name}"
+                return result
+
+        status = rx.P2P_start(config.frequency, continuous=True)
+        if status != CommandResponse.OK:
+            result["error"] = f"P2P_start: {CommandResponse(status).name}"
+            return result
+
+        received = set()
+        rssi = []
+        snr = []
+        timeout = round(result["timeOnAir"]) + LISTEN_GUARD
+        start = tx.millis()
+        for sequence in range(self.__frames):
+            message = self.__message(sequence, payloadSize)
+            if tx.P2P_start(config.frequency, False, message) != CommandResponse.OK:
+                continue
+            result["sent"] += 1
+
+            frame = rx.P2P_listen(timeout)
+            if frame and frame[0][:4].isdigit():
+                received.add(int(frame[0][:4]))
+                rssi.append(frame[1])
+                snr.append(frame[2])
+        elapsed = max(tx.millis() - start, 1)
+
+        for module in (tx, rx):
+            module.P2P_stop()
+
+        result["received"] = len(received)
+        if result["sent"]:
+            result["per"] = 1 - len(received) / result["sent"]
+        result["rssi"] = _statistics(rssi)
+        result["snr"] = _statistics(snr)
+        result["goodput"] = len(received) * payloadSize * 8 / (elapsed / 1000)
+
+        return result
+
+    @staticmethod
+    def __message(sequence, payloadSize):
+        """This method creates the text of a frame.
+
+        :param sequence [int]: the number of the frame
+        :param payloadSize [int]: the size of the payload, in [bytes]
+
+        :return: the message [str], starting with the number of the frame
+        """
+
+        fill = string.ascii_uppercase * (payloadSize // 26 + 1)
+
+        return (f"{sequence % 10000:04d}" + fill)[:max(payloadSize, 4)]
+
+
+def _statistics(values):
+    """This function summarizes a list of measurements.
+
+    :param values [list]: the values
+
+    :return: the mean, the minimum, the 10th, 50th and 90th percentiles and the maximum [dict], 
+    or None if the list is empty
+    """
+
+    if not values:
+        return None
+
+    values = sorted(values)
+
+    return {
+        "mean": sum(values) / len(values),
+        "min": values[0],
+        "p10": percentile(values, 10),
+        "p50": percentile(values, 50),
+        "p90": percentile(values, 90),
+        "max": values[-1],
+    }
+
+
+def best(results, targetPER=0.1):
+    """This function chooses the configuration with the highest goodput within a target PER.
+
+    :param results [list]: the results of P2PSweep.run()
+    :param targetPER [float]: the maximum packet error rate (default = 0.1)
+
+    :return: the result [dict], or None if no configuration reached the target
+    """
+
+    valid = [result for result in results if result["per"] is not None and result["per"] <= targetPER]
+
+    return max(valid, key=lambda result: result["goodput"], default=None)
+
+
+def formatTable(results):
+    """This function formats the results as a text table.
+
+    :param results [list]: the results of P2PSweep.run()
+
+    :return: the table [str]
+    """
+
+    lines = [f"{'freq':>7}{'SF':>4}{'BW':>5}{'size':>6}{'sent':>6}{'rcvd':>6}{'PER':>7}"
+             f"{'RSSI':>7}{'SNR p10':>9}{'SNR p50':>9}{'goodput':>10}{'ToA':>9}"]
+    for result in results:
+        rssi = f"{result['rssi']['mean']:>7.1f}" if result["rssi"] else f"{'-':>7}"
+        snr = (f"{result['snr']['p10']:>9.1f}{result['snr']['p50']:>9.1f}" if result["snr"]
+               else f"{'-':>9}{'-':>9}")
+        per = f"{result['per']:>7.2f}" if result["per"] is not None else f"{'-':>7}"
+        lines.append(f"{result['frequency']:>7}{result['sf']:>4}{result['bandwidth']:>5}"
+                     f"{result['payloadSize']:>6}{result['sent']:>6}{result['received']:>6}{per}"
+                     f"{rssi}{snr}{result['goodput']:>10.1f}{result['timeOnAir']:>9.1f}")
+
+    return "\n".join(lines)
+
+
+# this condition will only be True if the file is executed directly
+# (e.g. python -m RoboCore_SMW_SX1262M0.sweep /dev/ttyUSB0 /dev/ttyUSB1 --sf 7 9 12)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the P2P link for several configurations.")
+    parser.add_argument("transmitter", nargs="?", help="serial port of the transmitter")
+    parser.add_argument("receiver", nargs="?", help="serial port of the receiver")
+    parser.add_argument("--simulate", type=float, metavar="DISTANCE",
+                        help="use two simulated modules at this distance, in [m]")
+    parser.add_argument("--frequency", type=int, nargs="+", default=[915200], help="[kHz]")
+    parser.add_argument("--sf", type=int, nargs="+", default=[7, 9, 12])
+    parser.add_argument("--bw", type=int, nargs="+", default=[125, 500], help="[kHz]")
+    parser.add_argument("--size", type=int, nargs="+", default=[16], help="payload size [bytes]")
+    parser.add_argument("--frames", type=int, default=20, help="frames per configuration")
+    parser.add_argument("--power", type=int, default=14, help="[dBm]")
+    parser.add_argument("--per", type=float, default=0.1, help="target packet error rate")
+    args = parser.parse_args()
+
+    if args.simulate is not None:
+        air = SimulatedAir(distance=args.simulate)
+        transmitter = SMW_SX1262M0(SimulatedModule(air, "transmitter"))
+        receiver = SMW_SX1262M0(SimulatedModule(air, "receiver"))
+    elif args.transmitter and args.receiver:
+        transmitter = SMW_SX1262M0(args.transmitter)
+        receiver = SMW_SX1262M0(args.receiver)
+    else:
+        parser.error("give the ports of the transmitter and the receiver, or --simulate")
+
+    sweep = P2PSweep(transmitter, receiver, args.frames, P2PConfig(power=args.power))
+    results = sweep.run(args.frequency, args.sf, args.bw, args.size,
+                        callback=lambda result: print(formatTable([result]).splitlines()[1]))
+    print()
+    print(formatTable(results))
+
+    choice = best(results, args.per)
+    if choice is None:
+        print(f"\nNo configuration reached PER <= {args.per}")
+    else:
+        print(f"\nBest for PER <= {args.per}: SF{choice['sf']} / {choice['bandwidth']} kHz / "
+              f"{choice['frequency']} kHz ({choice['goodput']:.1f} bit/s)")
@@ -0,0 +1,542 @@
+#################################################################################################################
+
+# RoboCore SMW-SX1262M0 Library (Python) (v1.0)
+
+# Library to use the SMW-SX1262M0 LoRaWAN module.
+
+# Copyright 2023 RoboCore.
+
+
+# This file is part of the SMW-SX1262M0 library ("SMW-SX1262M0-lib").
+
+# "SMW-SX1262M0-lib" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# "SMW-SX1262M0-lib" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with "SMW-SX1262M0-lib". If not, see <https://www.gnu.org/licenses/>
+
+#################################################################################################################
+
+
+# Necessary libraries
+import struct
+import threading
+from math import e
+from time import monotonic_ns, sleep
+
+from .RoboCore_SMW_SX1262M0 import CommandResponse
+from .radio import P2PConfig
+
+# frames: [BEACON] [turnaround] [slot 0] [slot 1] ... [slot n - 1] [turnaround] [BEACON] ...
+# beacon: kind, network, number of slots, sequence, turnaround, guard, slot and frame time [µs]
+BEACON = struct.Struct("<BBBHIIII")
+# data: kind, network and slot, followed by the payload
+DATA = struct.Struct("<BBB")
+KIND_BEACON = 0xB5
+KIND_DATA = 0xDA
+
+JITTER = 10  # uncertainty of each timestamp (serial port and thread scheduling), in [ms]
+DRIFT = 50e-6  # frequency error of the clocks
+MODULE_LATENCY = 0  # processing time of the module for a frame, in [ms]
+HOLDOVER = 4  # number of frames a node can use without receiving a new beacon
+LISTEN_MARGIN = 2  # time to stop listening before a transmission, in [ms]
+SEND_MARGIN = 10  # delay of a thread that wakes up to transmit (on a busy computer), in [ms]
+
+ALOHA_EFFICIENCY = 1 / (2 * e)  # maximum use of the channel with random access (pure ALOHA)
+
+
+def _commandTime(frequency, size, baudrate, latency):
+    """This function estimates the time from the call of P2P_send() to the start of the 
+    transmission.
+
+    :param frequency [int]: the frequency, in [kHz]
+    :param size [int]: the size of the data, in [bytes]
+    :param baudrate [int]: the baud rate of the serial port, or None to ignore the time to write 
+    the command
+    :param latency [float]: the processing time of the module, in [ms]
+
+    :return: the time, in [ns] [int]
+    """
+
+    length = len(f"AT+TXLRA={frequency}:0:") + 2 * size + 1  # the data is sent in hexadecimal
+    write = length * 10 / baudrate * 1000 if baudrate else 0  # 10 bits per byte, in [ms]
+
+    return round((write + latency) * 1e6)
+
+
+def _sleepUntil(deadline):
+    """This function waits until a time.
+
+    :param deadline [int]: the time, in [ns] of time.monotonic_ns()
+    """
+
+    remaining = deadline - monotonic_ns()
+    if remaining > 0:
+        sleep(remaining / 1e9)
+
+
+class TDMASchedule:
+    """This class is the timing of a TDMA frame: a beacon followed by a fixed number of slots. 
+    The times are relative to the end of the beacon (the reference), which every node can 
+    measure with the timestamp of the reception.
+    """
+
+    def __init__(self, slots, slotTime, guard, frameTime=None, turnaround=0):
+        """This method is the constructor of the class.
+
+        :param slots [int]: the number of slots
+        :param slotTime [float]: the time of each slot (a transmission and a guard), in [ms]
+        :param guard [float]: the time between transmissions, in [ms]
+        :param frameTime [float]: the time from a beacon to the next, in [ms], or None for the 
+        slots only (default = None)
+        :param turnaround [float]: the time to set a module as receiver after it transmits, 
+        in [ms] (default = 0)
+        """
+
+        self.slots = slots
+        self.slotTime = slotTime
+        self.guard = guard
+        self.turnaround = turnaround
+        self.frameTime = 2 * turnaround + guard + slots * slotTime if frameTime is None else frameTime
+
+    def __repr__(self):
+        return (f"TDMASchedule(slots={self.slots}, slotTime={self.slotTime:.1f}, "
+                f"guard={self.guard:.1f}, frameTime={self.frameTime:.1f}, "
+                f"turnaround={self.turnaround:.1f})")
+
+    @classmethod
+    def design(cls, slots, payloadSize=16, config=None, baudrate=9600, latency=MODULE_LATENCY,
+               holdover=HOLDOVER, margin=SEND_MARGIN):
+        """This method calculates the schedule for a payload size, with the guard time derived 
+        from the time on air (the clocks drift during the frames a node uses without a beacon) 
+        and from the delay of the transmissions.
+
+        :param slots [int]: the number of slots (1 to 255)
+        :param payloadSize [int]: the maximum size of the payload, in [bytes] (default = 16)
+        :param config [P2PConfig]: the radio parameters, or None for the defaults (default = None)
+        :param baudrate [int]: the baud rate of the serial port, or None (default = 9600)
+        :param latency [float]: the processing time of the module, in [ms] 
+        (default = MODULE_LATENCY)
+        :param holdover [int]: the number of frames a node can use after a beacon 
+        (default = HOLDOVER)
+        :param margin [float]: the maximum delay of a transmission, in [ms] (see the "late" 
+        metric of TDMANode) (default = SEND_MARGIN)
+
+        :return: the schedule [TDMASchedule]
+        """
+
+        config = config or P2PConfig()
+        beaconTime = config.timeOnAir(2 * BEACON.size)  # hexadecimal on the air
+        dataTime = config.timeOnAir(2 * (DATA.size + payloadSize))
+
+        # uncertainty of both timestamps (including a byte of the serial port), delay of the 
+        # transmission and drift
+        byteTime = 10 / baudrate * 1000 if baudrate else 0
+        drift = DRIFT * holdover
+        guard = (2 * (JITTER + byteTime) + margin + drift * (beaconTime + slots * dataTime)) / \
+            (1 - drift * (slots + 1))
+        slotTime = dataTime + guard
+        # the module of the coordinator (after the beacon) or of the last node (before the next 
+        # beacon) must be set as receiver again
+        turnaround = (len(f"AT+RXLRA={config.frequency}:1") + 1) * byteTime + latency + JITTER
+
+        return cls(slots, slotTime, guard, beaconTime + 2 * turnaround + guard + slots * slotTime,
+                   turnaround)
+
+    def slotStart(self, reference, slot):
+        """This method calculates the start of a slot.
+
+        :param reference [int]: the end of the beacon, in [ns] of time.monotonic_ns()
+        :param slot [int]: the slot
+
+        :return: the time, in [ns] of time.monotonic_ns() [int]
+        """
+
+        return reference + round((self.turnaround + self.guard + slot * self.slotTime) * 1e6)
+
+    def slotOf(self, reference, start):
+        """This method finds the slot of a transmission.
+
+        :param reference [int]: the end of the beacon, in [ns] of time.monotonic_ns()
+        :param start [int]: the start of the transmission, in [ns] of time.monotonic_ns()
+
+        :return: the slot [int], or None if outside the slots
+        """
+
+        # a transmission on time starts a guard after its slot (up to half a guard early is accepted)
+        offset = (start - reference) / 1e6 - self.turnaround - self.guard / 2
+        slot = int(offset // self.slotTime)
+
+        return slot if 0 <= slot < self.slots else None
+
+    def efficiency(self, payloadSize, config=None):
+        """This method calculates the fraction of the time of the channel used by data when 
+        every slot is used (at most ALOHA_EFFICIENCY, about 18 %, with random access).
+
+        :param payloadSize [int]: the size of the payload, in [bytes]
+        :param config [P2PConfig]: the radio parameters, or None for the defaults (default = None)
+
+        :return: the efficiency, from 0 to 1 [float]
+        """
+
+        config = config or P2PConfig()
+
+        return self.slots * config.timeOnAir(2 * (DATA.size + payloadSize)) / self.frameTime
+
+    def toBeacon(self, network, sequence):
+        """This method creates a beacon.
+
+        :param network [int]: the identifier of the network (0 to 255)
+        :param sequence [int]: the number of the frame
+
+        :return: the data of the beacon [bytes]
+        """
+
+        return BEACON.pack(KIND_BEACON, network, self.slots, sequence % 0x10000,
+                           round(self.turnaround * 1000), round(self.guard * 1000), round(self.slotTime * 1000),
+                           round(self.frameTime * 1000))
+
+    @classmethod
+    def fromBeacon(cls, data):
+        """This method reads a beacon.
+
+        :param data [bytes]: the data received
+
+        :return: the network [int], the sequence [int] and the schedule [TDMASchedule], 
+        or None if the data is not a beacon
+        """
+
+        if len(data) != BEACON.size or data[0] != KIND_BEACON:
+            return None
+        _, network, slots, sequence, turnaround, guard, slotTime, frameTime = BEACON.unpack(data)
+
+        return network, sequence, cls(slots, slotTime / 1000, guard / 1000, frameTime / 1000,
+                                      turnaround / 1000)
+
+
+class TDMACoordinator:
+    """This class sends the beacons of a TDMA network and receives the frames of the nodes 
+    (see TDMANode).
+
+    Example: coordinator = TDMACoordinator(lorawan, slots=8, callback=print)
+             coordinator.run()  # until coordinator.stop() is called
+    """
+
+    def __init__(self, lorawan, slots, payloadSize=16, config=None, network=0, baudrate=9600,
+                 latency=MODULE_LATENCY, holdover=HOLDOVER, margin=SEND_MARGIN, callback=None):
+        """This method is the constructor of the class.
+
+        :param lorawan [SMW_SX1262M0]: the module
+        :param slots [int]: the number of slots (1 to 255)
+        :param payloadSize [int]: the maximum size of the payload, in [bytes] (default = 16)
+        :param config [P2PConfig]: the radio parameters (already set in the modules, see 
+        set_P2PConfig()), or None for the defaults (default = None)
+        :param network [int]: the identifier of the network (0 to 255) (default = 0)
+        :param baudrate [int]: the baud rate of the serial port, or None (default = 9600)
+        :param latency [float]: the processing time of the module, in [ms] 
+        (default = MODULE_LATENCY)
+        :param holdover [int]: the number of frames a node can use after a beacon 
+        (default = HOLDOVER)
+        :param margin [float]: the maximum delay of a transmission, in [ms] 
+        (default = SEND_MARGIN)
+        :param callback [function]: the function called for each frame received, with the 
+        payload [bytes], the RSSI [int], the SNR [int] and the slot [int] (default = None)
+        """
+
+        self.config = config or P2PConfig()
+        self.schedule = TDMASchedule.design(slots, payloadSize, self.config, baudrate, latency,
+                                            holdover, margin)
+        self.network = network
+        self.__lorawan = lorawan
+        self.__latency = latency
+        self.__beaconCommand = _commandTime(self.config.frequency, BEACON.size, baudrate, latency)
+        self.__callback = callback
+        self.__stop = threading.Event()
+        self.__sequence = 0
+        self.__reference = None  # end of the last beacon, in [ns]
+        self.__lock = threading.Lock()
+        self.__beacons = 0
+        self.__frames = [0] * slots  # frames received in each slot
+        self.__misaligned = 0  # frames received outside their slot
+
+    def stop(self):
+        """This method stops run()."""
+
+        self.__stop.set()
+
+    def run(self, frames=None):
+        """This method sends the beacons and receives the frames of the nodes.
+
+        :param frames [int]: the number of TDMA frames, or None to run until stop() is called 
+        (default = None)
+
+        :return: the response of the last command [CommandResponse]
+        """
+
+        self.__stop.clear()
+        status = CommandResponse.OK
+        count = 0
+        start = monotonic_ns() + self.__beaconCommand  # start of the next beacon
+        while not self.__stop.is_set() and (frames is None or count < frames):
+            _sleepUntil(start - self.__beaconCommand)
+            beacon = self.schedule.toBeacon(self.network, self.__sequence)
+            # the slots follow the beacon actually sent, even if the thread woke up late
+            start = monotonic_ns() + self.__beaconCommand
+            status = self.__lorawan.P2P_send(beacon, self.config.frequency)
+            with self.__lock:
+                self.__sequence += 1
+                self.__reference = start + round(self.config.timeOnAir(2 * BEACON.size) * 1e6)
+                if status == CommandResponse.OK:
+                    self.__beacons += 1
+            count += 1
+
+            # receive until the next beacon (after the end of this one)
+            reference = self.__reference
+            start = reference + round((self.schedule.frameTime -
+                                       self.config.timeOnAir(2 * BEACON.size)) * 1e6)
+            _sleepUntil(reference)
+            status = self.__lorawan.P2P_start(self.config.frequency, True)
+            self.__listen(reference, start - self.__beaconCommand)
+
+        return (status)
+
+    def __listen(self, reference, deadline):
+        """This method receives the frames of the nodes.
+
+        :param reference [int]: the end of the beacon, in [ns] of time.monotonic_ns()
+        :param deadline [int]: the time to stop, in [ns] of time.monotonic_ns()
+        """
+
+        while not self.__stop.is_set():
+            remaining = (deadline - monotonic_ns()) / 1e6 - LISTEN_MARGIN
+            if remaining < 1:
+                break
+            frame = self.__lorawan.P2P_receive(int(remaining))
+            if not frame:
+                continue
+            data, rssi, snr = frame
+            if len(data) < DATA.size or data[0] != KIND_DATA or data[1] != self.network or \
+                    data[2] >= self.schedule.slots:
+                continue
+
+            # the timestamp is the end of the frame
+            slot = data[2]
+            start = frame.timestamp - round((self.__latency +
+                                             self.config.timeOnAir(2 * len(data))) * 1e6)
+            with self.__lock:
+                self.__frames[slot] += 1
+                if self.schedule.slotOf(reference, start) != slot:
+                    self.__misaligned += 1
+            if self.__callback is not None:
+                self.__callback(data[DATA.size:], rssi, snr, slot)
+
+    def metrics(self):
+        """This method gets the results of the coordinator.
+
+        :return: the number of beacons sent, the frames received in each slot, the frames 
+        received outside their slot and the schedule [dict]
+        """
+
+        with self.__lock:
+            return {
+                "beacons": self.__beacons,
+                "frames": list(self.__frames),
+                "misaligned": self.__misaligned,
+                "schedule": self.schedule,
+            }
+
+
+class TDMANode:
+    """This class sends P2P frames only in the slot of the node, aligned to the beacons of a 
+    TDMACoordinator, so the nodes of the network do not collide.
+
+    Example: node = TDMANode(lorawan, slot=3)
+             node.send(b"\\x01\\x02")  # waits for the slot
+    """
+
+    def __init__(self, lorawan, slot, config=None, network=0, baudrate=9600,
+                 latency=MODULE_LATENCY, holdover=HOLDOVER, callback=None):
+        """This method is the constructor of the class.
+
+        :param lorawan [SMW_SX1262M0]: the module
+        :param slot [int]: the slot of the node (0 to the number of slots - 1)
+        :param config [P2PConfig]: the radio parameters (the same of the coordinator), or None 
+        for the defaults (default = None)
+        :param network [int]: the identifier of the network (0 to 255) (default = 0)
+        :param baudrate [int]: the baud rate of the serial port, or None (default = 9600)
+        :param latency [float]: the processing time of the module, in [ms] 
+        (default = MODULE_LATENCY)
+        :param holdover [int]: the number of frames the node can use after a beacon 
+        (default = HOLDOVER)
+        :param callback [function]: the function called for each frame of other nodes received, 
+        with the payload [bytes], the RSSI [int], the SNR [int] and the slot [int] (default = None)
+        """
+
+        self.config = config or P2PConfig()
+        self.slot = slot
+        self.network = network
+        self.schedule = None  # received in the beacons
+        self.__lorawan = lorawan
+        self.__baudrate = baudrate
+        self.__latency = latency
+        self.__holdover = holdover
+        self.__callback = callback
+        self.__reference = None  # end of the last beacon, in [ns]
+        self.__listening = False
+        self.__lock = threading.Lock()
+        self.__beacons = 0
+        self.__sent = 0
+        self.__missed = 0  # transmissions without a recent beacon
+        self.__late = 0.0  # maximum delay of a transmission, in [ms]
+
+    def synchronize(self, timeout=10000):
+        """This method waits for a beacon.
+
+        :param timeout [int]: the time to wait, in [ms] (default = 10000)
+
+        :return: True if a beacon was received [bool]
+        """
+
+        deadline = monotonic_ns() + timeout * 1000000
+        beacons = self.__beacons
+        while self.__beacons == beacons:
+            remaining = (deadline - monotonic_ns()) / 1e6
+            if remaining < 1:
+                return False
+            self.__listen(remaining)
+
+        return True
+
+    def send(self, data, timeout=10000):
+        """This method sends data in the next slot of the node.
+
+        :param data [bytes]: the data to send (up to 252 bytes, limited by the slot time)
+        :param timeout [int]: the time to wait for a beacon, in [ms] (default = 10000)
+
+        :return: the response of the command [CommandResponse] (TIMEOUT if no beacon was received)
+        """
+
+        data = bytes(data)
+        if not data or len(data) > 255 - DATA.size:
+            return (CommandResponse["PARAM_ERROR"])
+        frame = DATA.pack(KIND_DATA, self.network, self.slot) + data
+        command = _commandTime(self.config.frequency, len(frame), self.__baudrate, self.__latency)
+        airtime = self.config.timeOnAir(2 * len(frame))
+
+        deadline = monotonic_ns() + timeout * 1000000
+        while True:
+            if self.__reference is None:
+                if not self.synchronize((deadline - monotonic_ns()) / 1e6):
+                    return (CommandResponse["TIMEOUT"])
+            if self.slot >= self.schedule.slots or \
+                    airtime > self.schedule.slotTime - self.schedule.guard:
+                return (CommandResponse["PARAM_ERROR"])
+
+            start = self.__nextSlot(monotonic_ns() + command)
+            if start is None:
+                # too long since the last beacon, the clock cannot be trusted
+                self.__reference = None
+                with self.__lock:
+                    self.__missed += 1
+                continue
+
+            # listen until the command (a beacon updates the reference)
+            remaining = (start - command - monotonic_ns()) / 1e6 - LISTEN_MARGIN
+            if remaining >= 1 and self.__listen(remaining):
+                continue
+            break
+
+        _sleepUntil(start - command)
+        late = (monotonic_ns() - (start - command)) / 1e6
+        status = self.__lorawan.P2P_send(frame, self.config.frequency)
+        with self.__lock:
+            self.__late = max(self.__late, late)
+            if status == CommandResponse.OK:
+                self.__sent += 1
+
+        # receive again after the transmission
+        self.__listening = False
+        _sleepUntil(start + round(airtime * 1e6))
+        self.__receive()
+
+        return (status)
+
+    def __nextSlot(self, earliest):
+        """This method finds the next start of the slot of the node.
+
+        :param earliest [int]: the earliest time, in [ns] of time.monotonic_ns()
+
+        :return: the time, in [ns] of time.monotonic_ns() [int], or None if it is beyond the 
+        holdover
+        """
+
+        frameTime = round(self.schedule.frameTime * 1e6)
+        for frame in range(self.__holdover):
+            start = self.schedule.slotStart(self.__reference + frame * frameTime, self.slot)
+            if start >= earliest:
+                return start
+
+        return None
+
+    def __receive(self):
+        """This method sets the module as receiver, if necessary."""
+
+        if not self.__listening:
+            self.__listening = self.__lorawan.P2P_start(self.config.frequency, True) == \
+                CommandResponse.OK
+
+    def __listen(self, duration):
+        """This method receives frames for some time, stopping at a beacon.
+
+        :param duration [float]: the time, in [ms]
+
+        :return: True if a beacon was received [bool]
+        """
+
+        self.__receive()
+        deadline = monotonic_ns() + round(duration * 1e6)
+        while True:
+            remaining = (deadline - monotonic_ns()) / 1e6
+            if remaining < 1:
+                return False
+            frame = self.__lorawan.P2P_receive(int(remaining))
+            if not frame:
+                continue
+            data, rssi, snr = frame
+
+            beacon = TDMASchedule.fromBeacon(data)
+            if beacon is not None and beacon[0] == self.network:
+                # the timestamp is the end of the beacon
+                self.schedule = beacon[2]
+                self.__reference = frame.timestamp - round(self.__latency * 1e6)
+                with self.__lock:
+                    self.__beacons += 1
+                return True
+
+            if len(data) > DATA.size and data[0] == KIND_DATA and data[1] == self.network and \
+                    self.__callback is not None:
+                self.__callback(data[DATA.size:], rssi, snr, data[2])
+
+    def metrics(self):
+        """This method gets the results of the node.
+
+        :return: the number of beacons received, the frames sent, the times the node lost the 
+        synchronization, the maximum delay of a transmission, in [ms] (it must stay below the 
+        margin of the coordinator), and the schedule [dict]
+        """
+
+        with self.__lock:
+            return {
+                "beacons": self.__beacons,
+                "sent": self.__sent,
+                "missed": self.__missed,
+                "late": self.__late,
+                "schedule": self.schedule,
+            }
@@ -0,0 +1,372 @@
+#################################################################################################################
+
+# RoboCore SMW-SX1262M0 Library (Python) (v1.0)
+
+# Library to use the SMW-SX1262M0 LoRaWAN module.
+
+# Copyright 2023 RoboCore.
+
+
+# This file is part of the SMW-SX1262M0 library ("SMW-SX1262M0-lib").
+
+# "SMW-SX1262M0-lib" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# "SMW-SX1262M0-lib" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with "SMW-SX1262M0-lib". If not, see <https://www.gnu.org/licenses/>
+
+#################################################################################################################
+
+
+# Necessary libraries
+import struct
+import sys
+from time import monotonic_ns
+
+from .RoboCore_SMW_SX1262M0 import CommandResponse
+from .transport import openTransport
+
+# trace file format: the header, followed by records of
+# [timestamp (int64, ns)] [direction (uint8)] [length (uint32)] [data]
+TRACE_HEADER = b"SMWTRACE\x01"
+TRACE_TX = 0  # bytes sent to the module
+TRACE_RX = 1  # bytes received from the module
+TRACE_DISCARD = 2  # bytes received from the module and discarded without being read
+
+_record = struct.Struct("<qBI")
+
+
+class TraceTransport:
+    """This class records every byte sent to and received from the module, with a monotonic 
+    timestamp in [ns], in a compact binary file."""
+
+    def __init__(self, transport, filename):
+        """This method is the constructor of the class.
+
+        :param transport: the transport to record (see openTransport())
+        :param filename [str]: the path of the trace file
+        """
+
+        self.__transport = openTransport(transport)
+        self.__filename = filename
+        self.__file = open(filename, "wb")
+        self.__file.write(TRACE_HEADER)
+        self.is_open = True
+
+    def __log(self, direction, data):
+        """This method writes a record to the trace file.
+
+        :param direction [int]: TRACE_TX, TRACE_RX or TRACE_DISCARD
+        :param data [bytes]: the bytes transferred
+        """
+
+        self.__file.write(_record.pack(monotonic_ns(), direction, len(data)) + data)
+        # the trace must survive a crash of the application
+        self.__file.flush()
+
+    @property
+    def in_waiting(self):
+        """This property gets the number of bytes available to read.
+
+        :return: the number of bytes [int]
+        """
+
+        return self.__transport.in_waiting
+
+    def readinto(self, buffer):
+        """This method reads the available bytes into a buffer and records them.
+
+        :param buffer: the buffer to fill [bytearray] or [memoryview]
+
+        :return: the number of bytes read [int]
+        """
+
+        count = self.__transport.readinto(buffer) or 0
+        if count:
+            self.__log(TRACE_RX, bytes(buffer[:count]))
+
+        return count
+
+    def write(self, data):
+        """This method sends data to the module and records it.
+
+        :param data [bytes]: the data to send
+
+        :return: the number of bytes sent [int]
+        """
+
+        self.__log(TRACE_TX, bytes(data))
+
+        return self.__transport.write(data)
+
+    def reset_input_buffer(self):
+        """This method discards the received bytes (the available ones are recorded first, as 
+        TRACE_DISCARD)."""
+
+        waiting = self.__transport.in_waiting
+        if waiting:
+            buffer = bytearray(waiting)
+            count = self.__transport.readinto(buffer) or 0
+            if count:
+                self.__log(TRACE_DISCARD, bytes(buffer[:count]))
+        self.__transport.reset_input_buffer()
+
+    def open(self):
+        """This method reopens the transport and continues the trace file."""
+
+        if not self.is_open:
+            self.__transport = openTransport(self.__transport)
+            self.__file = open(self.__filename, "ab")
+            self.is_open = True
+
+    def close(self):
+        """This method closes the transport and the trace file."""
+
+        self.is_open = False
+        self.__file.close()
+        self.__transport.close()
+
+
+def readTrace(filename):
+    """This function reads the records of a trace file.
+
+    :param filename [str]: the path of the trace file
+
+    :return: the records [list] of (timestamp [int], direction [int], data [bytes])
+    """
+
+    with open(filename, "rb") as file:
+        content = file.read()
+
+    if not content.startswith(TRACE_HEADER):
+        raise ValueError(f"{filename} is not a trace file")
+
+    records = []
+    position = len(TRACE_HEADER)
+    while position + _record.size <= len(content):
+        timestamp, direction, length = _record.unpack_from(content, position)
+        position += _record.size
+        records.append((timestamp, direction, content[position:position + length]))
+        position += length
+
+    return records
+
+
+class ReplayTransport:
+    """This class feeds a recorded trace back to the library, as if the module was connected.
+
+    The bytes received after each command are released with the recorded delay (divided by
+    "speed"), counted from the moment the library sends the command. The discarded bytes 
+    (TRACE_DISCARD) are not released, the library was not meant to read them.
+    """
+
+    def __init__(self, filename, speed=1.0):
+        """This method is the constructor of the class.
+
+        :param filename [str]: the path of the trace file
+        :param speed [float]: how many times faster than recorded the bytes are released, or 
+        None to release them without delay (default = 1.0)
+        """
+
+        self.__records = [record for record in readTrace(filename) if record[1] != TRACE_DISCARD]
+        self.__speed = speed
+        self.__index = 0  # next record to replay
+        self.__pending = bytearray()  # released bytes not read yet
+        self.__reference = None  # (recorded time, replay time) of the last command [ns]
+        if self.__records:
+            self.__reference = (self.__records[0][0], monotonic_ns())
+        self.is_open = True
+
+    def __due(self, timestamp):
+        """This method converts a recorded time to the replay time.
+
+        :param timestamp [int]: the recorded time, in [ns]
+
+        :return: the replay time, in [ns] [int]
+        """
+
+        if not self.__speed:
+            return 0
+        recorded, replayed = self.__reference
+
+        return replayed + (timestamp - recorded) / self.__speed
+
+    @property
+    def in_waiting(self):
+        """This property releases the received bytes that are due.
+
+        :return: the number of bytes available to read [int]
+        """
+
+        now = monotonic_ns()
+        while self.__index < len(self.__records):
+            timestamp, direction, data = self.__records[self.__index]
+            if direction != TRACE_RX or self.__due(timestamp) > now:
+                break
+            self.__pending += data
+            self.__index += 1
+
+        return len(self.__pending)
+
+    def readinto(self, buffer):
+        """This method reads the released bytes into a buffer.
+
+        :param buffer: the buffer to fill [bytearray] or [memoryview]
+
+        :return: the number of bytes read [int]
+        """
+
+        count = min(len(buffer), len(self.__pending))
+        buffer[:count] = self.__pending[:count]
+        del self.__pending[:count]
+
+        return count
+
+    def write(self, data):
+        """This method receives a command from the library and moves the replay to the 
+        matching recorded command.
+
+        :param data [bytes]: the data sent by the library
+
+        :return: the number of bytes "sent" [int]
+        """
+
+        # release the remaining bytes of the previous command
+        while self.__index < len(self.__records) and self.__records[self.__index][1] == TRACE_RX:
+            self.__pending += self.__records[self.__index][2]
+            self.__index += 1
+
+        if self.__index < len(self.__records):
+            self.__reference = (self.__records[self.__index][0], monotonic_ns())
+            self.__index += 1
+
+        return len(data)
+
+    def reset_input_buffer(self):
+        """This method discards the released bytes."""
+
+        self.__pending.clear()
+
+    def close(self):
+        """This method ends the replay."""
+
+        self.is_open = False
+
+
+class TraceEntry:
+    """This class stores a command found in a trace and its response."""
+
+    __slots__ = ("command", "response", "start", "latency")
+
+    def __init__(self, command, start):
+        """This method is the constructor of the class.
+
+        :param command [str]: the command sent to the module
+        :param start [int]: the time the command was sent, in [ns]
+        """
+
+        self.command = command
+        self.response = []  # lines of the response [str]
+        self.start = start
+        self.latency = None  # [ns], None if no status line was received
+
+    def __repr__(self):
+        return f"TraceEntry(command={self.command!r}, latency={self.latency!r})"
+
+
+def analyzeTrace(filename):
+    """This function rebuilds the timeline of commands and responses of a trace.
+
+    :param filename [str]: the path of the trace file
+
+    :return: the commands [list] of TraceEntry, in the order they were sent
+
+    Note: the responses are matched to the commands in order, so pipelined commands are 
+    supported.
+    """
+
+    statusNames = {index.name for index in CommandResponse}
+    entries = []
+    waiting = []  # commands without a status line yet
+    sent = b""
+    received = b""
+    for timestamp, direction, data in readTrace(filename):
+        if direction == TRACE_TX:
+            sent += data
+            *commands, sent = sent.split(b"\n")
+            for command in commands:
+                entry = TraceEntry(command.decode("utf8", "ignore").strip(), timestamp)
+                entries.append(entry)
+                waiting.append(entry)
+            continue
+        if direction == TRACE_DISCARD:
+            # the library discarded what it had received too
+            received = b""
+            continue
+
+        received += data
+        *lines, received = received.split(b"\n")
+        for line in lines:
+            line = line.decode("utf8", "ignore").strip()
+            if not line or not waiting:
+                continue
+            entry = waiting[0]
+            entry.response.append(line)
+            if line in statusNames:
+                entry.latency = timestamp - entry.start
+                waiting.pop(0)
+
+    return entries
+
+
+def latencyReport(entries):
+    """This function summarizes the latency of each command.
+
+    :param entries [list]: the commands returned by analyzeTrace()
+
+    :return: the statistics of each command [dict] with the count, the number of commands 
+    without response ("lost") and the mean, p95 and maximum latency, in [ms]
+    """
+
+    latencies = {}
+    lost = {}
+    for entry in entries:
+        # group the commands by name (e.g. "AT+DR=3" and "AT+DR=?" are "AT+DR")
+        name = entry.command.split("=")[0].rstrip("?")
+        latencies.setdefault(name, [])
+        lost.setdefault(name, 0)
+        if entry.latency is None:
+            lost[name] += 1
+        else:
+            latencies[name].append(entry.latency / 1e6)
+
+    report = {}
+    for name, values in latencies.items():
+        values.sort()
+        report[name] = {
+            "count": len(values) + lost[name],
+            "lost": lost[name],
+            "mean": sum(values) / len(values) if values else None,
+            "p95": values[min(len(values) - 1, int(0.95 * len(values)))] if values else None,
+            "max": values[-1] if values else None,
+        }
+
+    return report
+
+
+# this condition will only be True if the file is executed directly
+# (e.g. "python3 -m RoboCore_SMW_SX1262M0.trace session.trace")
+if __name__ == "__main__":
+    report = latencyReport(analyzeTrace(sys.argv[1]))
+    print(f"{'command':<16}{'count':>8}{'lost':>6}{'mean':>10}{'p95':>10}{'max':>10}  [ms]")
+    for name, stats in sorted(report.items()):
+        values = [f"{stats[key]:>10.1f}" if stats[key] is not None else f"{'-':>10}"
+                  for key in ("mean", "p95", "max")]
+        print(f"{name:<16}{stats['count']:>8}{stats['lost']:>6}{''.join(values)}")
@@ -0,0 +1,234 @@
+#################################################################################################################
+
+# RoboCore SMW-SX1262M0 Library (Python) (v1.0)
+
+# Library to use the SMW-SX1262M0 LoRaWAN module.
+
+# Copyright 2023 RoboCore.
+
+
+# This file is part of the SMW-SX1262M0 library ("SMW-SX1262M0-lib").
+
+# "SMW-SX1262M0-lib" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# "SMW-SX1262M0-lib" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with "SMW-SX1262M0-lib". If not, see <https://www.gnu.org/licenses/>
+
+#################################################################################################################
+
+
+# Necessary libraries
+import select
+import socket
+import serial
+
+
+class SocketTransport:
+    """This class uses a connected socket (e.g. a module exposed by a serial server) as the 
+    connection to the module."""
+
+    def __init__(self, sock, address=None):
+        """This method is the constructor of the class.
+
+        :param sock [socket.socket]: the connected socket
+        :param address: the address used by open() to connect again after close(), or None to 
+        use the address of the peer of the socket (default = None)
+        """
+
+        if address is None:
+            try:
+                address = sock.getpeername() or None
+            except OSError:
+                address = None  # not connected
+
+        self.__socket = sock
+        self.__family = sock.family
+        self.__address = address
+        self.__pending = bytearray()  # received bytes not read yet
+        self.is_open = True
+
+    @property
+    def in_waiting(self):
+        """This property gets the number of bytes available to read (without blocking).
+
+        :return: the number of bytes [int]
+        """
+
+        readable = select.select([self.__socket], [], [], 0)[0]
+        if readable:
+            data = self.__socket.recv(4096)
+            if not data:
+                raise ConnectionError("the connection was closed by the remote host")
+            self.__pending += data
+
+        return len(self.__pending)
+
+    def readinto(self, buffer):
+        """This method reads the available bytes into a buffer.
+
+        :param buffer: the buffer to fill [bytearray] or [memoryview]
+
+        :return: the number of bytes read [int]
+        """
+
+        count = min(len(buffer), len(self.__pending))
+        buffer[:count] = self.__pending[:count]
+        del self.__pending[:count]
+
+        return count
+
+    def write(self, data):
+        """This method sends data to the module.
+
+        :param data [bytes]: the data to send
+
+        :return: the number of bytes sent [int]
+        """
+
+        self.__socket.sendall(data)
+
+        return len(data)
+
+    def reset_input_buffer(self):
+        """This method discards the received bytes."""
+
+        self.__pending.clear()
+        while select.select([self.__socket], [], [], 0)[0]:
+            if not self.__socket.recv(4096):
+                break
+
+    def open(self):
+        """This method connects again to the address of the socket, if it was closed.
+
+        Note: a ConnectionError is raised if the address is not known.
+        """
+
+        if self.is_open:
+            return
+        if self.__address is None:
+            raise ConnectionError("the socket was closed and its address is not known")
+
+        sock = socket.socket(self.__family, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.__address)
+        except OSError:
+            sock.close()
+            raise
+        self.__socket = sock
+        self.__pending.clear()
+        self.is_open = True
+
+    def close(self):
+        """This method closes the socket (it can be connected again with open())."""
+
+        self.is_open = False
+        self.__socket.close()
+
+
+class StreamTransport:
+    """This class uses file-like streams (e.g. a non-blocking pipe or an in-memory stream) as 
+    the connection to the module. The reading stream must return only the available bytes,
+    without blocking."""
+
+    def __init__(self, reader, writer=None):
+        """This method is the constructor of the class.
+
+        :param reader: the stream used to receive data
+        :param writer: the stream used to send data, or None to use the reader (default = None)
+        """
+
+        self.__reader = reader
+        self.__writer = writer if writer is not None else reader
+        self.__pending = bytearray()  # received bytes not read yet
+        self.is_open = True
+
+    @property
+    def in_waiting(self):
+        """This property gets the number of bytes available to read.
+
+        :return: the number of bytes [int]
+        """
+
+        data = self.__reader.read(4096)
+        if data:
+            self.__pending += data
+
+        return len(self.__pending)
+
+    def readinto(self, buffer):
+        """This method reads the available bytes into a buffer.
+
+        :param buffer: the buffer to fill [bytearray] or [memoryview]
+
+        :return: the number of bytes read [int]
+        """
+
+        count = min(len(buffer), len(self.__pending))
+        buffer[:count] = self.__pending[:count]
+        del self.__pending[:count]
+
+        return count
+
+    def write(self, data):
+        """This method sends data to the module.
+
+        :param data [bytes]: the data to send
+
+        :return: the number of bytes sent [int]
+        """
+
+        self.__writer.write(data)
+        if hasattr(self.__writer, "flush"):
+            self.__writer.flush()
+
+        return len(data)
+
+    def reset_input_buffer(self):
+        """This method discards the received bytes."""
+
+        self.__pending.clear()
+        while self.__reader.read(4096):
+            pass
+
+    def close(self):
+        """This method closes the streams."""
+
+        self.is_open = False
+        self.__reader.close()
+        if self.__writer is not self.__reader:
+            self.__writer.close()
+
+
+def openTransport(port, baudrate=9600, timeout=None):
+    """This function opens the connection to the module.
+
+    :param port: a serial port or a pyserial URL [str] (e.g. "/dev/serial0", "socket://host:port",
+    "rfc2217://host:port" or "loop://"), a connected socket [socket.socket] or a transport object
+    :param baudrate [int]: the baud rate used for serial ports (default = 9600)
+    :param timeout [int]: the time the port will wait for the module to respond (default = None)
+
+    :return: the transport [object]
+
+    Note: a transport object must have the "in_waiting" property and the "readinto", "write",
+    "reset_input_buffer" and "close" methods, like serial.Serial.
+    """
+
+    if isinstance(port, str):
+        return serial.serial_for_url(port, baudrate=baudrate, timeout=timeout)
+
+    if isinstance(port, socket.socket):
+        return SocketTransport(port)
+
+    # reopen an injected transport that was closed (e.g. serial.Serial)
+    if getattr(port, "is_open", True) is False and hasattr(port, "open"):
+        port.open()
+
+    return port
@@ -0,0 +1,227 @@
+#################################################################################################################
+
+# RoboCore SMW-SX1262M0 Library (Python) (v1.0)
+
+# Library to use the SMW-SX1262M0 LoRaWAN module.
+
+# Copyright 2023 RoboCore.
+
+
+# This file is part of the SMW-SX1262M0 library ("SMW-SX1262M0-lib").
+
+# "SMW-SX1262M0-lib" is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# "SMW-SX1262M0-lib" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with "SMW-SX1262M0-lib". If not, see <https://www.gnu.org/licenses/>
+
+#################################################################################################################
+
+
+# Necessary libraries
+import threading
+
+from .RoboCore_SMW_SX1262M0 import CommandResponse
+from .arbiter import Priority
+
+# statuses that mean that the module did not respond properly
+FAILURES = (CommandResponse.TIMEOUT, CommandResponse.INVALID_RESPONSE)
+
+# recovery steps, from the cheapest to the most disruptive
+STEPS = ("drain", "probe", "reset", "reopen")
+
+
+class HealthWatchdog:
+    """This class checks that the module is responding and recovers it when it is not.
+
+    Any response of the module (to a command or an event line) counts as a heartbeat, so ping() 
+    is sent only when the module has been silent for the heartbeat interval, and preferably 
+    while no other thread is using it. When a heartbeat fails, the recovery escalates through 
+    STEPS until the module responds again: drain and resynchronize the serial port 
+    (see SMW_SX1262M0.resync()), probe with bare AT commands, reset the module and, finally, 
+    reopen the serial port.
+    """
+
+    def __init__(self, lorawan, interval=30000, idle=200, probes=3, callback=None):
+        """This method is the constructor of the class.
+
+        :param lorawan [SMW_SX1262M0]: the module
+        :param interval [int]: the time without responses before a heartbeat, in [ms] 
+        (default = 30000)
+        :param idle [int]: the time the module must be unused before a heartbeat, in [ms]; 
+        a heartbeat late by another interval is sent anyway (default = 200)
+        :param probes [int]: the number of AT commands sent by the "probe" step (default = 3)
+        :param callback [function]: function(step, duration) called after each recovery with the 
+        step [str] that recovered the module (or None if all failed) and its duration, 
+        in [ms] (default = None)
+        """
+
+        self.__lorawan = lorawan
+        self.__interval = interval
+        self.__idle = idle
+        self.__probes = probes
+        self.__callback = callback
+
+        self.__lock = threading.Lock()
+        self.__thread = None
+        self.__stopped = threading.Event()
+
+        self.__healthy = True
+        self.__heartbeats = 0
+        self.__failures = 0
+        self.__recoveries = dict.fromkeys(STEPS, 0)
+        self.__unrecovered = 0
+        self.__recoveryTotal = 0  # [ms]
+        self.__recoveryMax = 0  # [ms]
+        self.__recoveryLast = None  # [ms]
+
+    @property
+    def healthy(self):
+        """This property checks if the module responded to the last check.
+
+        :return: the state [bool]
+        """
+
+        return self.__healthy
+
+    def check(self):
+        """This method sends a heartbeat if it is due, and recovers the module if it fails.
+
+        :return: True [bool] if the module is responding, or False otherwise
+        """
+
+        lorawan = self.__lorawan
+        last = lorawan.lastResponse()
+        if last is not None:
+            silence = lorawan.millis() - last
+            if silence < self.__interval:
+                return True
+            # wait for the module to be unused, unless the heartbeat is very late
+            if silence < 2 * self.__interval and lorawan.idleTime() < self.__idle:
+                return True
+
+        with lorawan.priority(Priority.LOW):
+            status = lorawan.ping()
+        with self.__lock:
+            self.__heartbeats += 1
+        if status not in FAILURES:
+            self.__healthy = True
+            return True
+
+        with self.__lock:
+            self.__failures += 1
+
+        return self.recover() is not None
+
+    def recover(self):
+        """This method recovers the module, escalating through STEPS until it responds.
+
+        :return: the step that recovered the module [str], or None if all failed
+        """
+
+        lorawan = self.__lorawan
+        start = lorawan.millis()
+        recovered = None
+        # no other thread can use the module during the recovery
+        with lorawan.transaction(Priority.HIGH):
+            for step in STEPS:
+                if self.__step(step):
+                    recovered = step
+                    break
+        duration = lorawan.millis() - start
+
+        with self.__lock:
+            if recovered is None:
+                self.__unrecovered += 1
+            else:
+                self.__recoveries[recovered] += 1
+            self.__recoveryTotal += duration
+            self.__recoveryMax = max(self.__recoveryMax, duration)
+            self.__recoveryLast = duration
+        self.__healthy = recovered is not None
+
+        if self.__callback is not None:
+            self.__callback(recovered, duration)
+
+        return recovered
+
+    def start(self, period=1000):
+        """This method checks the module from a background thread.
+
+        :param period [int]: the time between checks, in [ms] (default = 1000)
+        """
+
+        if self.__thread is not None:
+            return
+
+        self.__stopped.clear()
+
+        def run():
+            while not self.__stopped.wait(period / 1000):
+                self.check()
+
+        self.__thread = threading.Thread(target=run, name="HealthWatchdog", daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """This method stops the background thread started by start()."""
+
+        if self.__thread is not None:
+            self.__stopped.set()
+            self.__thread.join()
+            self.__thread = None
+
+    def metrics(self):
+        """This method gets the results of the watchdog.
+
+        :return: the number of heartbeats and failed heartbeats, the number of recoveries by 
+        each step and of failed recoveries, and the mean, maximum and last recovery time, 
+        in [ms] [dict]
+        """
+
+        with self.__lock:
+            count = sum(self.__recoveries.values()) + self.__unrecovered
+            return {
+                "healthy": self.__healthy,
+                "heartbeats": self.__heartbeats,
+                "failures": self.__failures,
+                "recoveries": dict(self.__recoveries),
+                "unrecovered": self.__unrecovered,
+                "recoveryMean": self.__recoveryTotal / count if count else None,
+                "recoveryMax": self.__recoveryMax,
+                "recoveryLast": self.__recoveryLast,
+            }
+
+    def __step(self, step):
+        """This method runs a recovery step.
+
+        :param step [str]: the step (see STEPS)
+
+        :return: True [bool] if the module responded after the step, or False otherwise
+        """
+
+        lorawan = self.__lorawan
+        if step == "drain":
+            # discard the bytes of old or garbled responses and realign with a bare AT
+            return lorawan.resync() == CommandResponse.OK
+        elif step == "probe":
+            # a bare line break ends a command the module received partially
+            lorawan.execute("", lorawan.SMW_SX1262M0_TIMEOUT_READ)
+            for _ in range(self.__probes - 1):
+                if lorawan.ping() not in FAILURES:
+                    return True
+        elif step == "reset":
+            lorawan.reset()
+            lorawan.drain()
+        elif step == "reopen":
+            lorawan.reconnect()
+            lorawan.drain()
+
+        return lorawan.ping() not in FAILURES
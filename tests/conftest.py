@@ -0,0 +1,86 @@
+import time
+
+import pytest
+
+from RoboCore_SMW_SX1262M0 import SMW_SX1262M0
+
+
+class FakeModule:
+    """Serial port that answers the AT commands from a dictionary of values."""
+
+    def __init__(self):
+        self.is_open = True
+        self.state = {"NJS": "1", "DADDR": "01:02:03:04", "RSSI": "-40", "SNR": "7", "DR": "0",
+                      "VER": "1.0", "DEUI": "AA:BB", "ADR": "0", "NJM": "1", "CLASS": "A",
+                      "TXP": "0", "CFM": "0", "CFS": "0", "RECV": "0:", "RECVB": "0:"}
+        self.log = []  # command lines written
+        self.replies = {}  # command line -> list of raw replies used before the default one
+        self.rx = bytearray()
+        self.pending = []  # (time, bytes) not delivered yet
+
+    @property
+    def in_waiting(self):
+        now = time.monotonic()
+        while self.pending and self.pending[0][0] <= now:
+            self.rx += self.pending.pop(0)[1]
+        return len(self.rx)
+
+    def read(self, size=1):
+        self.in_waiting
+        data = bytes(self.rx[:size])
+        del self.rx[:size]
+        return data
+
+    def readinto(self, buffer):
+        self.in_waiting
+        count = min(len(buffer), len(self.rx))
+        buffer[:count] = self.rx[:count]
+        del self.rx[:count]
+        return count
+
+    def reset_input_buffer(self):
+        self.rx.clear()
+
+    def open(self):
+        self.is_open = True
+
+    def close(self):
+        self.is_open = False
+
+    def reply(self, text, delay=0.0):
+        self.pending.append((time.monotonic() + delay, text.encode() if isinstance(text, str) else text))
+
+    def write(self, data):
+        for line in bytes(data).decode().split("\n"):
+            if line:
+                self.log.append(line)
+                self.handle(line)
+        return len(data)
+
+    def handle(self, line):
+        queued = self.replies.get(line)
+        if queued:
+            return self.reply(queued.pop(0))
+        if line == "AT":
+            return self.reply("\r\nOK\r\n")
+        if line == "ATZ":
+            return self.reply("\r\nBOOT\r\n")
+        body = line[3:]
+        if body.endswith("=?"):
+            return self.reply(f"\r\n{self.state.get(body[:-2], '')}\r\nOK\r\n")
+        if "=" in body:
+            name, value = body.split("=", 1)
+            self.state[name] = value
+        return self.reply("\r\nOK\r\n")
+
+
+@pytest.fixture
+def module():
+    return FakeModule()
+
+
+@pytest.fixture
+def lorawan(module):
+    device = SMW_SX1262M0(module)
+    yield device
+    device.close()
@@ -0,0 +1,114 @@
+import threading
+import time
+
+from RoboCore_SMW_SX1262M0 import CommandArbiter, CommandResponse, Priority
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert condition()
+
+
+def test_threads_do_not_mix_responses(lorawan, module):
+    # answer after 2 ms, so the threads overlap
+    reply = module.reply
+    module.reply = lambda text, delay=0.0: reply(text, delay + 0.002)
+    module.state.update({"DR": "3", "TXP": "5"})
+    errors = []
+
+    def run(method, expected):
+        for _ in range(50):
+            result = method()
+            if result != (CommandResponse.OK, expected):
+                errors.append(result)
+
+    threads = [threading.Thread(target=run, args=(lorawan.get_DR, 3)),
+               threading.Thread(target=run, args=(lorawan.get_TxPower, 5))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # every reply reached the thread that sent the command
+    assert errors == []
+    assert lorawan.metrics()["resyncs"] == 0
+
+
+def start_waiting(arbiter, priority, order):
+    def run():
+        arbiter.acquire(priority)
+        order.append(priority)
+        arbiter.release()
+
+    count = arbiter.metrics()["waiting"]
+    thread = threading.Thread(target=run)
+    thread.start()
+    wait_for(lambda: arbiter.metrics()["waiting"] == count + 1)
+    return thread
+
+
+def test_waiting_threads_are_served_by_priority():
+    arbiter = CommandArbiter(aging=100)
+    order = []
+    arbiter.acquire()
+    threads = [start_waiting(arbiter, priority, order)
+               for priority in (Priority.LOW, Priority.NORMAL, Priority.HIGH)]
+    arbiter.release()
+    for thread in threads:
+        thread.join()
+
+    assert order == [Priority.HIGH, Priority.NORMAL, Priority.LOW]
+
+
+def test_aging_prevents_starvation():
+    arbiter = CommandArbiter(aging=0.05)
+    order = []
+    arbiter.acquire()
+    low = start_waiting(arbiter, Priority.LOW, order)
+    time.sleep(0.2)  # 4 levels above its priority
+    high = start_waiting(arbiter, Priority.HIGH, order)
+    arbiter.release()
+    low.join()
+    high.join()
+
+    assert order == [Priority.LOW, Priority.HIGH]
+
+
+def test_transactions_are_reentrant(lorawan, module):
+    done = threading.Event()
+    other = threading.Thread(target=lambda: (lorawan.get_DR(), done.set()))
+
+    with lorawan.transaction():
+        with lorawan.transaction(Priority.HIGH):
+            assert lorawan.ping() == CommandResponse.OK
+        other.start()
+        # the other thread waits for the outer block
+        assert not done.wait(0.1)
+        assert lorawan.set_DR(2) == CommandResponse.OK
+    other.join()
+
+    assert done.is_set()
+    assert module.log == ["AT", "AT+DR=2", "AT+DR=?"]
+
+
+def test_wait_time_metrics():
+    arbiter = CommandArbiter()
+    order = []
+    arbiter.acquire(Priority.LOW)
+    thread = start_waiting(arbiter, Priority.HIGH, order)
+    assert arbiter.metrics()["waiting"] == 1
+    assert arbiter.idleTime() == 0.0
+    time.sleep(0.1)
+    arbiter.release()
+    thread.join()
+
+    metrics = arbiter.metrics()
+    assert metrics["LOW"]["count"] == 1 and metrics["LOW"]["waitMax"] < 50
+    assert metrics["HIGH"]["count"] == 1
+    assert 100 <= metrics["HIGH"]["waitMax"] < 1000
+    assert metrics["HIGH"]["waitMean"] == metrics["HIGH"]["waitMax"]
+    assert metrics["NORMAL"] == {"count": 0, "waitMean": 0.0, "waitMax": 0.0}
+    assert metrics["waiting"] == 0
+    assert arbiter.idleTime() > 0
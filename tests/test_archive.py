@@ -0,0 +1,63 @@
+import pytest
+
+from RoboCore_SMW_SX1262M0 import FrameArchive
+from RoboCore_SMW_SX1262M0 import archive as archiveModule
+from RoboCore_SMW_SX1262M0.archive import KIND_BINARY, KIND_P2P
+
+
+@pytest.fixture(params=["numpy", "lists"])
+def backend(request, monkeypatch):
+    if request.param == "lists":
+        monkeypatch.setattr(archiveModule, "numpy", None)
+    elif archiveModule.numpy is None:
+        pytest.skip("NumPy is not installed")
+
+
+def at(seconds):
+    """Timestamp of a record at a time, in [s]."""
+    return (None, seconds * 1_000_000_000)
+
+
+def payloads(columns):
+    return [bytes(payload)[:length] for payload, length in zip(columns["payload"], columns["length"])]
+
+
+def test_time_and_source_queries(backend, tmp_path):
+    with FrameArchive(tmp_path, payloadSize=8, segmentRecords=4) as archive:
+        for i in range(10):
+            archive.record("a" if i % 2 else "b", b"%d" % i, rssi=-40 - i, snr=i, stamp=at(100 + i))
+
+        assert list(archive.query(start=102, end=106)["time"]) == [t * 10 ** 9 for t in range(102, 106)]
+        assert payloads(archive.query("a", start=103)) == [b"3", b"5", b"7", b"9"]
+        assert payloads(archive.query("b", end=104)) == [b"0", b"2"]
+        assert payloads(archive.query("a", minSNR=4, maxRSSI=-47)) == [b"7", b"9"]
+        assert len(archive.query("c")["time"]) == 0
+        assert len(archive.query(start=200)["time"]) == 0
+
+
+def test_records_out_of_order(backend, tmp_path):
+    with FrameArchive(tmp_path, segmentRecords=8) as archive:
+        for t in (100, 101, 105, 102, 106, 103):
+            archive.record("a", b"%d" % t, stamp=at(t))
+
+        assert payloads(archive.query(start=102, end=105)) == [b"102", b"103"]
+        assert payloads(archive.query(end=102)) == [b"100", b"101"]
+        assert payloads(archive.query("a", start=105)) == [b"105", b"106"]
+
+    # the state is kept in the file
+    with FrameArchive(tmp_path, segmentRecords=8) as archive:
+        assert payloads(archive.query(start=102, end=105)) == [b"102", b"103"]
+
+
+def test_payload_bytes_are_kept(backend, tmp_path):
+    data = [b"\x01\x00\x00", b"\x00", b"abc\x00\x00\x00\x00\x00\x00\x00", b"text"]
+    with FrameArchive(tmp_path, payloadSize=8) as archive:
+        for payload in data:
+            archive.record("a", payload, kind=KIND_BINARY)
+        archive.record("a", "é", kind=KIND_P2P)
+
+        columns = archive.query("a")
+        assert payloads(columns) == [b"\x01\x00\x00", b"\x00", b"abc\x00\x00\x00\x00\x00", b"text",
+                                     "é".encode()]
+        assert list(columns["length"]) == [3, 1, 10, 4, 2]
+        assert list(archive.query(kind=KIND_P2P)["length"]) == [2]
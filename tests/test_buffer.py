@@ -0,0 +1,129 @@
+import itertools
+import time
+
+import pytest
+
+from RoboCore_SMW_SX1262M0 import CommandResponse
+from RoboCore_SMW_SX1262M0 import RoboCore_SMW_SX1262M0 as driver
+from RoboCore_SMW_SX1262M0.RoboCore_SMW_SX1262M0 import _ReceiveBuffer
+
+
+class Chunks:
+    """Connection that delivers one chunk of bytes per read."""
+
+    def __init__(self, *chunks):
+        self.chunks = list(chunks)
+
+    @property
+    def in_waiting(self):
+        return len(self.chunks[0]) if self.chunks else 0
+
+    def readinto(self, buffer):
+        chunk = self.chunks.pop(0)
+        buffer[:len(chunk)] = chunk
+        return len(chunk)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """The reads happen at 1, 2, 3... [ns]."""
+
+    monkeypatch.setattr(driver, "monotonic_ns", itertools.count(1).__next__)
+
+
+def state(buffer):
+    return (len(buffer._ReceiveBuffer__buffer), buffer._ReceiveBuffer__base,
+            buffer._ReceiveBuffer__start, buffer._ReceiveBuffer__end)
+
+
+def test_unread_bytes_are_moved_to_the_start(clock):
+    buffer = _ReceiveBuffer(16)
+    connection = Chunks(b"0123456789\nab", b"cdef\nXY")
+
+    assert buffer.fill(connection) == 13
+    assert buffer.readline() == "0123456789"
+    assert state(buffer) == (16, 0, 11, 13)
+
+    # 7 bytes do not fit after the end: the 2 unread bytes are moved, the buffer does not grow
+    assert buffer.fill(connection) == 7
+    assert state(buffer) == (16, 11, 0, 9)
+    assert buffer.readline() == "abcdef"
+    assert buffer.pending() == b"XY"
+
+
+def test_buffer_grows_for_a_long_line(clock):
+    buffer = _ReceiveBuffer(8)
+    connection = Chunks(b"0123", b"456789ABCDEF\r\n")
+
+    buffer.fill(connection)
+    buffer.fill(connection)
+    assert len(buffer._ReceiveBuffer__buffer) >= 18
+    assert buffer.readline() == "0123456789ABCDEF"
+    assert len(buffer) == 0
+
+
+def test_lines_split_across_reads(clock):
+    buffer = _ReceiveBuffer(16)
+    connection = Chunks(b"\r\n12", b"34\r\nO", b"K\r", b"\n")
+
+    buffer.fill(connection)
+    assert buffer.readline() == ""
+    assert buffer.readline() is None
+    buffer.fill(connection)
+    assert buffer.readline() == "1234"
+    assert buffer.find(b"O") and not buffer.find(b"OK")
+    buffer.fill(connection)
+    assert buffer.readline() is None and buffer.pending() == b"OK"
+    buffer.fill(connection)
+    assert buffer.readline() == "OK"
+    assert buffer.fill(connection) == 0
+
+
+def test_arrivals_use_absolute_positions(clock):
+    buffer = _ReceiveBuffer(16)
+    connection = Chunks(b"0123456789\nab", b"cdef\nXY", b"Z\n")
+
+    buffer.fill(connection)  # at 1 [ns]
+    buffer.readline()
+    # "a" was read at 1 [ns]
+    assert buffer.timestamp() == (1, None)
+
+    buffer.fill(connection)  # at 2 [ns], after moving the unread bytes
+    assert list(buffer._ReceiveBuffer__arrivals) == [(0, (1, None)), (13, (2, None))]
+    assert buffer.timestamp() == (1, None)
+    buffer.readline()
+    # "X" was read at 2 [ns], the first read is forgotten
+    assert buffer.timestamp() == (2, None)
+    assert [position for position, _ in buffer._ReceiveBuffer__arrivals] == [13]
+
+    # the positions keep counting after the buffer is cleared
+    buffer.fill(connection)  # at 3 [ns]
+    assert buffer.readline() == "XYZ"
+    assert buffer.timestamp() is None
+    assert state(buffer) == (16, 22, 0, 0)
+    buffer.fill(Chunks(b"OK\r\n"))  # at 4 [ns]
+    assert buffer._ReceiveBuffer__arrivals[0] == (22, (4, None))
+    assert buffer.timestamp() == (4, None)
+
+
+def test_response_time_is_the_first_byte(lorawan, module):
+    # a small buffer, so the end of the response moves the unread bytes
+    lorawan._SMW_SX1262M0__receiveBuffer = _ReceiveBuffer(8)
+    handle = module.handle
+
+    def split(line):
+        if line != "AT+RSSI=?":
+            return handle(line)
+        module.reply("\r\n-40\r\nO", 0.02)
+        module.reply("K\r\n", 0.07)
+
+    module.handle = split
+    start = time.monotonic_ns()
+    result = lorawan.get_RSSI()
+    end = time.monotonic_ns()
+
+    assert result == (CommandResponse.OK, -40)
+    assert lorawan._SMW_SX1262M0__receiveBuffer._ReceiveBuffer__base > 0
+    # read after the first chunk, not when the method returned
+    assert start + 20e6 <= result.timestamp < start + 70e6 <= end
+    assert lorawan.lastTimestamp() == (result.timestamp, None)
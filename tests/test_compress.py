@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from RoboCore_SMW_SX1262M0 import UplinkCompressor, UplinkDecoder
+
+
+def readings(count, seed):
+    generator = random.Random(seed)
+    values = [20.0, 1000, -5]
+    for _ in range(count):
+        values = [round(values[0] + generator.uniform(-0.5, 0.5), 2),
+                  values[1] + generator.randint(-3, 3),
+                  values[2] + generator.choice((-1, 0, 1)) * generator.randint(0, 500)]
+        yield values
+
+
+@pytest.mark.parametrize("loss, ackLoss", [(0.0, 0.0), (0.3, 0.0), (0.3, 0.3), (0.9, 0.5)])
+def test_round_trip_with_lost_frames(loss, ackLoss):
+    generator = random.Random(1)
+    scales = [100, 1, 1]
+    compressor = UplinkCompressor(3, scales, keyframeInterval=8)
+    decoder = UplinkDecoder(3, scales)
+
+    delivered = decoded = 0
+    for values in readings(1000, 2):  # the sequence numbers wrap several times
+        sequence, frame = compressor.encode(values)
+        if generator.random() < loss:
+            continue
+        delivered += 1
+        result = decoder.decode(frame)
+        # a frame is encoded against an acknowledged frame, so it is always decoded
+        assert result == (sequence, pytest.approx(values))
+        decoded += 1
+        if generator.random() >= ackLoss:
+            compressor.acknowledge(sequence)
+
+    assert decoded == delivered > 0
+    metrics = compressor.metrics()
+    assert metrics["frames"] == 1000
+    if loss == 0.0:
+        assert metrics["ratio"] > 1
+
+
+def test_frame_against_a_lost_reference_is_skipped():
+    compressor = UplinkCompressor(2, keyframeInterval=100)
+    decoder = UplinkDecoder(2)
+
+    _, first = compressor.encode([100000, 200000])
+    assert decoder.decode(first) == (0, [100000, 200000])
+    compressor.acknowledge(0)
+    _, lost = compressor.encode([100001, 200001])
+    compressor.acknowledge(1)  # acknowledged by the network, but missed by this decoder
+    _, delta = compressor.encode([100002, 200002])
+
+    assert delta[0] & 0x80 == 0
+    assert decoder.decode(delta) is None
+    compressor.reset()
+    assert decoder.decode(compressor.encode([100003, 200003])[1]) == (3, [100003, 200003])
+
+
+def test_truncated_frame():
+    compressor = UplinkCompressor(2)
+    decoder = UplinkDecoder(2)
+
+    _, frame = compressor.encode([1000, -1000])
+    assert decoder.decode(frame[:-1]) is None
+    assert decoder.decode(b"") is None
+    assert decoder.decode(frame.hex()) == (0, [1000, -1000])
@@ -0,0 +1,68 @@
+import threading
+import time
+
+from RoboCore_SMW_SX1262M0 import ConfirmationState, ConfirmationTracker
+
+
+def run(tracker, confirmation, seconds=2.0):
+    deadline = time.monotonic() + seconds
+    while not confirmation.done() and time.monotonic() < deadline:
+        tracker.poll()
+        time.sleep(0.01)
+
+
+def test_acknowledged_and_mode_restored(module, lorawan):
+    tracker = ConfirmationTracker(lorawan, timeout=500, retries=0, checkDelay=50, checkInterval=20)
+    confirmation = tracker.sendT(1, "hello")
+    assert module.log == []  # queued only
+    tracker.poll()
+    assert module.state["CFM"] == "1"
+
+    module.state["CFS"] = "1"
+    run(tracker, confirmation)
+    assert confirmation.state == ConfirmationState.ACKNOWLEDGED
+    tracker.poll()
+    assert module.state["CFM"] == "0"
+
+
+def test_stale_status_is_not_an_acknowledgement(module, lorawan):
+    module.state["CFS"] = "1"  # left by a previous uplink
+    tracker = ConfirmationTracker(lorawan, timeout=300, retries=0, checkDelay=50, checkInterval=20)
+    confirmation = tracker.sendT(1, "hello")
+    run(tracker, confirmation)
+    assert confirmation.state == ConfirmationState.FAILED
+
+
+def test_status_reads_back_off(module, lorawan):
+    tracker = ConfirmationTracker(lorawan, timeout=1000, retries=0, checkDelay=50, checkInterval=20)
+    confirmation = tracker.sendT(1, "hello")
+    run(tracker, confirmation)
+    assert confirmation.state == ConfirmationState.FAILED
+    # 1 before the receive windows and about log2(1000 / 20) while waiting (vs 100 polls)
+    assert module.log.count("AT+CFS=?") <= 10
+
+
+def test_callbacks_run_without_the_lock(module, lorawan):
+    tracker = ConfirmationTracker(lorawan, timeout=500, retries=0, checkDelay=50, checkInterval=20)
+    results = []
+
+    def callback(confirmation):
+        # another thread using the tracker (e.g. a GUI) must not wait for the callback
+        thread = threading.Thread(target=lambda: results.append(tracker.metrics()))
+        thread.start()
+        thread.join(1)
+        assert not thread.is_alive()
+        results.append(tracker.sendT(2, "next"))
+
+    first = tracker.sendT(1, "hello", callback)
+    tracker.poll()
+    module.state["CFS"] = "1"
+    run(tracker, first)
+    assert first.state == ConfirmationState.ACKNOWLEDGED
+    assert results[0]["acknowledged"] == 1
+
+    # the uplink queued by the callback is sent by the next poll
+    second = results[1]
+    assert tracker.pending() == 1 and second.attempts == 0
+    tracker.poll()
+    assert second.attempts == 1
@@ -0,0 +1,211 @@
+import os
+import socket
+import stat
+import threading
+import time
+
+import pytest
+
+from RoboCore_SMW_SX1262M0 import CommandResponse, P2PConfig, SMW_SX1262M0
+from RoboCore_SMW_SX1262M0.daemon import (
+    FRAME_HEADER, OUTBOX_SIZE, REMOTE_METHODS, RESPONSE, SUBSCRIBE, ModuleServer, SMW_SX1262M0Client,
+    _receiveFrame, _sendFrame,
+)
+
+
+class Recorder:
+    """Module that keeps the last result of each method run by the daemon."""
+
+    def __init__(self, lorawan):
+        self.lorawan = lorawan
+        self.results = {}
+        self.overrides = {}
+
+    def __getattr__(self, name):
+        function = self.overrides.get(name) or getattr(self.lorawan, name)
+        if not callable(function) or name in ("transaction", "priority", "addCallback", "removeCallback"):
+            return function
+
+        def method(*args, **kwargs):
+            result = function(*args, **kwargs)
+            self.results[name] = result
+            return result
+
+        return method
+
+
+# arguments of each remote method
+CALLS = {
+    "P2P_listen": ([30], {}), "P2P_receive": ([30], {}), "P2P_send": ([b"\x00\xff"], {}),
+    "P2P_start": ([], {}), "P2P_stop": ([], {}), "configure": ([{"set_DR": 2}], {}),
+    "drain": ([], {"quiet": 10, "timeout": 50}), "execute": (["AT+DR=?"], {}),
+    "flush": ([], {}), "idleTime": ([], {}), "isConnected": ([], {}), "join": ([], {}),
+    "lastResponse": ([], {}), "lastTimestamp": ([], {}), "metrics": ([], {}), "ping": ([], {}),
+    "pipeline": ([["AT+DR=?", "AT+ADR=?"]], {}), "readLine": ([], {}),
+    "readSettings": ([["DR", "ADR"]], {}), "readT": ([], {}), "readX": ([], {}),
+    "reconnect": ([], {}), "reset": ([], {}), "resync": ([], {}), "save": ([], {}),
+    "sendT": ([1, "hello"], {}), "sendX": ([1, "00FF"], {}), "set_ADR": ([1], {}),
+    "set_AJoin": ([0], {}), "set_AppEUI": (["00:00:00:00:00:00:00:01"], {}),
+    "set_AppKey": (["00:00:00:00:00:00:00:00:00:00:00:00:00:00:00:01"], {}),
+    "set_AppSKey": (["00:00:00:00:00:00:00:00:00:00:00:00:00:00:00:02"], {}),
+    "set_Class": (["A"], {}), "set_Confirm": ([0], {}), "set_DR": ([1], {}),
+    "set_DevAddr": (["01:02:03:04"], {}), "set_JoinMode": ([1], {}),
+    "set_NwkSKey": (["00:00:00:00:00:00:00:00:00:00:00:00:00:00:00:03"], {}),
+    "set_P2PConfig": ([P2PConfig(sf=9)], {}), "set_TxPower": ([10], {}),
+}
+CALLS.update({name: ([], {}) for name in REMOTE_METHODS if name.startswith("get_")})
+
+
+@pytest.fixture
+def daemon(lorawan, module, tmp_path):
+    module.state["TCONF"] = "915200:14:125:7:1:8"
+    module.replies["ATZ"] = ["\r\nOK\r\n"] * 10
+    recorder = Recorder(lorawan)
+    server = ModuleServer(recorder, str(tmp_path / "smw.sock"))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, recorder
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_every_remote_method_round_trips(daemon):
+    server, recorder = daemon
+    assert set(CALLS) == REMOTE_METHODS
+
+    with SMW_SX1262M0Client(server.path) as client:
+        for name in sorted(CALLS):
+            args, kwargs = CALLS[name]
+            result = getattr(client, name)(*args, **kwargs)
+            expected = recorder.results[name]
+            assert type(result) is type(expected), name
+            if name != "metrics":  # the priorities are sent as the keys of a JSON object
+                assert result == expected, name
+
+
+def test_binary_values_keep_their_type(daemon):
+    server, recorder = daemon
+    recorder.overrides["readLine"] = lambda timeout=0: (b"\x00\x01\x00", P2PConfig(sf=5))
+
+    with SMW_SX1262M0Client(server.path) as client:
+        data, config = client.readLine()
+        assert data == b"\x00\x01\x00"
+        assert config == P2PConfig(sf=5)
+        assert client.ping() == CommandResponse.OK
+
+
+def test_unencodable_result_returns_an_error(daemon):
+    server, recorder = daemon
+    recorder.overrides["ping"] = lambda: object()
+
+    with SMW_SX1262M0Client(server.path) as client:
+        with pytest.raises(TypeError, match="cannot be sent"):
+            client.ping()
+        # the client is still served
+        assert client.isConnected() == recorder.results["isConnected"]
+
+
+def test_remote_exceptions_keep_their_type(daemon):
+    server, recorder = daemon
+
+    def invalid(*args):
+        raise ValueError("invalid value")
+
+    class DriverError(Exception):
+        pass
+
+    def failure():
+        raise DriverError("no answer")
+
+    recorder.overrides["set_DR"] = invalid
+    recorder.overrides["ping"] = failure
+
+    with SMW_SX1262M0Client(server.path) as client:
+        with pytest.raises(ValueError, match="invalid value"):
+            client.set_DR(99)
+        # the types that are not built in are reported as OSError
+        with pytest.raises(OSError, match="DriverError: no answer"):
+            client.ping()
+
+
+def test_malformed_frames_are_answered(daemon):
+    server, recorder = daemon
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(5)
+        sock.connect(server.path)
+        data = b"{not json"
+        sock.sendall(FRAME_HEADER.pack(len(data), 1) + data)
+        kind, (result, error) = _receiveFrame(sock)
+        assert kind == RESPONSE and result is None
+        assert error[0] == "ValueError" and "invalid frame" in error[1]
+
+        # a valid JSON frame with an invalid payload
+        _sendFrame(sock, 1, ["ping"])
+        kind, (result, error) = _receiveFrame(sock)
+        assert error[0] == "ValueError"
+
+        # the connection is still served
+        _sendFrame(sock, 1, ["isConnected", [], {}])
+        kind, (result, error) = _receiveFrame(sock)
+        assert error is None and result == recorder.results["isConnected"]
+
+
+def test_slow_subscribers_do_not_block_events(daemon):
+    server, _ = daemon
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as slow:
+        slow.connect(server.path)
+        _sendFrame(slow, SUBSCRIBE, ["downlink"])
+        with SMW_SX1262M0Client(server.path) as client:
+            events = []
+            client.addCallback("downlink", lambda *args: events.append(args))
+            client.ping()  # the subscriptions were handled
+            assert len(server.clients) == 2
+
+            # more data than the socket buffers and the queue can hold (the slow client never reads)
+            deadline = time.monotonic() + 10
+            count = OUTBOX_SIZE * 4
+            for index in range(count):
+                start = time.monotonic()
+                server.broadcast("downlink", (index, "x" * 4096))
+                assert time.monotonic() - start < 0.5
+                if index % (OUTBOX_SIZE // 2) == 0:
+                    # let the other client keep up
+                    while len(events) <= index and time.monotonic() < deadline:
+                        time.sleep(0.001)
+
+            # the slow client was disconnected, the other one received every event
+            while (len(server.clients) > 1 or len(events) < count) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert len(server.clients) == 1
+            assert [args[0] for args in events] == list(range(count))
+
+
+def test_local_methods_are_refused(daemon):
+    server, _ = daemon
+
+    with SMW_SX1262M0Client(server.path) as client:
+        with pytest.raises(AttributeError):
+            client.saveSession
+        with pytest.raises(AttributeError):
+            client.warmStart
+        # a request sent by another client implementation
+        with pytest.raises(AttributeError):
+            client._SMW_SX1262M0Client__request("saveSession", ["/tmp/session"], {})
+
+
+def test_socket_is_private(daemon):
+    server, _ = daemon
+
+    assert stat.S_IMODE(os.stat(server.path).st_mode) == 0o600
+
+
+def test_existing_files_are_not_removed(lorawan, tmp_path):
+    path = tmp_path / "smw.sock"
+    path.write_text("data")
+
+    with pytest.raises(FileExistsError):
+        ModuleServer(lorawan, str(path))
+    assert path.read_text() == "data"
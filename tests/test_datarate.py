@@ -0,0 +1,29 @@
+from RoboCore_SMW_SX1262M0 import CommandResponse, DataRateOptimizer, LinkMonitor
+
+
+def optimizer(module, lorawan, dr, **options):
+    module.state["DR"] = str(dr)
+    links = LinkMonitor()
+    result = DataRateOptimizer(lorawan, links, **options)
+    assert result.enable() == CommandResponse.OK
+    return result, links
+
+
+def test_failing_downlinks_step_down_without_snr(module, lorawan):
+    adr, _ = optimizer(module, lorawan, 3)
+    for _ in range(4):
+        adr.recordDownlink(False)
+    assert adr.target() == 2
+    assert adr.update() == 2 and module.state["DR"] == "2"
+
+
+def test_thresholds_depend_on_the_bandwidth(module, lorawan):
+    adr, links = optimizer(module, lorawan, 5, margin=0, hysteresis=0, maxDR=6)
+    for _ in range(10):
+        links.record("lorawan", snr=-7)
+
+    # DR6 (SF8, 500 kHz) needs 6 dB more than DR4 (SF8, 125 kHz)
+    assert adr.target() == 5
+    for _ in range(20):
+        links.record("lorawan", snr=-3)
+    assert adr.target() == 6
@@ -0,0 +1,72 @@
+import threading
+import time
+
+from RoboCore_SMW_SX1262M0 import CancelToken, CommandResponse
+
+
+def cancel_after(seconds):
+    token = CancelToken()
+    threading.Timer(seconds, token.cancel).start()
+    return token
+
+
+def assert_idle(lorawan, module):
+    # the bytes left by the interrupted call are not taken as the next response
+    module.state["DR"] = "4"
+    assert lorawan.get_DR() == (CommandResponse.OK, 4)
+    assert lorawan.metrics()["resyncs"] == 0
+    assert module.in_waiting == 0
+
+
+def test_cancelled_listen_returns_early(lorawan, module):
+    # a frame that is still arriving when the call is cancelled
+    module.reply("\r\nRSSI=-40 SNR=7 Te", 0.02)
+
+    start = time.monotonic()
+    assert lorawan.P2P_listen(5000, cancel=cancel_after(0.1)) is False
+    assert time.monotonic() - start < 1
+    assert_idle(lorawan, module)
+
+
+def test_expired_receive_returns_early(lorawan, module):
+    module.reply("\r\nRSSI=-40 SNR=7 Text-> 00", 0.02)
+
+    start = time.monotonic()
+    assert lorawan.P2P_receive(5000, deadline=lorawan.millis() + 100) is False
+    assert time.monotonic() - start < 1
+    assert_idle(lorawan, module)
+
+
+def test_expired_join_discards_the_late_response(lorawan, module):
+    module.replies["AT+JOIN"] = ["\r\nAT_ERROR\r\n"]
+    module.reply = lambda text, delay=0.0, reply=module.reply: reply(text, delay + 0.3)
+
+    start = time.monotonic()
+    assert lorawan.join(deadline=lorawan.millis() + 50) == CommandResponse.TIMEOUT
+    assert time.monotonic() - start < 0.3
+    assert module.log == ["AT+JOIN"]
+
+    time.sleep(0.35)  # the AT_ERROR of the join arrives
+    del module.reply
+    assert_idle(lorawan, module)
+
+
+def test_cancelled_read_line_returns_early(lorawan, module):
+    module.reply("+EVT:RX_1, PORT 1", 0.02)
+
+    start = time.monotonic()
+    assert lorawan.readLine(5000, cancel=cancel_after(0.1)) is None
+    assert time.monotonic() - start < 1
+    assert_idle(lorawan, module)
+
+
+def test_cancelled_token_does_not_use_the_module(lorawan, module):
+    token = CancelToken()
+    token.cancel()
+    module.reply("\r\nnoise")
+
+    assert lorawan.get_DR(cancel=token) == (CommandResponse.CANCELLED, None)
+    assert lorawan.readLine(1000, cancel=token) is None
+    assert lorawan.P2P_listen(1000, cancel=token) is False
+    assert module.log == []
+    assert_idle(lorawan, module)
@@ -0,0 +1,33 @@
+import time
+
+from RoboCore_SMW_SX1262M0 import DownlinkReceiver
+
+
+def test_event_delivers_downlink(module, lorawan):
+    receiver = DownlinkReceiver(lorawan)
+    receiver.start()
+    try:
+        module.state["RECVB"] = "5:0A0B"
+        module.reply("\r\n+EVT:RX_C\r\n")
+        downlink = receiver.get(2)
+        assert (downlink.port, downlink.message, downlink.binary) == (5, "0A0B", True)
+    finally:
+        receiver.stop()
+
+
+def test_other_lines_do_not_read(module, lorawan):
+    receiver = DownlinkReceiver(lorawan)
+    receiver.start()
+    try:
+        module.reply("\r\n+EVT:JOINED\r\n")
+        time.sleep(0.2)
+        assert "AT+RECVB=?" not in module.log
+    finally:
+        receiver.stop()
+
+
+def test_idle_wait_does_not_use_the_cpu(lorawan):
+    lorawan.ping()
+    start = time.process_time()
+    assert lorawan.readLine(500) is None
+    assert time.process_time() - start < 0.25
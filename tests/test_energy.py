@@ -0,0 +1,82 @@
+import pytest
+
+from RoboCore_SMW_SX1262M0 import CommandResponse, EnergyModel, LinkMonitor, TxPowerController
+from RoboCore_SMW_SX1262M0.airtime import requiredSNR, timeOnAir
+
+
+def test_charge_per_uplink():
+    model = EnergyModel()
+    uplink = model.uplink(10, 5, txPower=0)  # SF7, 125 kHz, 22 dBm
+
+    airtime = timeOnAir(10 + 13, 7, 125)
+    rxTime = 2 * 8 * 128 / 125
+    assert uplink["airtime"] == pytest.approx(airtime)
+    assert uplink["rxTime"] == pytest.approx(rxTime)
+    assert uplink["charge"] == pytest.approx((118.0 * airtime + 4.6 * rxTime) / 1000)
+    assert uplink["energy"] == pytest.approx(uplink["charge"] * 3.3)
+
+    # a lower power and a faster Data Rate use less charge
+    assert model.uplink(10, 5, txPower=10)["charge"] < uplink["charge"]
+    assert model.uplink(10, 0)["charge"] > uplink["charge"]
+    # measured currents replace the table
+    assert EnergyModel(txCurrents={0: 100.0}).uplink(10, 5)["charge"] == \
+        pytest.approx((100.0 * airtime + 4.6 * rxTime) / 1000)
+
+
+def test_charge_per_day():
+    model = EnergyModel()
+    uplink = model.uplink(10, 5)
+    daily = model.daily(10, 5, uplinksPerDay=96)
+
+    radio = 96 * uplink["charge"]
+    sleep = 0.0012 * (86400000 - 96 * (uplink["airtime"] + uplink["rxTime"])) / 1000
+    assert daily["charge"] == pytest.approx((radio + sleep) / 3600)
+    assert daily["current"] == pytest.approx((radio + sleep) / 86400)
+    assert daily["energy"] == pytest.approx((radio + sleep) * 3.3 / 1000)
+    assert daily["radioShare"] == pytest.approx(radio / (radio + sleep))
+    assert model.daily(10, 5, uplinksPerDay=0)["radioShare"] == 0
+
+
+def controller(module, lorawan, dr, txPower, **options):
+    module.state["DR"] = str(dr)
+    module.state["TXP"] = str(txPower)
+    links = LinkMonitor()
+    result = TxPowerController(lorawan, links, **options)
+    assert result.enable() == CommandResponse.OK
+    return result, links
+
+
+def test_power_goes_down_one_step(module, lorawan):
+    power, links = controller(module, lorawan, 5, 0, margin=10, hysteresis=0)
+    assert power.target() is None
+    for _ in range(10):
+        links.record("lorawan", snr=10)
+
+    # 7.5 dB of surplus allows 16 dBm (TXP 7), but the first step is 20 dBm (TXP 5)
+    assert power.target() == 5
+    assert power.update() == 5 and module.state["TXP"] == "5"
+    assert power.report() == {"txPower": 5, "outputPower": 20, "changes": 1}
+
+
+def test_wide_bandwidth_needs_more_snr(module, lorawan):
+    # DR6 is SF8 at 500 kHz: 6 dB more than SF8 at 125 kHz
+    assert requiredSNR(6) == pytest.approx(requiredSNR(4) + 6.02, abs=0.01)
+
+    power, links = controller(module, lorawan, 6, 5, margin=10, hysteresis=0)
+    for _ in range(10):
+        links.record("lorawan", snr=10)
+    # 3.98 dB of surplus keeps 20 dBm (the SF8 limit alone would allow 12 dBm)
+    assert power.target() == 5
+
+    power.setDR(4)
+    assert power.target() == 6
+
+
+def test_failing_downlinks_restore_the_power(module, lorawan):
+    power, links = controller(module, lorawan, 5, 9)
+    for _ in range(10):
+        links.record("lorawan", snr=20)
+    for _ in range(4):
+        power.recordDownlink(False)
+
+    assert power.target() == 0
@@ -0,0 +1,44 @@
+import pytest
+
+from RoboCore_SMW_SX1262M0 import LinkMonitor
+from RoboCore_SMW_SX1262M0 import monitor
+
+
+@pytest.fixture(params=["numpy", "lists"])
+def backend(request, monkeypatch):
+    if request.param == "lists":
+        monkeypatch.setattr(monitor, "numpy", None)
+    elif monitor.numpy is None:
+        pytest.skip("NumPy is not installed")
+
+
+def test_ring_buffer_keeps_the_newest_samples(backend):
+    links = LinkMonitor(size=4)
+    for i in range(6):
+        links.record("p2p", rssi=-40 - i, snr=i, timestamp=float(i))
+
+    times, rssi, snr = links.series("p2p")
+    assert list(times) == [2.0, 3.0, 4.0, 5.0]
+    assert list(rssi) == [-42, -43, -44, -45]
+    assert list(links.series("p2p", window=2)[2]) == [4, 5]
+
+
+def test_series_is_a_copy(backend):
+    links = LinkMonitor(size=2)
+    links.record("p2p", rssi=-40, snr=1, timestamp=0.0)
+    _, rssi, _ = links.series("p2p")
+    links.record("p2p", rssi=-50, snr=1, timestamp=1.0)
+    links.record("p2p", rssi=-60, snr=1, timestamp=2.0)
+    assert list(rssi) == [-40]
+
+
+def test_statistics(backend):
+    links = LinkMonitor()
+    for i in range(11):
+        links.record("lorawan", rssi=-100 + i, snr=None, timestamp=float(i))
+
+    statistics = links.statistics("lorawan")
+    assert statistics["rssi"]["count"] == 11
+    assert statistics["rssi"]["min"] == -100 and statistics["rssi"]["max"] == -90
+    assert statistics["rssi"]["trend"] == pytest.approx(1.0)
+    assert links.statistics("other") == {"rssi": None, "snr": None}
@@ -0,0 +1,25 @@
+from RoboCore_SMW_SX1262M0 import FrameArchive
+
+
+def test_receive_emits_the_decoded_bytes(lorawan, module):
+    events = []
+    lorawan.addCallback("p2p", lambda *args: events.append(args))
+
+    module.reply("\r\nRSSI=-40 SNR=7 Text-> 00FF10\n\r", 0.05)
+    data, rssi, snr = lorawan.P2P_receive(1000)
+    assert (data, rssi, snr) == (b"\x00\xff\x10", -40, 7)
+    module.reply("\r\nRSSI=-41 SNR=6 Text-> hello\n\r", 0.05)
+    assert lorawan.P2P_listen(1000)[0] == "hello"
+
+    assert events == [(b"\x00\xff\x10", -40, 7), ("hello", -41, 6)]
+
+
+def test_archive_stores_binary_frames(lorawan, module, tmp_path):
+    with FrameArchive(tmp_path) as archive:
+        archive.attach(lorawan, "node")
+        module.reply("\r\nRSSI=-40 SNR=7 Text-> 01FF10\n\r", 0.05)
+        lorawan.P2P_receive(1000)
+
+        records = archive.query("node")
+        payloads = [bytes(payload)[:length] for payload, length in zip(records["payload"], records["length"])]
+        assert payloads == [b"\x01\xff\x10"]
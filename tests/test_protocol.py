@@ -0,0 +1,85 @@
+import pytest
+
+from RoboCore_SMW_SX1262M0 import CommandResponse, SMW_SX1262M0
+
+
+@pytest.mark.parametrize("response, cmd, status, value", [
+    ("\r\nOK\r\n", None, CommandResponse.OK, None),
+    ("OK", None, CommandResponse.OK, None),
+    ("", None, CommandResponse.TIMEOUT, None),
+    ("\r\n\r\n", None, CommandResponse.TIMEOUT, None),
+    ("\r\nAT_PARAM_ERROR\r\n", None, CommandResponse.AT_PARAM_ERROR, None),
+    ("\r\n-40\r\nOK\r\n", "CMD_RSSI", CommandResponse.OK, -40),
+    ("\r\n+EVT:RX_C\r\n7\r\nOK\r\n", "CMD_SNR", CommandResponse.OK, 7),  # event before the value
+    ("\r\nOK\r\n", "CMD_RSSI", CommandResponse.OK, None),  # no value
+    ("\r\n-4x\r\nOK\r\n", "CMD_RSSI", CommandResponse.INVALID_RESPONSE, None),
+    ("\r\n-40\r\nO", "CMD_RSSI", CommandResponse.INVALID_RESPONSE, None),  # truncated
+    ("\r\n5:0A0B\r\nOK\r\n", "CMD_RECVB", CommandResponse.OK, (5, "0A0B")),
+    ("\r\nversion\r\nOK\r\n", "CMD_VER", CommandResponse.OK, "version"),
+])
+def test_parse_response(response, cmd, status, value):
+    result = SMW_SX1262M0.parseResponse(response, cmd)
+    assert (result.status, result.value, result.raw) == (status, value, response)
+
+
+def test_invalid_response_is_retried_after_resync(lorawan, module):
+    module.replies["AT+RSSI=?"] = ["\r\n-4x\r\nOK\r\n"]
+
+    assert lorawan.get_RSSI() == (CommandResponse.OK, -40)
+    assert module.log == ["AT+RSSI=?", "AT", "AT+RSSI=?"]
+    metrics = lorawan.metrics()
+    assert (metrics["resyncs"], metrics["retries"]) == (1, 1)
+
+
+def test_last_attempt_returns_invalid_response(lorawan, module):
+    module.replies["AT+RSSI=?"] = ["\r\n-4x\r\nOK\r\n"] * 2
+
+    assert lorawan.get_RSSI() == (CommandResponse.INVALID_RESPONSE, None)
+    assert module.log == ["AT+RSSI=?", "AT", "AT+RSSI=?", "AT"]
+
+
+def test_failed_resync_stops_the_retries(lorawan, module):
+    module.replies["AT+RSSI=?"] = ["\r\n-4x\r\nOK\r\n"]
+    module.replies["AT"] = ["\r\nnoise\r\nOK\r\n"] * 3
+
+    assert lorawan.get_RSSI() == (CommandResponse.INVALID_RESPONSE, None)
+    assert module.log == ["AT+RSSI=?", "AT", "AT", "AT"]
+    assert lorawan.metrics()["retries"] == 0
+
+    # the next command uses the module again
+    assert lorawan.get_RSSI() == (CommandResponse.OK, -40)
+
+
+def test_pipeline_keeps_the_window_and_the_order(lorawan, module):
+    module.state.update({"DR": "3", "ADR": "1", "TXP": "5", "CLASS": "C", "CFM": "1"})
+    events = []
+    write, reset = module.write, module.reset_input_buffer
+
+    def written(data):
+        # commands sent before this one whose response was not read yet
+        events.append(("write", lorawan._SMW_SX1262M0__expected))
+        return write(data)
+
+    def flushed():
+        events.append(("flush", len(module.rx)))
+        reset()
+
+    module.write, module.reset_input_buffer = written, flushed
+    commands = ["AT+DR=?", "AT+ADR=?", "AT+TXP=?", "AT+CLASS=?", "AT+CFM=?"]
+    responses = lorawan.pipeline(commands, window=2)
+
+    assert [SMW_SX1262M0.parseResponse(response, None).status for response in responses] == \
+        [CommandResponse.OK] * 5
+    assert [response.split()[0] for response in responses] == ["3", "1", "5", "C", "1"]
+    assert module.log == commands
+
+    # at most 2 commands in flight, and the buffer is cleared only after the last response
+    assert [count for kind, count in events if kind == "write"] == [0, 1, 1, 1, 1]
+    assert [kind for kind, _ in events] == ["write"] * 5 + ["flush"]
+    assert events[-1] == ("flush", 0)
+
+    # every response is received before the first one is read
+    events.clear()
+    responses = lorawan.pipeline(commands, window=5)
+    assert [response.split()[0] for response in responses] == ["3", "1", "5", "C", "1"]
+    assert events == [("write", count) for count in range(5)] + [("flush", 0)]
@@ -0,0 +1,75 @@
+import csv
+import json
+
+import pytest
+
+from RoboCore_SMW_SX1262M0.provision import provisionPort, readManifest, writeReport
+
+
+def test_csv_manifest(tmp_path):
+    path = tmp_path / "devices.csv"
+    path.write_text("DevEUI,DR,ADR,Owner\n"
+                    "aa:bb,3,,lab\n"
+                    "0011223344556677,1,1,\n")
+
+    assert readManifest(str(path)) == {"AABB": {"DR": "3"}, "0011223344556677": {"DR": "1", "ADR": "1"}}
+
+
+def test_json_manifest(tmp_path):
+    listed = tmp_path / "list.json"
+    listed.write_text(json.dumps([{"DevEUI": "aa:bb", "DR": 3, "Class": "C", "Owner": "lab"}]))
+    keyed = tmp_path / "keyed.json"
+    keyed.write_text(json.dumps({"aa:bb": {"DR": 3, "Class": "C"}}))
+
+    assert readManifest(str(listed)) == readManifest(str(keyed)) == {"AABB": {"DR": 3, "Class": "C"}}
+
+
+@pytest.mark.parametrize("name, content, message", [
+    ("devices.csv", "DevEUI,DR\naa:bb,3\n,4\n", "row 3: no DevEUI"),
+    ("devices.csv", "DR\n3\n", "row 2: no DevEUI"),
+    ("devices.csv", "DevEUI,DR\naa:bb,3\nAABB,4\n", "row 3: duplicate DevEUI AABB"),
+    ("devices.json", '[{"DevEUI": "aa:bb"}, {"DR": 3}]', "row 2: no DevEUI"),
+    ("devices.json", '[{"DevEUI": "aa:bb"}, "cc:dd"]', "row 2: expected an object"),
+    ("devices.json", '"aa:bb"', "expected a list or an object"),
+])
+def test_invalid_rows_are_reported(tmp_path, name, content, message):
+    path = tmp_path / name
+    path.write_text(content)
+
+    with pytest.raises(ValueError, match=message):
+        readManifest(str(path))
+
+
+def test_provision_and_verify(module):
+    manifest = {"AABB": {"DR": "3", "ADR": "1"}}
+
+    report = provisionPort(module, manifest)
+    assert (report["devEUI"], report["result"], report["errors"]) == ("AA:BB", "ok", [])
+    assert (module.state["DR"], module.state["ADR"]) == ("3", "1")
+    assert "AT+SAVE" in module.log
+
+    # a value that is not stored by the module
+    module.replies["AT+DR=?"] = ["\r\n0\r\nOK\r\n"]
+    report = provisionPort(module, manifest, save=False)
+    assert (report["result"], report["errors"]) == ("verification error", ["DR"])
+
+    module.replies["AT+ADR=1"] = ["\r\nAT_PARAM_ERROR\r\n"]
+    assert provisionPort(module, manifest)["result"] == "configuration error"
+    assert provisionPort(module, {"CCDD": {}})["result"] == "unknown device"
+
+
+def test_report_files(module, tmp_path):
+    reports = [provisionPort(module, {"AABB": {"DR": "2"}}),
+               provisionPort(module, {"AABB": {"DR": "9"}})]
+    assert [report["result"] for report in reports] == ["ok", "configuration error"]
+
+    writeReport(reports, str(tmp_path / "report.csv"))
+    with open(tmp_path / "report.csv", newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert [(row["devEUI"], row["result"], row["errors"]) for row in rows] == [
+        ("AA:BB", "ok", ""), ("AA:BB", "configuration error", "DR")]
+    assert int(rows[0]["duration"]) >= 0
+
+    writeReport(reports, str(tmp_path / "report.json"))
+    with open(tmp_path / "report.json") as file:
+        assert json.load(file) == reports
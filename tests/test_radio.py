@@ -0,0 +1,42 @@
+import pytest
+
+from RoboCore_SMW_SX1262M0 import CommandResponse, P2P_PRESETS, P2PConfig
+from RoboCore_SMW_SX1262M0.airtime import timeOnAir
+
+
+@pytest.mark.parametrize("sf, bw, expected", [(5, 500, 3.024), (6, 125, 21.632), (7, 125, 41.216)])
+def test_time_on_air(sf, bw, expected):
+    # SX1261/2 datasheet (6.1.4), 10 bytes, CR 4/5, 8 preamble symbols, explicit header and CRC
+    assert timeOnAir(10, sf, bw) == pytest.approx(expected)
+    assert P2PConfig(bandwidth=bw, sf=sf).timeOnAir(10) == pytest.approx(expected)
+
+
+def test_p2p_start_uses_the_last_configuration(lorawan, module):
+    assert lorawan.P2P_start() == CommandResponse.OK
+    assert module.log == ["AT+RXLRA=915200:0"]
+
+    assert lorawan.set_P2PConfig(P2PConfig(frequency=903900)) == CommandResponse.OK
+    assert lorawan.P2P_send(b"\x01") == CommandResponse.OK
+    assert module.log[-1] == "AT+TXLRA=903900:0:01"
+    assert lorawan.P2P_start(915200, True) == CommandResponse.OK
+    assert module.log[-1] == "AT+RXLRA=915200:1"
+    # the module is never queried on the way
+    assert "AT+TCONF=?" not in module.log
+
+
+def test_rejected_configuration_is_not_used(lorawan, module):
+    module.replies["AT+TCONF=903900:14:125:7:1:8"] = ["\r\nAT_PARAM_ERROR\r\n"]
+
+    assert lorawan.set_P2PConfig(P2PConfig(frequency=903900)) == CommandResponse.AT_PARAM_ERROR
+    assert lorawan.P2P_send(b"\x01") == CommandResponse.OK
+    assert module.log[-1] == "AT+TXLRA=915200:0:01"
+
+
+def test_presets_cannot_be_changed():
+    preset = P2P_PRESETS["balanced"]
+    with pytest.raises(AttributeError):
+        preset.sf = 12
+    with pytest.raises(TypeError):
+        P2P_PRESETS["balanced"] = P2PConfig()
+    assert preset.replace(sf=12).sf == 12 and preset.sf == 9
+    assert len({preset, preset.replace()}) == 1
@@ -0,0 +1,32 @@
+import os
+import stat
+
+from RoboCore_SMW_SX1262M0 import SMW_SX1262M0, CommandResponse
+
+
+def test_session_file_is_private(lorawan, tmp_path):
+    path = tmp_path / "session.json"
+    assert lorawan.set_AppKey("00112233445566778899AABBCCDDEEFF") == CommandResponse.OK
+    assert lorawan.saveSession(str(path)) == CommandResponse.OK
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+
+def test_warm_start_resumes_joined_session(module, lorawan, tmp_path):
+    path = str(tmp_path / "session.json")
+    lorawan.set_DevAddr("01020304")
+    assert lorawan.saveSession(path) == CommandResponse.OK
+
+    other = SMW_SX1262M0(module)
+    assert other.warmStart(path, {"DevAddr": "01:02:03:04"})
+    assert not other.warmStart(path, {"DevAddr": "01:02:03:05"})
+    module.state["NJS"] = "0"
+    assert not other.warmStart(path)
+
+
+def test_warm_start_refuses_session_not_joined(module, lorawan, tmp_path):
+    path = str(tmp_path / "session.json")
+    module.state["NJS"] = "0"
+    assert lorawan.saveSession(path) == CommandResponse.OK
+
+    # the module also reports not joined, but the session must still be refused
+    assert not SMW_SX1262M0(module).warmStart(path)
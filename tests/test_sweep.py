@@ -0,0 +1,38 @@
+from RoboCore_SMW_SX1262M0 import SMW_SX1262M0, P2PSweep, SimulatedAir, SimulatedModule
+from RoboCore_SMW_SX1262M0 import sweep
+from RoboCore_SMW_SX1262M0.sweep import best, formatTable
+
+
+def test_sweep_measures_the_link(monkeypatch):
+    # the frames of SF7 are lost (wait less for them)
+    monkeypatch.setattr(sweep, "LISTEN_GUARD", 50)
+    # SNR of -13.4 dB (below the limit of SF7, above the ones of SF10 and SF12)
+    air = SimulatedAir(distance=15000, shadowing=0, timeScale=0.02, seed=1)
+    transmitter = SMW_SX1262M0(SimulatedModule(air, "transmitter", baudrate=None))
+    receiver = SMW_SX1262M0(SimulatedModule(air, "receiver", baudrate=None))
+
+    results = P2PSweep(transmitter, receiver, frames=10).run(sfs=(7, 10, 12), bandwidths=(125,))
+    sf7, sf10, sf12 = results
+
+    assert [result["sent"] for result in results] == [10, 10, 10]
+    assert sf7["per"] == 1.0 and sf7["rssi"] is None and sf7["goodput"] == 0.0
+    assert sf10["per"] == sf12["per"] == 0.0
+    for result in (sf10, sf12):
+        assert result["error"] is None
+        assert result["per"] == 1 - result["received"] / result["sent"]
+        # the RSSI is at the noise floor of 125 kHz
+        assert result["rssi"]["min"] == result["rssi"]["max"] == -117
+        assert result["snr"]["p10"] == result["snr"]["p50"] == result["snr"]["p90"] == -13
+        assert result["goodput"] > 0
+    # SF10 sends the same payload in less time
+    assert sf10["timeOnAir"] < sf12["timeOnAir"]
+    assert sf10["goodput"] > sf12["goodput"]
+
+    table = formatTable(results).splitlines()
+    assert len(table) == 4
+    assert table[1].split()[:7] == ["915200", "7", "125", "16", "10", "0", "1.00"]
+    assert table[3].split()[6:10] == ["0.00", "-117.0", "-13.0", "-13.0"]
+
+    assert best(results, 0.1) is sf10
+    assert best([sf7, sf12], 0.1) is sf12
+    assert best([sf7], 0.5) is None
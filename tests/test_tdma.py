@@ -0,0 +1,67 @@
+import threading
+
+import pytest
+
+from RoboCore_SMW_SX1262M0 import (CommandResponse, SMW_SX1262M0, SimulatedAir, SimulatedModule,
+                                   TDMACoordinator, TDMANode, TDMASchedule)
+
+
+def test_schedule_round_trip():
+    schedule = TDMASchedule.design(8, payloadSize=16)
+    network, sequence, received = TDMASchedule.fromBeacon(schedule.toBeacon(3, 70000))
+
+    assert (network, sequence) == (3, 70000 % 0x10000)
+    assert received.slots == 8
+    assert received.frameTime == pytest.approx(schedule.frameTime, abs=1e-3)
+    for slot in range(8):
+        assert received.slotOf(0, schedule.slotStart(0, slot)) == slot
+    assert schedule.slotOf(0, schedule.slotStart(0, 8)) is None
+    assert 0 < schedule.efficiency(16) < 1
+
+
+@pytest.mark.parametrize("baudrate", [9600, None])
+def test_every_slot_delivers_in_the_simulator(baudrate):
+    air = SimulatedAir(distance=10, shadowing=0, seed=1)
+
+    def device():
+        return SMW_SX1262M0(SimulatedModule(air, baudrate=baudrate))
+
+    received = []
+    coordinator = TDMACoordinator(device(), slots=3, baudrate=baudrate,
+                                  callback=lambda *args: received.append(args))
+    nodes = [TDMANode(device(), slot=slot, baudrate=baudrate) for slot in range(3)]
+    statuses = {}
+
+    def send(node):
+        statuses[node.slot] = [node.send(bytes([node.slot, i]) * 4) for i in range(3)]
+
+    thread = threading.Thread(target=coordinator.run)
+    thread.start()
+    try:
+        senders = [threading.Thread(target=send, args=(node,)) for node in nodes]
+        for sender in senders:
+            sender.start()
+        for sender in senders:
+            sender.join()
+        # the last frames are received before the next beacon
+        coordinator.stop()
+    finally:
+        coordinator.stop()
+        thread.join()
+
+    assert statuses == {slot: [CommandResponse.OK] * 3 for slot in range(3)}
+    metrics = coordinator.metrics()
+    assert metrics["frames"] == [3, 3, 3]
+    assert metrics["misaligned"] == 0
+    assert sorted(payload for payload, _, _, _ in received) == \
+        sorted(bytes([slot, i]) * 4 for slot in range(3) for i in range(3))
+    for node in nodes:
+        assert node.metrics()["missed"] == 0
+        assert node.metrics()["late"] < metrics["schedule"].guard
+
+
+def test_node_without_beacons():
+    air = SimulatedAir(seed=1)
+    node = TDMANode(SMW_SX1262M0(SimulatedModule(air)), slot=0)
+
+    assert node.send(b"x", timeout=200) == CommandResponse.TIMEOUT
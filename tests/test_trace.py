@@ -0,0 +1,45 @@
+from RoboCore_SMW_SX1262M0 import SMW_SX1262M0, CommandResponse, ReplayTransport, TraceTransport, readTrace
+from RoboCore_SMW_SX1262M0.trace import TRACE_DISCARD, TRACE_RX, TRACE_TX, analyzeTrace
+
+
+def test_records_are_written_at_once(module, tmp_path):
+    path = str(tmp_path / "trace.bin")
+    trace = TraceTransport(module, path)
+    trace.write(b"AT\n")
+
+    # readable before close(), as after a crash
+    assert readTrace(path) == [(readTrace(path)[0][0], TRACE_TX, b"AT\n")]
+    trace.close()
+
+
+def test_discarded_bytes_are_recorded(module, tmp_path):
+    path = str(tmp_path / "trace.bin")
+    trace = TraceTransport(module, path)
+    module.reply("noise")
+    trace.reset_input_buffer()
+    trace.close()
+
+    assert [(direction, data) for _, direction, data in readTrace(path)] == [(TRACE_DISCARD, b"noise")]
+
+
+def test_flush_is_replayed(module, tmp_path):
+    path = str(tmp_path / "trace.bin")
+    lorawan = SMW_SX1262M0(TraceTransport(module, path))
+    assert lorawan.get_DR() == (CommandResponse.OK, 0)
+    module.reply("\r\nnoise")
+    lorawan.flush()
+    module.state["DR"] = "3"
+    assert lorawan.get_DR() == (CommandResponse.OK, 3)
+    lorawan.close()
+
+    # the discarded bytes are not taken as a response
+    assert [entry.response for entry in analyzeTrace(path)] == [["0", "OK"], ["3", "OK"]]
+
+    # nor released by the replay
+    replay = ReplayTransport(path, speed=None)
+    lorawan = SMW_SX1262M0(replay)
+    assert lorawan.get_DR() == (CommandResponse.OK, 0)
+    lorawan.flush()
+    assert lorawan.get_DR() == (CommandResponse.OK, 3)
+    assert replay.in_waiting == 0
+    lorawan.close()
@@ -0,0 +1,129 @@
+import socket
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from RoboCore_SMW_SX1262M0 import SMW_SX1262M0, CommandResponse, SocketTransport, openTransport
+
+
+@pytest.fixture
+def server():
+    """TCP server that answers OK to every line, counting the connections."""
+
+    listener = socket.create_server(("127.0.0.1", 0))
+    connections = []
+
+    def serve():
+        while True:
+            try:
+                connection, _ = listener.accept()
+            except OSError:
+                return
+            connections.append(connection)
+            threading.Thread(target=answer, args=(connection,), daemon=True).start()
+
+    def answer(connection):
+        with connection:
+            while True:
+                try:
+                    data = connection.recv(4096)
+                except OSError:
+                    return
+                if not data:
+                    return
+                for _ in range(data.count(b"\n")):
+                    connection.sendall(b"\r\nOK\r\n")
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield listener.getsockname(), connections
+    listener.close()
+
+
+def test_reconnect_dials_the_socket_again(server):
+    address, connections = server
+    lorawan = SMW_SX1262M0(socket.create_connection(address))
+    assert lorawan.ping() == CommandResponse.OK
+
+    lorawan.reconnect()
+    assert lorawan.ping() == CommandResponse.OK
+    assert len(connections) == 2
+    lorawan.close()
+
+
+def test_reopen_without_address_is_an_error():
+    first, second = socket.socketpair()
+    transport = SocketTransport(first)
+    transport.close()
+    with pytest.raises(ConnectionError):
+        transport.open()
+    second.close()
+
+
+def count_calls(module):
+    """Counts the calls of open() and close() of a fake module."""
+
+    calls = []
+    for name in ("open", "close"):
+        function = getattr(module, name)
+        setattr(module, name, lambda name=name, function=function: (calls.append(name), function()))
+    return calls
+
+
+def test_port_is_opened_by_the_first_command(module):
+    module.is_open = False
+    calls = count_calls(module)
+    lorawan = SMW_SX1262M0(module)
+    assert not lorawan.isOpen() and calls == []
+
+    assert lorawan.ping() == CommandResponse.OK
+    assert lorawan.isOpen() and module.is_open
+    assert lorawan.ping() == CommandResponse.OK
+    assert calls == ["open"]
+    lorawan.close()
+
+
+def test_port_is_reopened_after_close(lorawan, module):
+    calls = count_calls(module)
+    assert lorawan.set_DR(3) == CommandResponse.OK
+    lorawan.close()
+    assert not lorawan.isOpen() and not module.is_open
+
+    # the same object, with its configuration
+    assert lorawan.get_DR() == (CommandResponse.OK, 3)
+    assert lorawan.isOpen() and module.is_open
+    assert calls == ["close", "open"]
+
+
+def test_reconnect_keeps_the_object(lorawan, module):
+    calls = count_calls(module)
+    with lorawan:
+        assert lorawan.ping() == CommandResponse.OK
+        lorawan.reconnect()
+        assert lorawan.isOpen() and module.is_open
+        assert lorawan.ping() == CommandResponse.OK
+    assert not lorawan.isOpen()
+    assert calls == ["close", "open", "close"]
+
+    # a port that fails to close is opened again
+    def broken():
+        module.is_open = False
+        raise OSError("device disconnected")
+
+    lorawan.open()
+    module.close = broken
+    lorawan.reconnect()
+    assert lorawan.isOpen() and module.is_open
+    assert lorawan.ping() == CommandResponse.OK
+    del module.close
+    lorawan.close()
+
+
+def test_open_transport_reuses_the_object(module):
+    assert openTransport(module) is module
+    module.close()
+    assert openTransport(module) is module and module.is_open
+
+    # a transport that cannot be reopened is returned as it is
+    transport = SimpleNamespace(is_open=False)
+    assert openTransport(transport) is transport and not transport.is_open
@@ -0,0 +1,59 @@
+import pytest
+
+from RoboCore_SMW_SX1262M0 import HealthWatchdog
+
+
+def hang(module, revive):
+    """Makes the module silent until the event that revives it: "command" (the first command 
+    after the heartbeat), "newline" (a bare line break), "ATZ", "open" or None (never)."""
+
+    alive = []
+    handle, write, reopen = module.handle, module.write, module.open
+    commands = []
+
+    def silent(line):
+        commands.append(line)
+        if (revive == "command" and len(commands) > 1) or (revive == "ATZ" and line == "ATZ"):
+            alive.append(line)
+        if alive:
+            handle(line)
+
+    def written(data):
+        if revive == "newline" and bytes(data).strip() == b"":
+            alive.append("")
+        return write(data)
+
+    def opened():
+        if revive == "open":
+            alive.append("open")
+        reopen()
+
+    module.handle, module.write, module.open = silent, written, opened
+
+
+@pytest.mark.parametrize("revive, step", [
+    ("command", "drain"),
+    ("newline", "probe"),
+    ("ATZ", "reset"),
+    ("open", "reopen"),
+    (None, None),
+])
+def test_recovery_escalates(lorawan, module, revive, step):
+    lorawan.SMW_SX1262M0_TIMEOUT_RESET = 200  # [ms]
+    recoveries = []
+    watchdog = HealthWatchdog(lorawan, interval=0, callback=lambda *args: recoveries.append(args))
+    hang(module, revive)
+
+    assert watchdog.check() is (step is not None)
+    assert watchdog.healthy is (step is not None)
+    assert [recovered for recovered, _ in recoveries] == [step]
+
+    metrics = watchdog.metrics()
+    assert (metrics["heartbeats"], metrics["failures"]) == (1, 1)
+    assert metrics["recoveries"] == {name: int(name == step) for name in ("drain", "probe", "reset", "reopen")}
+    assert metrics["unrecovered"] == int(step is None)
+    assert metrics["recoveryLast"] == metrics["recoveryMax"] == recoveries[0][1]
+
+    # the steps after the one that recovered the module are not run
+    assert ("ATZ" in module.log) is (revive in ("ATZ", "open", None))
+    assert lorawan.isOpen()